@@ -1,14 +1,25 @@
+import argparse
 import json
+import os
 import pprint
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 
 import pandas as pd
+from tqdm import tqdm
 
+from src.backtest import benchmark_backtest, run_backtest
+from src.ingest import convert_to_arrow
+from src.optimizer import get_best_cashback_categories
+from src.replay import DEFAULT_FIXTURES_PATH, MarketStandIn
 from src.reports import category_spending, spending_by_category
-from src.services import analyze_cashback, get_info_from_excel, investment_bank
+from src.services import analyze_cashback_frame, get_investment_grid
+from src.store import DEFAULT_STATEMENT_PATH, TransactionStore
+from src.streaming import DEFAULT_CHUNK_SIZE, summarize_statement
 from src.utils import get_day_input, get_month_input, get_year_input, parse_user_date
-from src.views import get_card_data_from_excel, main_func
+from src.views import get_card_data_from_excel, load_market_data, main_func
 
 
 def get_user_input(prompt: str, valid_options: Optional[List[str]] = None) -> str:
@@ -31,15 +42,26 @@ def main() -> None:
         "Выберите необходимый пункт меню:\n1. Веб-Страницы\n2. Сервисы\n3. Отчёты\nВведите номер: ", ["1", "2", "3"]
     )
 
+    market = None
     if main_option == "1":
-        handle_web_pages()
+        # Курсы и котировки для веб-страниц запрашиваются в фоне, пока читается выписка
+        executor = ThreadPoolExecutor(max_workers=1)
+        market = executor.submit(load_market_data, tqdm(disable=True))
+        executor.shutdown(wait=False)
+
+    # Выписки читаются один раз за сессию и передаются во все обработчики.
+    # STATEMENTS может указывать на файл, каталог или glob-шаблон с несколькими выписками
+    store = TransactionStore.from_file(os.getenv("STATEMENTS", DEFAULT_STATEMENT_PATH))
+
+    if main_option == "1":
+        handle_web_pages(store, market)
     elif main_option == "2":
-        handle_services()
+        handle_services(store)
     elif main_option == "3":
-        handle_reports()
+        handle_reports(store)
 
 
-def handle_web_pages() -> None:
+def handle_web_pages(store: TransactionStore, market: Optional["Future[Tuple[List[Any], List[Any]]]"] = None) -> None:
     date_option = get_user_input("Выбрать текущую дату? (Да/Нет): ", ["ДА", "НЕТ"])
     date_str = get_date_input(date_option)
 
@@ -47,15 +69,15 @@ def handle_web_pages() -> None:
     start_date = current_time.replace(day=1)
     end_date = current_time
 
-    df = get_card_data_from_excel("data/operations.xls", start_date, end_date)
+    df = get_card_data_from_excel(store, start_date, end_date)
     option = get_user_input(
         "По какой странице вам нужна информация?\n1. Главная\n2. События\nВведите номер: ", ["1", "2"]
     )
 
     if option == "1":
-        handle_home_page(df, date_str)
+        handle_home_page(df, date_str, store, market)
     elif option == "2":
-        handle_events_page(df, date_str)
+        handle_events_page(df, date_str, store, market)
 
 
 def get_date_input(date_option: str) -> str:
@@ -68,65 +90,84 @@ def get_date_input(date_option: str) -> str:
         return parse_user_date(year, month, day)
 
 
-def handle_home_page(df: pd.DataFrame, date_str: str) -> None:
+def handle_home_page(
+    df: pd.DataFrame,
+    date_str: str,
+    store: TransactionStore,
+    market: Optional["Future[Tuple[List[Any], List[Any]]]"] = None,
+) -> None:
     print("Получение информации по вашей дате...")
-    result = main_func("home", date_str, df)
+    result = main_func("home", date_str, df, store=store, market=market)
     process_result(result)
 
 
-def handle_events_page(df: pd.DataFrame, date_str: str) -> None:
+def handle_events_page(
+    df: pd.DataFrame,
+    date_str: str,
+    store: TransactionStore,
+    market: Optional["Future[Tuple[List[Any], List[Any]]]"] = None,
+) -> None:
     print(
         "W — неделя, на которую приходится дата\nM — месяц, на который приходится дата\n"
         "Y — год, на который приходится дата\nALL — все данные до указанной даты"
     )
     date_range = get_user_input("Выберите диапазон данных: ", ["W", "M", "Y", "ALL"])
     print("Получение информации по вашей дате и диапазону данных...")
-    result = main_func("events", date_str, df, date_range)
+    result = main_func("events", date_str, df, date_range, store=store, market=market)
     process_result(result)
 
 
-def handle_services() -> None:
+def handle_services(store: TransactionStore) -> None:
     print("Введите дату для анализа данных")
     year = get_year_input()
     month = get_month_input()
     print("Получение данных карт")
     option = get_user_input(
         "Какие сервисы вы хотите использовать?\n1. Выгодные категории повышенного кешбэка\n"
-        "2. Инвесткопилка\nВведите номер: ",
-        ["1", "2"],
+        "2. Инвесткопилка\n3. Подбор категорий повышенного кешбэка по всей истории\nВведите номер: ",
+        ["1", "2", "3"],
     )
 
     if option == "1":
-        analyze_cashback_service(year, month)
+        analyze_cashback_service(year, month, store)
     elif option == "2":
-        investment_service(year, month)
+        investment_service(year, month, store)
+    elif option == "3":
+        cashback_optimizer_service(store)
 
 
-def analyze_cashback_service(year: str, month: str) -> None:
+def analyze_cashback_service(year: str, month: str, store: TransactionStore) -> None:
     print("Анализ выгодных категорий")
-    data = get_info_from_excel()
-    result = analyze_cashback(data, int(year), int(month))
+    result = analyze_cashback_frame(store, int(year), int(month))
+    process_result(result)
+
+
+def cashback_optimizer_service(store: TransactionStore) -> None:
+    size = get_user_input("Сколько категорий можно выбрать? ", ["1", "2", "3", "4", "5"])
+    print("Подбор категорий повышенного кешбэка")
+    result = get_best_cashback_categories(store, int(size))
     process_result(result)
 
 
-def investment_service(year: str, month: str) -> None:
-    data = get_info_from_excel()
-    limit = get_user_input("Введите порог округления: ", ["10", "50", "100"])
+def investment_service(year: str, month: str, store: TransactionStore) -> None:
+    # Таблица по всем месяцам и порогам считается за один проход
+    grid = get_investment_grid(store)
+    limit = get_user_input("Введите порог округления (или ВСЕ для всей таблицы): ", ["10", "50", "100", "ВСЕ"])
+    if limit == "ВСЕ":
+        print(grid.round(2).to_string())
+        return
     month_str = f"{year}-{month}"
-    result = investment_bank(month_str, data, int(limit))
+    result = grid[int(limit)].get(month_str, 0.0)
     print(round(result, 2))
 
 
-def handle_reports() -> None:
+def handle_reports(store: TransactionStore) -> None:
     print("Выбрано траты по категории")
-    data = get_info_from_excel()
-    df = pd.DataFrame(data)
-    df["Дата операции"] = pd.to_datetime(df["Дата операции"], dayfirst=True)
     date_option = get_user_input("Выбрать текущую дату для анализа? (Да/Нет): ", ["ДА", "НЕТ"])
 
     if date_option == "ДА":
-        found = category_spending(df)
-        result = spending_by_category(df, found)
+        found = category_spending(store)
+        result = spending_by_category(store, found)
         print(result)
     else:
         print("Введите дату для анализа данных")
@@ -134,8 +175,8 @@ def handle_reports() -> None:
         month = get_month_input()
         day = get_day_input()
         date_str = f"{year}-{month}-{day}"
-        found = category_spending(df)
-        result = spending_by_category(df, found, date_str)
+        found = category_spending(store)
+        result = spending_by_category(store, found, date_str)
         print(result)
 
 
@@ -149,5 +190,73 @@ def process_result(result: str) -> None:
     pprint.pp(json.loads(result))
 
 
+def handle_backtest() -> None:
+    # python main.py backtest
+    store = TransactionStore.from_file(os.getenv("STATEMENTS", DEFAULT_STATEMENT_PATH))
+    result = run_backtest(store)
+    print("Накоплено в «Инвесткопилке» за всю историю:")
+    print(result.iloc[-1].round(2).sort_values(ascending=False).to_string())
+    print(f"Время прогона, с: {benchmark_backtest(store)}")
+
+
+def handle_convert(args: List[str]) -> None:
+    # python main.py convert [выписка] [файл.arrow]
+    source = args[0] if args else os.getenv("STATEMENTS", DEFAULT_STATEMENT_PATH)
+    target = args[1] if len(args) > 1 else None
+    print(f"Выписка сохранена в формате Arrow: {convert_to_arrow(source, target)}")
+
+
+def handle_stream(args: List[str]) -> None:
+    # python main.py stream [--month 2021-11] [--chunksize 10000] [выписка.csv|выписка.xlsx]
+    parser = argparse.ArgumentParser(
+        prog="main.py stream", description="Сводка за месяц по выписке, прочитанной частями (CSV или XLSX)"
+    )
+    parser.add_argument("statement", nargs="?", default=os.getenv("STATEMENTS", DEFAULT_STATEMENT_PATH))
+    parser.add_argument("--month", default=datetime.now().strftime("%Y-%m"), help="месяц в формате ГГГГ-ММ")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_SIZE)
+    options = parser.parse_args(args)
+    month = datetime.strptime(options.month, "%Y-%m")
+    try:
+        result = summarize_statement(options.statement, month.year, month.month, options.chunksize)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    print(json.dumps(result, ensure_ascii=False, indent=4))
+
+
+def handle_stand_in(args: List[str]) -> None:
+    # python main.py standin [--record] [--latency 0.2] [--error-rate 0.1] [--port 8765] [файл записей]
+    parser = argparse.ArgumentParser(
+        prog="main.py standin", description="Локальный сервер вместо API курсов и котировок"
+    )
+    parser.add_argument("fixtures", nargs="?", default=DEFAULT_FIXTURES_PATH)
+    parser.add_argument("--record", action="store_true", help="дописывать недостающие ответы из настоящих API")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8765)
+    options = parser.parse_args(args)
+    stand_in = MarketStandIn(
+        options.fixtures,
+        mode="record" if options.record else "replay",
+        latency=options.latency,
+        jitter=options.jitter,
+        error_rate=options.error_rate,
+        port=options.port,
+    )
+    print("Укажите в файле .env:")
+    for name, url in stand_in.base_urls.items():
+        print(f"{name}={url}")
+    stand_in.serve_forever()
+
+
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["convert"]:
+        handle_convert(sys.argv[2:])
+    elif sys.argv[1:2] == ["backtest"]:
+        handle_backtest()
+    elif sys.argv[1:2] == ["stream"]:
+        handle_stream(sys.argv[2:])
+    elif sys.argv[1:2] == ["standin"]:
+        handle_stand_in(sys.argv[2:])
+    else:
+        main()
@@ -0,0 +1,73 @@
+import os
+from typing import Any
+
+import pandas as pd
+
+from src.schema import COMPACT_FLAG
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow - необязательная зависимость (extra "arrow")
+    pa = None
+    feather = None
+
+ARROW_EXTENSIONS = (".arrow", ".feather")
+
+
+def is_arrow_path(filepath: str) -> bool:
+    """Проверяет, что путь указывает на файл в формате Arrow IPC / Feather."""
+    return filepath.lower().endswith(ARROW_EXTENSIONS)
+
+
+def require_pyarrow() -> Any:
+    """
+    Возвращает модуль pyarrow или сообщает, как его установить.
+
+    Raises:
+        ImportError: Если pyarrow не установлен.
+    """
+    if pa is None:
+        raise ImportError("Для работы с Arrow установите pyarrow: poetry install --extras arrow")
+    return pa
+
+
+def write_arrow(df: pd.DataFrame, target: str) -> str:
+    """
+    Сохраняет транзакции в файл Arrow IPC (Feather v2) без сжатия.
+
+    Сжатие отключено, чтобы файл можно было открыть через отображение в память.
+
+    Args:
+        df (pd.DataFrame): Транзакции в компактной схеме.
+        target (str): Путь к файлу Arrow.
+
+    Returns:
+        str: Путь к созданному файлу.
+    """
+    require_pyarrow()
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    feather.write_feather(df.reset_index(drop=True), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, target)
+    return target
+
+
+def read_arrow(filepath: str) -> pd.DataFrame:
+    """
+    Открывает файл Arrow IPC через отображение в память.
+
+    Страницы файла разделяются между процессами через кэш ОС; числовые столбцы и даты
+    без пропусков передаются в pandas без копирования (split_blocks).
+
+    Args:
+        filepath (str): Путь к файлу Arrow.
+
+    Returns:
+        pd.DataFrame: Транзакции в компактной схеме.
+    """
+    arrow = require_pyarrow()
+    with arrow.memory_map(filepath, "r") as source:
+        table = arrow.ipc.open_file(source).read_all()
+    df: pd.DataFrame = table.to_pandas(split_blocks=True)
+    df.attrs[COMPACT_FLAG] = True
+    return df
@@ -0,0 +1,187 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.cube import INVESTMENT_LIMITS, get_round_up_savings
+from src.schema import get_year_month, to_rubles
+from src.store import TransactionStore
+
+# Правила «Инвесткопилки» для бэктеста по умолчанию: округление, процент от покупки и лимиты за месяц
+DEFAULT_RULES: List[Dict[str, Any]] = [
+    *({"limit": limit} for limit in INVESTMENT_LIMITS),
+    *({"percent": percent} for percent in (1, 3, 5, 10)),
+    {"limit": 100, "cap": 3000},
+    {"percent": 10, "cap": 5000},
+    {"limit": 50, "percent": 1},
+    {"limit": 100, "percent": 5, "cap": 10000},
+    {"limit": 10, "percent": 3, "cap": 2000},
+]
+
+# Меньше этого числа операций на правило пул процессов не окупает свой запуск
+MIN_PARALLEL_ROWS = 2_000_000
+
+# Операции истории в процессе пула: передаются один раз при его запуске (см. run_backtest)
+_history: Tuple[np.ndarray, np.ndarray, int] = (np.empty(0), np.empty(0, dtype="int64"), 0)
+
+
+def get_rule_name(rule: Dict[str, Any]) -> str:
+    """
+    Формирует название правила для отчета.
+
+    Args:
+        rule (Dict[str, Any]): Правило с ключами limit, percent и cap.
+
+    Returns:
+        str: Название правила, например "округление до 50 + 1% (не более 3000 в месяц)".
+    """
+    parts = []
+    if rule.get("limit"):
+        parts.append(f"округление до {rule['limit']}")
+    if rule.get("percent"):
+        parts.append(f"{rule['percent']}%")
+    name = " + ".join(parts)
+    if rule.get("cap"):
+        name += f" (не более {rule['cap']} в месяц)"
+    return name
+
+
+def get_operations(source: Union[pd.DataFrame, TransactionStore]) -> Tuple[np.ndarray, np.ndarray, pd.PeriodIndex]:
+    """
+    Отбирает операции для бэктеста.
+
+    Берутся все операции с датой и суммой, как в round_up_amount, get_investment_grid и кубе агрегатов,
+    поэтому правило «округление до N» дает те же суммы, что и investment_bank.
+
+    Args:
+        source (Union[pd.DataFrame, TransactionStore]): Транзакции или хранилище.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, pd.PeriodIndex]: Суммы операций в рублях (со знаком: покупки
+            отрицательные), номер месяца каждой операции и все месяцы истории подряд.
+    """
+    store = source if isinstance(source, TransactionStore) else TransactionStore(source)
+    data = store.data
+    operations = data[data["Дата операции"].notna() & data["Сумма операции"].notna()]
+    if operations.empty:
+        return np.empty(0), np.empty(0, dtype="int64"), pd.PeriodIndex([], freq="M")
+
+    years, months = get_year_month(operations["Дата операции"])
+    codes = (years * 12 + months - 1).to_numpy(dtype="int64")
+    first = codes.min()
+    periods = pd.period_range(
+        pd.Period(year=int(first // 12), month=int(first % 12 + 1), freq="M"), periods=int(codes.max() - first + 1)
+    )
+    return to_rubles(operations["Сумма операции"]).to_numpy(), codes - first, periods
+
+
+def evaluate_rule(rule: Dict[str, Any], amounts: np.ndarray, months: np.ndarray, month_count: int) -> np.ndarray:
+    """
+    Прогоняет одно правило по истории операций.
+
+    Округление считается по каждой операции, как round_up_amount, а процент - только от покупок.
+
+    Args:
+        rule (Dict[str, Any]): Правило: limit - предел округления, percent - процент от покупки,
+            cap - лимит отложенной суммы за месяц.
+        amounts (np.ndarray): Суммы операций в рублях (покупки отрицательные).
+        months (np.ndarray): Номер месяца каждой операции.
+        month_count (int): Количество месяцев в истории.
+
+    Returns:
+        np.ndarray: Накопленная сумма в «Инвесткопилке» на конец каждого месяца.
+
+    Raises:
+        ValueError: Если правило не задает ни предел округления, ни процент.
+    """
+    if not rule.get("limit") and not rule.get("percent"):
+        raise ValueError(f"Правило должно задавать limit или percent: {rule}")
+
+    savings = np.zeros(len(amounts))
+    if rule.get("limit"):
+        savings += get_round_up_savings(amounts, [rule["limit"]])[:, 0]
+    if rule.get("percent"):
+        savings += np.maximum(-amounts, 0) * rule["percent"] / 100
+
+    monthly = np.bincount(months, weights=savings, minlength=month_count)
+    if rule.get("cap"):
+        monthly = np.minimum(monthly, rule["cap"])
+    cumulative: np.ndarray = np.cumsum(monthly)
+    return cumulative
+
+
+def _set_history(amounts: np.ndarray, months: np.ndarray, month_count: int) -> None:
+    """Сохраняет операции истории в процессе пула (инициализатор ProcessPoolExecutor)."""
+    global _history
+    _history = (amounts, months, month_count)
+
+
+def _evaluate_history(rule: Dict[str, Any]) -> np.ndarray:
+    """Прогоняет правило по операциям, сохраненным в процессе пула."""
+    return evaluate_rule(rule, *_history)
+
+
+def run_backtest(
+    source: Union[pd.DataFrame, TransactionStore],
+    rules: Optional[List[Dict[str, Any]]] = None,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Прогоняет правила «Инвесткопилки» по всей истории покупок.
+
+    Правила независимы, поэтому для больших выписок считаются параллельно в пуле процессов.
+    Операции передаются каждому процессу один раз при запуске пула, а не вместе с каждым правилом.
+
+    Args:
+        source (Union[pd.DataFrame, TransactionStore]): Транзакции или хранилище.
+        rules (Optional[List[Dict[str, Any]]]): Правила (по умолчанию DEFAULT_RULES).
+        max_workers (Optional[int]): Количество процессов (1 - без пула процессов; по умолчанию пул
+            используется, только если операций не меньше MIN_PARALLEL_ROWS).
+
+    Returns:
+        pd.DataFrame: Накопленные суммы: строки - месяцы ('YYYY-MM'), столбцы - правила.
+    """
+    rules = DEFAULT_RULES if rules is None else rules
+    amounts, months, periods = get_operations(source)
+    history = (amounts, months, len(periods))
+
+    sequential = max_workers is None and len(amounts) < MIN_PARALLEL_ROWS
+    if sequential or max_workers == 1 or len(rules) == 1:
+        results = [evaluate_rule(rule, *history) for rule in rules]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_set_history, initargs=history) as executor:
+            results = list(executor.map(_evaluate_history, rules))
+
+    columns = [get_rule_name(rule) for rule in rules]
+    index = pd.Index(periods.strftime("%Y-%m"), name="Месяц")
+    return pd.DataFrame(np.column_stack(results) if results else None, index=index, columns=columns)
+
+
+def benchmark_backtest(
+    source: Union[pd.DataFrame, TransactionStore],
+    rules: Optional[List[Dict[str, Any]]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Замеряет время бэктеста в одном процессе и в пуле процессов.
+
+    Args:
+        source (Union[pd.DataFrame, TransactionStore]): Транзакции или хранилище.
+        rules (Optional[List[Dict[str, Any]]]): Правила (по умолчанию DEFAULT_RULES).
+        max_workers (Optional[int]): Количество процессов пула (по умолчанию - число ядер).
+
+    Returns:
+        Dict[str, float]: Время в секундах для последовательного и параллельного прогона.
+    """
+    store = source if isinstance(source, TransactionStore) else TransactionStore(source)
+    timings = {}
+    for name, workers in (("sequential", 1), ("parallel", max_workers or os.cpu_count() or 1)):
+        start = time.perf_counter()
+        run_backtest(store, rules, workers)
+        timings[name] = round(time.perf_counter() - start, 4)
+    logging.info(f"Бэктест «Инвесткопилки»: {timings}")
+    return timings
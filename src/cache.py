@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import os
+import pickle
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from src.arrow import is_arrow_path, read_arrow
+from src.schema import normalize_transactions
+
+CACHE_SUFFIX = ".cache.pkl"
+CACHE_VERSION = 2
+
+# Параметры чтения CSV-выгрузок банка: разделитель ";" и десятичная запятая
+CSV_OPTIONS: Dict[str, Any] = {"sep": ";", "decimal": ","}
+
+
+def get_cache_path(filepath: str, suffix: str = CACHE_SUFFIX) -> str:
+    """
+    Возвращает путь к файлу кэша, который хранится рядом с исходной выпиской.
+
+    Args:
+        filepath (str): Путь к файлу выписки.
+        suffix (str): Суффикс файла кэша.
+
+    Returns:
+        str: Путь к файлу кэша.
+    """
+    return filepath + suffix
+
+
+def get_file_hash(filepath: str) -> str:
+    """
+    Считает SHA-256 содержимого файла, читая его блоками.
+
+    Args:
+        filepath (str): Путь к файлу.
+
+    Returns:
+        str: Хэш содержимого в шестнадцатеричном виде.
+    """
+    sha = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def get_file_signature(filepath: str, with_hash: bool = True) -> Dict[str, Any]:
+    """
+    Формирует ключ кэша: путь, размер, время изменения и хэш содержимого файла.
+
+    Args:
+        filepath (str): Путь к файлу выписки.
+        with_hash (bool): Считать ли хэш содержимого.
+
+    Returns:
+        Dict[str, Any]: Словарь с ключом кэша.
+    """
+    stat = os.stat(filepath)
+    return {
+        "version": CACHE_VERSION,
+        "path": os.path.abspath(filepath),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": get_file_hash(filepath) if with_hash else None,
+    }
+
+
+def load_cached_frame(filepath: str, suffix: str = CACHE_SUFFIX) -> Optional[pd.DataFrame]:
+    """
+    Загружает DataFrame из кэша, если кэш соответствует текущему состоянию файла.
+
+    Сначала сравниваются размер и время изменения; хэш содержимого считается, только
+    если они не совпали (например, файл был перезаписан тем же содержимым).
+
+    Args:
+        filepath (str): Путь к файлу выписки.
+        suffix (str): Суффикс файла кэша.
+
+    Returns:
+        Optional[pd.DataFrame]: DataFrame из кэша или None, если кэш отсутствует или устарел.
+    """
+    cache_path = get_cache_path(filepath, suffix)
+    if not os.path.exists(cache_path):
+        return None
+
+    signature = get_file_signature(filepath, with_hash=False)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_signature = pickle.load(f)
+            fields = ("version", "path", "size", "mtime_ns")
+            if all(cached_signature.get(key) == signature[key] for key in fields):
+                frame: pd.DataFrame = pickle.load(f)
+                return frame
+
+            if cached_signature.get("version") != CACHE_VERSION or cached_signature.get("size") != signature["size"]:
+                return None
+            if cached_signature.get("sha256") != get_file_hash(filepath):
+                return None
+            frame = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+        logging.warning(f"Не удалось прочитать кэш {cache_path}: {e}")
+        return None
+
+    # Содержимое не изменилось, обновляем ключ, чтобы следующая проверка была быстрой
+    save_cached_frame(filepath, frame, suffix)
+    return frame
+
+
+def save_cached_frame(filepath: str, df: pd.DataFrame, suffix: str = CACHE_SUFFIX) -> None:
+    """
+    Сохраняет DataFrame в кэш рядом с файлом выписки.
+
+    Запись выполняется во временный файл с последующей атомарной заменой, поэтому
+    прерванная запись не оставляет поврежденный кэш.
+
+    Args:
+        filepath (str): Путь к файлу выписки.
+        df (pd.DataFrame): DataFrame для сохранения.
+        suffix (str): Суффикс файла кэша.
+    """
+    cache_path = get_cache_path(filepath, suffix)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(get_file_signature(filepath), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.warning(f"Не удалось сохранить кэш {cache_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def parse_statement(filepath: str) -> pd.DataFrame:
+    """
+    Разбирает файл выписки в зависимости от его формата (CSV или Excel).
+
+    Args:
+        filepath (str): Путь к файлу выписки.
+
+    Returns:
+        pd.DataFrame: DataFrame с данными выписки в исходном виде.
+    """
+    df: pd.DataFrame
+    if filepath.lower().endswith(".csv"):
+        df = pd.read_csv(filepath, **CSV_OPTIONS)
+    else:
+        df = pd.read_excel(filepath)
+    return df
+
+
+def read_operations(filepath: str) -> pd.DataFrame:
+    """
+    Читает выписку из Excel- или CSV-файла, используя кэш рядом с файлом.
+
+    Разбор Excel и нормализация типов выполняются только при первом чтении или после
+    изменения файла, в остальных случаях DataFrame загружается из бинарного кэша.
+    Файлы Arrow IPC (см. convert_to_arrow) открываются через отображение в память без кэша.
+
+    Args:
+        filepath (str): Путь к файлу выписки.
+
+    Returns:
+        pd.DataFrame: DataFrame с данными выписки в компактной схеме.
+    """
+    if is_arrow_path(filepath):
+        return read_arrow(filepath)
+
+    df = load_cached_frame(filepath)
+    if df is not None:
+        return df
+
+    df = normalize_transactions(parse_statement(filepath))
+    save_cached_frame(filepath, df)
+    return df
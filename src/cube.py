@@ -0,0 +1,120 @@
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.cache import load_cached_frame, save_cached_frame
+from src.schema import get_year_month, normalize_transactions
+
+CUBE_SUFFIX = ".cube.pkl"
+
+# Пределы округления, доступные в «Инвесткопилке»
+INVESTMENT_LIMITS = (10, 50, 100)
+
+# Измерения куба и его показатели
+CUBE_KEYS = ["year", "month", "Номер карты", "Категория"]
+CUBE_COLUMNS = ["amount", "count", "expenses", "income", "bonus"] + [f"savings_{limit}" for limit in INVESTMENT_LIMITS]
+
+
+def get_round_up_savings(amounts: np.ndarray, limits: Sequence[int]) -> np.ndarray:
+    """
+    Округляет суммы операций сразу до нескольких пределов, как round_up_amount.
+
+    Args:
+        amounts (np.ndarray): Суммы операций в рублях.
+        limits (Sequence[int]): Пределы округления.
+
+    Returns:
+        np.ndarray: Матрица отложенных сумм (операции x пределы).
+    """
+    values = amounts.astype("float64")[:, None]
+    steps = np.asarray(limits, dtype="float64")[None, :]
+    savings: np.ndarray = -(-values // steps) * steps - values
+    return savings
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Строит помесячный куб агрегатов по картам и категориям.
+
+    Для каждой ячейки (год, месяц, карта, категория) хранятся сумма операций, их число,
+    расходы и поступления (в копейках), положительный кешбэк и суммы «Инвесткопилки»
+    для каждого предела округления. Операции без даты в куб не попадают.
+
+    Args:
+        df (pd.DataFrame): Транзакции в исходной или компактной схеме.
+
+    Returns:
+        pd.DataFrame: Куб с индексом (year, month, Номер карты, Категория) и столбцами CUBE_COLUMNS.
+    """
+    df = normalize_transactions(df)
+    df = df[df["Дата операции"].notna()]
+    years, months = get_year_month(df["Дата операции"])
+    empty = pd.Series(np.nan, index=df.index, dtype=object)
+    keys = [
+        years.rename("year"),
+        months.rename("month"),
+        df.get("Номер карты", empty).astype(object).rename("Номер карты"),
+        df.get("Категория", empty).astype(object).rename("Категория"),
+    ]
+
+    kopecks = df["Сумма операции"].to_numpy(dtype="float64", na_value=np.nan)
+    amounts = np.nan_to_num(kopecks)
+    bonuses = pd.to_numeric(df.get("Бонусы (включая кэшбэк)", pd.Series(0, index=df.index)), errors="coerce")
+    savings = np.nan_to_num(get_round_up_savings(kopecks / 100, INVESTMENT_LIMITS))
+
+    values = pd.DataFrame(
+        {
+            "amount": amounts,
+            "count": 1,
+            "expenses": np.where(amounts < 0, amounts, 0),
+            "income": np.where(amounts > 0, amounts, 0),
+            "bonus": bonuses.where(bonuses > 0, 0).astype("float64").to_numpy(),
+            **{f"savings_{limit}": savings[:, i] for i, limit in enumerate(INVESTMENT_LIMITS)},
+        },
+        index=df.index,
+    )
+    cube: pd.DataFrame = values.groupby(keys, dropna=False).sum()
+    for column in ("amount", "expenses", "income"):
+        cube[column] = cube[column].round().astype("int64")
+    return cube
+
+
+def merge_cubes(cubes: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Складывает кубы непересекающихся частей выписки в куб всех их строк.
+
+    Args:
+        cubes (Sequence[pd.DataFrame]): Кубы частей (см. build_cube).
+
+    Returns:
+        pd.DataFrame: Куб с суммами показателей по всем частям.
+    """
+    cube: pd.DataFrame = pd.concat(cubes).groupby(level=list(range(len(CUBE_KEYS))), dropna=False).sum()
+    return cube
+
+
+def load_cube(df: pd.DataFrame, source: Optional[str] = None) -> pd.DataFrame:
+    """
+    Возвращает куб агрегатов, сохраненный рядом с файлом выписки, или строит его заново.
+
+    Куб сохраняется с тем же ключом (размер, время изменения и хэш файла), что и кэш
+    выписки, поэтому устаревает вместе с ней. Для каталогов и glob-шаблонов куб строится
+    в памяти.
+
+    Args:
+        df (pd.DataFrame): Транзакции выписки в компактной схеме.
+        source (Optional[str]): Путь к файлу выписки.
+
+    Returns:
+        pd.DataFrame: Куб агрегатов (см. build_cube).
+    """
+    if source is None or not os.path.isfile(source):
+        return build_cube(df)
+
+    cube = load_cached_frame(source, CUBE_SUFFIX)
+    if cube is None or list(cube.columns) != CUBE_COLUMNS:
+        cube = build_cube(df)
+        save_cached_frame(source, cube, CUBE_SUFFIX)
+    return cube
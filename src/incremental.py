@@ -0,0 +1,227 @@
+import logging
+import os
+import pickle
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from src.cache import CSV_OPTIONS, get_file_signature, parse_statement
+from src.cube import CUBE_COLUMNS, build_cube, merge_cubes
+from src.ingest import DEDUP_COLUMNS
+from src.schema import concat_transactions, normalize_transactions
+
+SNAPSHOT_SUFFIX = ".snapshot.pkl"
+ROWS_SUFFIX = ".rows.pkl"
+SNAPSHOT_VERSION = 3
+
+
+def read_statement_rows(filepath: str, skip: int = 0, nrows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Читает часть строк выписки.
+
+    Остальные строки CSV не разбираются; книгу Excel pandas разбирает целиком при любом чтении.
+
+    Args:
+        filepath (str): Путь к файлу выписки.
+        skip (int): Количество пропускаемых строк данных от начала файла.
+        nrows (Optional[int]): Количество читаемых строк (по умолчанию - до конца файла).
+
+    Returns:
+        pd.DataFrame: Прочитанные строки.
+    """
+    skiprows = range(1, skip + 1)
+    df: pd.DataFrame
+    if filepath.lower().endswith(".csv"):
+        df = pd.read_csv(filepath, skiprows=skiprows, nrows=nrows, **CSV_OPTIONS)
+    else:
+        df = pd.read_excel(filepath, skiprows=skiprows, nrows=nrows)
+    return df
+
+
+def get_row_fingerprint(df: pd.DataFrame, position: int) -> str:
+    """Возвращает отпечаток строки нормализованного DataFrame по полям, определяющим операцию."""
+    columns = [column for column in DEDUP_COLUMNS if column in df.columns]
+    return repr(tuple(df[column].iloc[position] for column in columns))
+
+
+class IncrementalStatement:
+    """
+    Выписка, которая дополняется новыми строками без повторного разбора всей истории.
+
+    Рядом с файлом хранятся снимок (число строк, отпечатки первой и последней строк и куб
+    агрегатов, см. src.cube) и журнал уже разобранных строк. Новые строки могут появиться в конце
+    файла или, как в выгрузке банка (новые операции сверху), в начале: при обновлении нормализуются
+    и дописываются в журнал только они, а к кубу прибавляется куб новых строк. Если уже
+    учтенные строки изменились, снимок строится заново.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        """
+        Args:
+            filepath (str): Путь к файлу выписки.
+        """
+        self.filepath = filepath
+        self.snapshot_path = filepath + SNAPSHOT_SUFFIX
+        self.rows_path = filepath + ROWS_SUFFIX
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.chunks: List[pd.DataFrame] = []
+        self._frame: Optional[pd.DataFrame] = None
+
+    def load_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Загружает снимок и журнал строк, если они согласованы между собой."""
+        if not (os.path.exists(self.snapshot_path) and os.path.exists(self.rows_path)):
+            return None
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot: Dict[str, Any] = pickle.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION or list(snapshot["cube"].columns) != CUBE_COLUMNS:
+                return None
+            chunks = []
+            with open(self.rows_path, "rb") as f:
+                for _ in range(snapshot["chunks"]):
+                    chunks.append(pickle.load(f))
+        except (OSError, EOFError, KeyError, pickle.UnpicklingError) as e:
+            logging.warning(f"Не удалось прочитать снимок {self.snapshot_path}: {e}")
+            return None
+        if sum(len(chunk) for chunk in chunks) != snapshot["row_count"]:
+            return None
+        self.chunks = chunks
+        self._frame = None
+        return snapshot
+
+    def save_snapshot(self) -> None:
+        """Сохраняет снимок атомарной заменой файла."""
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self.snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def rebuild(self, rows: Optional[pd.DataFrame] = None) -> int:
+        """
+        Разбирает выписку целиком и создает снимок заново.
+
+        Args:
+            rows (Optional[pd.DataFrame]): Уже прочитанные строки выписки, чтобы не разбирать файл повторно.
+        """
+        df = normalize_transactions(parse_statement(self.filepath) if rows is None else rows)
+        with open(self.rows_path, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.chunks = [df]
+        self._frame = None
+        self.snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "signature": get_file_signature(self.filepath, with_hash=False),
+            "row_count": len(df),
+            "chunks": 1,
+            # Порядок частей журнала в файле: строки, добавленные в начало, идут перед учтенными
+            "layout": [0],
+            "first_row": get_row_fingerprint(df, 0) if len(df) else None,
+            "last_row": get_row_fingerprint(df, -1) if len(df) else None,
+            "cube": build_cube(df),
+        }
+        self.save_snapshot()
+        return len(df)
+
+    def refresh(self) -> int:
+        """
+        Дочитывает новые строки выписки и дополняет куб агрегатов.
+
+        CSV читается с диска только в нужных местах. Книгу Excel pandas при любом чтении разбирает
+        целиком, поэтому измененный файл Excel читается один раз, а нужные строки берутся срезами:
+        время чтения равно полному разбору, экономятся нормализация и пересчет куба по всей истории.
+
+        Returns:
+            int: Количество новых строк (при полном перестроении - все строки выписки).
+        """
+        snapshot = self.load_snapshot()
+        if snapshot is None or not snapshot["row_count"]:
+            return self.rebuild()
+
+        # Файл не менялся с прошлого снимка - читать нечего
+        signature = get_file_signature(self.filepath, with_hash=False)
+        if snapshot["signature"] == signature:
+            self.snapshot = snapshot
+            return 0
+
+        # Книга Excel разбирается целиком при любом чтении, поэтому она читается один раз
+        parsed = None if self.filepath.lower().endswith(".csv") else read_statement_rows(self.filepath)
+
+        def read_rows(skip: int = 0, nrows: Optional[int] = None) -> pd.DataFrame:
+            if parsed is None:
+                return read_statement_rows(self.filepath, skip, nrows)
+            return parsed.iloc[skip : None if nrows is None else skip + nrows].reset_index(drop=True)
+
+        # Строк после последней учтенной позиции ровно на одну больше, чем новых строк
+        tail = normalize_transactions(read_rows(skip=snapshot["row_count"] - 1))
+        added = len(tail) - 1
+        new_rows: Optional[pd.DataFrame] = None
+        prepend = False
+        if added >= 0 and get_row_fingerprint(tail, 0) == snapshot["last_row"]:
+            new_rows = tail.iloc[1:]
+        elif added > 0 and get_row_fingerprint(tail, -1) == snapshot["last_row"]:
+            # Последняя строка осталась на месте, значит новые строки добавлены в начало файла
+            head = normalize_transactions(read_rows(nrows=added + 1))
+            if len(head) == added + 1 and get_row_fingerprint(head, added) == snapshot["first_row"]:
+                new_rows = head.iloc[:added]
+                prepend = True
+        if new_rows is None:
+            logging.info(f"Учтенные строки выписки {self.filepath} изменились, снимок строится заново")
+            return self.rebuild(parsed)
+
+        self.snapshot = snapshot
+        snapshot["signature"] = signature
+        if new_rows.empty:
+            self.save_snapshot()
+            return 0
+
+        with open(self.rows_path, "ab") as f:
+            pickle.dump(new_rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.chunks.append(new_rows)
+        self._frame = None
+        chunk = snapshot["chunks"]
+        snapshot["chunks"] += 1
+        snapshot["row_count"] += len(new_rows)
+        if prepend:
+            snapshot["layout"].insert(0, chunk)
+            snapshot["first_row"] = get_row_fingerprint(new_rows, 0)
+        else:
+            snapshot["layout"].append(chunk)
+            snapshot["last_row"] = get_row_fingerprint(new_rows, -1)
+        snapshot["cube"] = merge_cubes([snapshot["cube"], build_cube(new_rows)])
+        self.save_snapshot()
+        return len(new_rows)
+
+    @property
+    def cube(self) -> pd.DataFrame:
+        """Куб агрегатов по всем строкам выписки."""
+        if self.snapshot is None:
+            self.refresh()
+        assert self.snapshot is not None
+        cube: pd.DataFrame = self.snapshot["cube"]
+        return cube
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Все транзакции выписки в компактной схеме в порядке строк файла."""
+        if self.snapshot is None:
+            self.refresh()
+        assert self.snapshot is not None
+        if self._frame is None:
+            chunks = [self.chunks[chunk] for chunk in self.snapshot["layout"]]
+            self._frame = chunks[0] if len(chunks) == 1 else concat_transactions(chunks)
+        return self._frame
+
+
+def read_operations_incremental(filepath: str) -> pd.DataFrame:
+    """
+    Читает выписку в инкрементальном режиме: разбираются только новые строки.
+
+    Args:
+        filepath (str): Путь к файлу выписки.
+
+    Returns:
+        pd.DataFrame: Все транзакции выписки в компактной схеме.
+    """
+    statement = IncrementalStatement(filepath)
+    statement.refresh()
+    return statement.frame
@@ -0,0 +1,136 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from src.arrow import ARROW_EXTENSIONS, write_arrow
+from src.cache import read_operations
+from src.schema import concat_transactions
+
+STATEMENT_EXTENSIONS = (".xls", ".xlsx", ".csv") + ARROW_EXTENSIONS
+
+# Поля, по которым одна и та же операция узнается в пересекающихся выгрузках
+DEDUP_COLUMNS = ["Дата операции", "Номер карты", "Сумма операции", "Описание"]
+
+
+def resolve_statement_paths(source: str) -> List[str]:
+    """
+    Раскрывает путь к выписке, каталог с выписками или glob-шаблон в список файлов.
+
+    Args:
+        source (str): Путь к файлу, каталогу или шаблон (например, "data/*.xls").
+
+    Returns:
+        List[str]: Отсортированный список путей к файлам выписок.
+
+    Raises:
+        FileNotFoundError: Если по пути или шаблону не найдено ни одной выписки.
+    """
+    if os.path.isdir(source):
+        paths = [
+            os.path.join(source, name) for name in os.listdir(source) if name.lower().endswith(STATEMENT_EXTENSIONS)
+        ]
+    elif glob.has_magic(source):
+        paths = glob.glob(source)
+    else:
+        return [source]
+
+    if not paths:
+        raise FileNotFoundError(f"Не найдено ни одной выписки: {source}")
+    return sorted(paths)
+
+
+def get_transaction_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Вычисляет ключи операций для удаления дублей между выгрузками.
+
+    Ключ - хэш полей (дата, карта, сумма, описание) и порядковый номер повторения
+    внутри файла, поэтому одинаковые операции внутри одной выписки не теряются.
+
+    Args:
+        df (pd.DataFrame): Транзакции одной выписки.
+
+    Returns:
+        pd.DataFrame: DataFrame со столбцами "hash" и "occurrence".
+    """
+    columns = [column for column in DEDUP_COLUMNS if column in df.columns]
+    hashes = pd.util.hash_pandas_object(df[columns], index=False)
+    occurrence = hashes.groupby(hashes).cumcount()
+    return pd.DataFrame({"hash": hashes.to_numpy(), "occurrence": occurrence.to_numpy()})
+
+
+def merge_statements(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Объединяет транзакции нескольких выписок и удаляет операции, попавшие в несколько выгрузок.
+
+    Args:
+        frames (List[pd.DataFrame]): Транзакции выписок в компактной схеме.
+
+    Returns:
+        pd.DataFrame: Объединенные транзакции без дублей.
+    """
+    if len(frames) == 1:
+        return frames[0]
+
+    keys = pd.concat([get_transaction_keys(frame) for frame in frames], ignore_index=True)
+    merged = concat_transactions(frames)
+    return merged[~keys.duplicated().to_numpy()].reset_index(drop=True)
+
+
+def load_statements(source: str, max_workers: Optional[int] = None, incremental: bool = False) -> pd.DataFrame:
+    """
+    Загружает одну или несколько выписок, разбирая файлы параллельно в пуле процессов.
+
+    Args:
+        source (str): Путь к файлу, каталогу или glob-шаблон.
+        max_workers (Optional[int]): Количество процессов (по умолчанию - число ядер).
+        incremental (bool): Дочитывать только новые строки выписок (см. src.incremental).
+
+    Returns:
+        pd.DataFrame: Транзакции всех выписок в компактной схеме без дублей.
+    """
+    read: Callable[[str], pd.DataFrame] = read_operations
+    if incremental:
+        # Импорт внутри функции: модуль incremental сам импортирует ingest
+        from src.incremental import read_operations_incremental
+
+        read = read_operations_incremental
+
+    paths = resolve_statement_paths(source)
+    if len(paths) == 1:
+        return read(paths[0])
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(read, paths))
+    return merge_statements(frames)
+
+
+def convert_to_arrow(source: str, target: Optional[str] = None) -> str:
+    """
+    Конвертирует выписку (или несколько выписок) в файл Arrow IPC для открытия через отображение в память.
+
+    Записываются транзакции в том виде, в котором их хранит TransactionStore (компактная схема,
+    сортировка по дате), поэтому при открытии файла хранилище не пересортировывает и не копирует их.
+
+    Args:
+        source (str): Путь к файлу выписки, каталогу или glob-шаблон.
+        target (Optional[str]): Путь к файлу Arrow; для одного файла по умолчанию - рядом с выпиской
+            с расширением .arrow.
+
+    Returns:
+        str: Путь к созданному файлу.
+
+    Raises:
+        ValueError: Если для каталога или шаблона не указан путь к файлу Arrow.
+    """
+    if target is None:
+        if os.path.isdir(source) or glob.has_magic(source):
+            raise ValueError("Для каталога или шаблона укажите путь к файлу Arrow")
+        target = os.path.splitext(source)[0] + ".arrow"
+
+    # Импорт внутри функции: хранилище само загружает выписки через этот модуль
+    from src.store import TransactionStore
+
+    return write_arrow(TransactionStore(load_statements(source)).data, target)
@@ -0,0 +1,137 @@
+import bisect
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def fold_name(name: str) -> str:
+    """Приводит название к виду для сравнения: без регистра, лишних пробелов и с "е" вместо "ё"."""
+    return " ".join(name.casefold().replace("ё", "е").split())
+
+
+def get_edit_distances(query: str, codes: np.ndarray) -> np.ndarray:
+    """
+    Считает расстояние Левенштейна от запроса до нескольких названий одной длины.
+
+    Динамика идет по символам запроса, а все названия обрабатываются одновременно
+    векторными операциями NumPy.
+
+    Args:
+        query (str): Запрос.
+        codes (np.ndarray): Коды символов названий (названия x символы).
+
+    Returns:
+        np.ndarray: Расстояние до каждого названия.
+    """
+    count, length = codes.shape
+    previous = np.tile(np.arange(length + 1), (count, 1))
+    for position, char in enumerate(query, start=1):
+        cost = (codes != ord(char)).astype(np.int64)
+        # Замена символа или удаление символа запроса, затем вставка символа слева направо
+        best = np.minimum(previous[:, :-1] + cost, previous[:, 1:] + 1)
+        current = np.empty_like(previous)
+        current[:, 0] = position
+        for column in range(1, length + 1):
+            current[:, column] = np.minimum(best[:, column - 1], current[:, column - 1] + 1)
+        previous = current
+    distances: np.ndarray = previous[:, length]
+    return distances
+
+
+class NameIndex:
+    """
+    Индекс названий (категорий или мест покупок) для поиска без учета регистра.
+
+    Поддерживает точный поиск, поиск по началу названия (двоичный поиск по отсортированным
+    ключам) и поиск с опечатками: кандидаты отбираются по длине, а расстояние Левенштейна
+    считается сразу для всех кандидатов одной длины.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        """
+        Args:
+            names (Iterable[str]): Названия; пустые значения пропускаются.
+        """
+        self.names: Dict[str, str] = {}
+        for name in names:
+            if isinstance(name, str) and name.strip():
+                self.names.setdefault(fold_name(name), name)
+        self.keys = sorted(self.names)
+
+        by_length: Dict[int, List[str]] = {}
+        for key in self.keys:
+            by_length.setdefault(len(key), []).append(key)
+        self.buckets: Dict[int, Tuple[List[str], np.ndarray]] = {
+            length: (keys, np.array([[ord(char) for char in key] for key in keys], dtype=np.int32))
+            for length, keys in by_length.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def find(self, query: str) -> Optional[str]:
+        """Возвращает название, совпадающее с запросом без учета регистра, или None."""
+        return self.names.get(fold_name(query))
+
+    def prefix(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Ищет названия, начинающиеся с запроса.
+
+        Args:
+            query (str): Начало названия.
+            limit (int): Наибольшее количество результатов.
+
+        Returns:
+            List[str]: Названия в алфавитном порядке.
+        """
+        folded = fold_name(query)
+        if not folded:
+            return []
+        result: List[str] = []
+        for key in self.keys[bisect.bisect_left(self.keys, folded) :]:
+            if not key.startswith(folded) or len(result) >= limit:
+                break
+            result.append(self.names[key])
+        return result
+
+    def fuzzy(self, query: str, max_distance: int = 2, limit: int = 5) -> List[str]:
+        """
+        Ищет названия, отличающиеся от запроса не больше чем на max_distance правок.
+
+        Args:
+            query (str): Запрос.
+            max_distance (int): Наибольшее расстояние Левенштейна.
+            limit (int): Наибольшее количество результатов.
+
+        Returns:
+            List[str]: Названия по возрастанию расстояния.
+        """
+        folded = fold_name(query)
+        if not folded:
+            return []
+        found: List[Tuple[int, str]] = []
+        for length in range(max(1, len(folded) - max_distance), len(folded) + max_distance + 1):
+            if length not in self.buckets:
+                continue
+            keys, codes = self.buckets[length]
+            distances = get_edit_distances(folded, codes)
+            for index in np.flatnonzero(distances <= max_distance):
+                found.append((int(distances[index]), keys[index]))
+        return [self.names[key] for _, key in sorted(found)[:limit]]
+
+    def lookup(self, query: str, max_distance: int = 2, limit: int = 5) -> List[str]:
+        """
+        Ищет название: сначала точное совпадение, затем по началу названия, затем с опечатками.
+
+        Args:
+            query (str): Запрос.
+            max_distance (int): Наибольшее расстояние Левенштейна для поиска с опечатками.
+            limit (int): Наибольшее количество результатов.
+
+        Returns:
+            List[str]: Найденные названия (пустой список, если ничего не найдено).
+        """
+        exact = self.find(query)
+        if exact is not None:
+            return [exact]
+        return self.prefix(query, limit) or self.fuzzy(query, max_distance, limit)
@@ -0,0 +1,105 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Таймауты запроса в секундах: установка соединения и ожидание ответа
+Timeout = Tuple[float, float]
+
+
+def get_env_number(name: str, default: float) -> float:
+    """
+    Читает числовую настройку из переменной окружения.
+
+    Args:
+        name (str): Имя переменной окружения.
+        default (float): Значение, если переменная не задана или задана некорректно.
+
+    Returns:
+        float: Положительное значение настройки.
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        number = float(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        logging.warning(f"Некорректное значение {name}={value!r}, используется {default}")
+        return default
+    return number
+
+
+# Наибольшее количество одновременных запросов к одному API (переменная окружения MARKET_MAX_WORKERS)
+MAX_CONCURRENT_REQUESTS = max(1, int(get_env_number("MARKET_MAX_WORKERS", 8)))
+
+# Таймауты запроса по умолчанию (переменные окружения MARKET_CONNECT_TIMEOUT и MARKET_READ_TIMEOUT)
+REQUEST_TIMEOUT: Timeout = (
+    get_env_number("MARKET_CONNECT_TIMEOUT", 3.05),
+    get_env_number("MARKET_READ_TIMEOUT", 10.0),
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Возвращает общую HTTP-сессию для запросов к API курсов и котировок.
+
+    Сессия держит соединения открытыми (keep-alive), поэтому повторные запросы к тому же
+    хосту не тратят время на установку TCP- и TLS-соединения. Пул соединений рассчитан
+    на MAX_CONCURRENT_REQUESTS одновременных запросов.
+
+    Returns:
+        requests.Session: Общая сессия (создается при первом обращении).
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def close_session() -> None:
+    """Закрывает общую HTTP-сессию и ее соединения."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def fetch_concurrently(
+    fetch: Callable[[T], R], items: Sequence[T], max_workers: int = MAX_CONCURRENT_REQUESTS
+) -> List[R]:
+    """
+    Выполняет запросы для всех элементов параллельно в ограниченном пуле потоков.
+
+    Общее время ограничено временем самого медленного запроса (при количестве элементов
+    не больше max_workers), а не суммой времени всех запросов.
+
+    Args:
+        fetch (Callable[[T], R]): Функция, выполняющая один запрос.
+        items (Sequence[T]): Элементы, например коды валют или тикеры.
+        max_workers (int): Наибольшее количество одновременных запросов.
+
+    Returns:
+        List[R]: Результаты в порядке элементов.
+    """
+    if len(items) <= 1 or max_workers <= 1:
+        return [fetch(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix="market") as executor:
+        return list(executor.map(fetch, items))
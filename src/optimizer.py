@@ -0,0 +1,145 @@
+import heapq
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.schema import to_rubles
+from src.store import TransactionStore
+
+# Категории, по которым банк не начисляет кешбэк
+NON_CASHBACK_CATEGORIES = ["Наличные", "Переводы"]
+
+# Ставка повышенного кешбэка и месячный лимит начислений по умолчанию
+DEFAULT_CASHBACK_RATE = 0.05
+DEFAULT_MONTHLY_LIMIT = 3000.0
+
+
+def get_category_spend_matrix(source: Union[pd.DataFrame, TransactionStore]) -> pd.DataFrame:
+    """
+    Строит матрицу расходов: строки - месяцы ('YYYY-MM'), столбцы - категории.
+
+    Расходы берутся из куба агрегатов хранилища; категории без кешбэка и без расходов
+    в матрицу не попадают.
+
+    Args:
+        source (Union[pd.DataFrame, TransactionStore]): Транзакции или хранилище.
+
+    Returns:
+        pd.DataFrame: Сумма расходов (в рублях, положительная) по месяцам и категориям.
+    """
+    store = source if isinstance(source, TransactionStore) else TransactionStore(source)
+    expenses = -store.cube["expenses"].groupby(level=["year", "month", "Категория"]).sum()
+    matrix = to_rubles(expenses).unstack("Категория").fillna(0.0)
+    matrix = matrix.drop(columns=NON_CASHBACK_CATEGORIES, errors="ignore")
+    matrix = matrix.loc[:, matrix.sum() > 0]
+    matrix.index = pd.Index([f"{year:04d}-{month:02d}" for year, month in matrix.index], name="Месяц")
+    return matrix
+
+
+def optimize_cashback_categories(
+    matrix: pd.DataFrame,
+    size: int = 3,
+    rate: float = DEFAULT_CASHBACK_RATE,
+    monthly_limit: Optional[float] = DEFAULT_MONTHLY_LIMIT,
+    top: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Подбирает наборы категорий повышенного кешбэка с наибольшим средним месячным кешбэком.
+
+    Наборы перебираются методом ветвей и границ: категории упорядочены по средним расходам,
+    поэтому хорошие наборы находятся первыми, а ветвь отбрасывается, если даже лучшие
+    оставшиеся категории каждого месяца не дают кешбэка больше худшего из найденных наборов.
+
+    Args:
+        matrix (pd.DataFrame): Матрица расходов (см. get_category_spend_matrix).
+        size (int): Количество категорий в наборе.
+        rate (float): Ставка повышенного кешбэка.
+        monthly_limit (Optional[float]): Лимит начислений за месяц (None - без лимита).
+        top (int): Количество лучших наборов.
+
+    Returns:
+        List[Dict[str, Any]]: Наборы категорий и их средний месячный кешбэк, по убыванию.
+    """
+    order = matrix.mean().sort_values(ascending=False, kind="stable").index
+    categories = list(order)
+    gains = matrix[order].to_numpy(dtype="float64") * rate
+    means = gains.mean(axis=0)
+    count = len(categories)
+    size = min(size, count)
+    if size <= 0 or gains.shape[0] == 0:
+        return []
+
+    def cap(monthly: np.ndarray) -> np.ndarray:
+        # Средний месячный кешбэк с учетом лимита; по последней оси - варианты наборов
+        if monthly_limit is not None:
+            monthly = np.minimum(monthly, monthly_limit)
+        scores: np.ndarray = monthly.mean(axis=0)
+        return scores
+
+    def bound(monthly: np.ndarray, start: int, remaining: int) -> float:
+        # Верхняя оценка: к каждому месяцу добавляются его лучшие оставшиеся категории
+        rest = gains[:, start:]
+        best = -np.partition(-rest, remaining - 1, axis=1)[:, :remaining]
+        return float(cap(monthly + best.sum(axis=1)))
+
+    # Куча лучших наборов: (кешбэк, номера категорий со знаком минус), при равном кешбэке
+    # выше ставится набор из категорий с большими средними расходами
+    found: List[Tuple[float, Tuple[int, ...]]] = []
+
+    def search(start: int, chosen: Tuple[int, ...], monthly: np.ndarray) -> None:
+        remaining = size - len(chosen)
+        if remaining == 1:
+            # Последняя категория: все продолжения набора оцениваются одним векторным вызовом
+            scores = cap(monthly[:, None] + gains[:, start:])
+            for offset in np.argsort(-scores, kind="stable"):
+                item = (float(scores[offset]), tuple(-index for index in chosen + (start + int(offset),)))
+                if len(found) < top:
+                    heapq.heappush(found, item)
+                elif item > found[0]:
+                    heapq.heapreplace(found, item)
+                else:
+                    break
+            return
+        for index in range(start, count - remaining + 1):
+            next_monthly = monthly + gains[:, index]
+            if len(found) == top:
+                # Без учета лимита кешбэк не больше суммы средних, а средние убывают с номером категории,
+                # поэтому дальше по этой ветви искать нечего
+                if next_monthly.mean() + means[index + 1 : index + remaining].sum() <= found[0][0]:
+                    break
+                if bound(next_monthly, index + 1, remaining - 1) <= found[0][0]:
+                    continue
+            search(index + 1, chosen + (index,), next_monthly)
+
+    search(0, (), np.zeros(gains.shape[0]))
+    return [
+        {"categories": [categories[-index] for index in chosen], "monthly_gain": round(score, 2)}
+        for score, chosen in sorted(found, reverse=True)
+    ]
+
+
+def get_best_cashback_categories(
+    source: Union[pd.DataFrame, TransactionStore],
+    size: int = 3,
+    rate: float = DEFAULT_CASHBACK_RATE,
+    monthly_limit: Optional[float] = DEFAULT_MONTHLY_LIMIT,
+    top: int = 5,
+) -> str:
+    """
+    Подбирает лучшие наборы категорий повышенного кешбэка по всей истории операций.
+
+    Args:
+        source (Union[pd.DataFrame, TransactionStore]): Транзакции или хранилище.
+        size (int): Количество категорий в наборе.
+        rate (float): Ставка повышенного кешбэка.
+        monthly_limit (Optional[float]): Лимит начислений за месяц (None - без лимита).
+        top (int): Количество лучших наборов.
+
+    Returns:
+        str: JSON с наборами категорий и их средним месячным кешбэком.
+    """
+    matrix = get_category_spend_matrix(source)
+    result = optimize_cashback_categories(matrix, size, rate, monthly_limit, top)
+    return json.dumps(result, indent=4, ensure_ascii=False)
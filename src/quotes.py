@@ -0,0 +1,218 @@
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+DEFAULT_QUOTE_CACHE_PATH = "data/market_cache.sqlite"
+
+# Время в секундах, в течение которого значение считается свежим и не обновляется
+DEFAULT_TTL: Dict[str, float] = {"currency": 60 * 60, "stock": 6 * 60 * 60}
+
+# Значения старше этого срока не показываются: они запрашиваются заново с ожиданием ответа
+DEFAULT_MAX_STALE = 7 * 24 * 60 * 60
+
+# Сколько секунд при выходе из программы ждать фоновые обновления, чтобы они успели сохраниться
+EXIT_WAIT_TIMEOUT = 2.0
+
+# Поле записи с торговым днем значения ('YYYY-MM-DD'): сохраняется в столбец day и из записи убирается
+DAY_KEY = "date"
+
+# Функция, запрашивающая значения для списка символов (например, get_currency_rates)
+Fetcher = Callable[[List[str]], List[Dict[str, Any]]]
+
+
+def strip_day(value: Dict[str, Any]) -> Dict[str, Any]:
+    """Возвращает запись без поля торгового дня."""
+    return {name: item for name, item in value.items() if name != DAY_KEY}
+
+
+class QuoteCache:
+    """
+    Дисковый кэш курсов валют и котировок акций в SQLite.
+
+    Значения хранятся по виду ("currency" или "stock"), символу и торговому дню (дата курса
+    или котировки из ответа API, а если ее нет - день получения), поэтому в базе остается
+    история за прошлые дни. Кэш работает по схеме stale-while-revalidate:
+    свежее значение возвращается без запроса к API, устаревшее (но не старше max_stale)
+    возвращается сразу, а обновление запускается в фоновом потоке. Запрос с ожиданием
+    ответа выполняется только для символов, которых в кэше нет. Незавершенные фоновые
+    обновления при выходе из программы ждут не дольше EXIT_WAIT_TIMEOUT.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_QUOTE_CACHE_PATH,
+        ttl: Optional[Dict[str, float]] = None,
+        max_stale: float = DEFAULT_MAX_STALE,
+    ) -> None:
+        """
+        Args:
+            path (str): Путь к файлу базы SQLite (создается при первой записи).
+            ttl (Optional[Dict[str, float]]): Время свежести по видам значений в секундах (по умолчанию DEFAULT_TTL).
+            max_stale (float): Наибольший возраст значения, которое можно вернуть до обновления, в секундах.
+        """
+        self.path = path
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.max_stale = max_stale
+        self._initialized = False
+        self._lock = threading.Lock()
+        self._refreshing: Set[Tuple[str, str]] = set()
+        self._threads: List[threading.Thread] = []
+        self._exit_hook = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает соединение с базой; таблица создается при первом подключении."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        if not self._initialized:
+            with connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS quotes ("
+                    "kind TEXT NOT NULL, symbol TEXT NOT NULL, day TEXT NOT NULL, "
+                    "value TEXT NOT NULL, fetched_at REAL NOT NULL, PRIMARY KEY (kind, symbol, day))"
+                )
+            self._initialized = True
+        return connection
+
+    def load(self, kind: str, symbols: List[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        """
+        Возвращает последние сохраненные значения символов.
+
+        Args:
+            kind (str): Вид значений ("currency" или "stock").
+            symbols (List[str]): Коды валют или тикеры.
+
+        Returns:
+            Dict[str, Tuple[Dict[str, Any], float]]: Значение и время его получения по символам.
+        """
+        if not symbols:
+            return {}
+        placeholders = ", ".join("?" for _ in symbols)
+        query = (
+            f"SELECT symbol, value, fetched_at FROM quotes WHERE kind = ? AND symbol IN ({placeholders}) "
+            "ORDER BY fetched_at"
+        )
+        try:
+            with closing(self._connect()) as connection:
+                rows = connection.execute(query, [kind, *symbols]).fetchall()
+        except sqlite3.Error as e:
+            logging.warning(f"Не удалось прочитать кэш котировок {self.path}: {e}")
+            return {}
+        return {symbol: (json.loads(value), fetched_at) for symbol, value, fetched_at in rows}
+
+    def save(self, kind: str, values: Dict[str, Dict[str, Any]], fetched_at: Optional[float] = None) -> None:
+        """
+        Сохраняет полученные значения.
+
+        Args:
+            kind (str): Вид значений ("currency" или "stock").
+            values (Dict[str, Dict[str, Any]]): Значения по символам; торговый день берется из поля DAY_KEY.
+            fetched_at (Optional[float]): Время получения (по умолчанию - текущее).
+        """
+        if not values:
+            return
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        fetch_day = date.fromtimestamp(fetched_at).isoformat()
+        rows = [
+            (kind, symbol, str(value.get(DAY_KEY) or fetch_day)[:10], json.dumps(strip_day(value)), fetched_at)
+            for symbol, value in values.items()
+        ]
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.executemany("INSERT OR REPLACE INTO quotes VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            logging.warning(f"Не удалось сохранить кэш котировок {self.path}: {e}")
+
+    def _fetch(self, kind: str, symbols: List[str], fetch: Fetcher, key: str) -> Dict[str, Dict[str, Any]]:
+        """Запрашивает значения у API и сохраняет полученные."""
+        values = {str(record[key]): record for record in fetch(symbols)}
+        self.save(kind, values)
+        return {symbol: strip_day(value) for symbol, value in values.items()}
+
+    def _refresh(self, kind: str, symbols: List[str], fetch: Fetcher, key: str) -> None:
+        """Обновляет значения в фоновом потоке; символы, которые уже обновляются, пропускаются."""
+        with self._lock:
+            symbols = [symbol for symbol in symbols if (kind, symbol) not in self._refreshing]
+            self._refreshing.update((kind, symbol) for symbol in symbols)
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+        if not symbols:
+            return
+
+        def run() -> None:
+            try:
+                self._fetch(kind, symbols, fetch, key)
+            except Exception as e:
+                logging.error(f"Не удалось обновить кэш котировок {kind} {symbols}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update((kind, symbol) for symbol in symbols)
+
+        thread = threading.Thread(target=run, name=f"quote-refresh-{kind}", daemon=True)
+        with self._lock:
+            self._threads.append(thread)
+            if not self._exit_hook:
+                atexit.register(self.wait, EXIT_WAIT_TIMEOUT)
+                self._exit_hook = True
+        thread.start()
+
+    def get_many(self, kind: str, symbols: List[str], fetch: Fetcher, key: str) -> List[Dict[str, Any]]:
+        """
+        Возвращает значения символов из кэша, запрашивая у API только отсутствующие.
+
+        Args:
+            kind (str): Вид значений ("currency" или "stock").
+            symbols (List[str]): Коды валют или тикеры.
+            fetch (Fetcher): Функция запроса значений, например get_currency_rates; торговый день
+                каждого значения она может вернуть в поле DAY_KEY.
+            key (str): Ключ записи, в котором функция запроса возвращает символ ("currency" или "stock").
+
+        Returns:
+            List[Dict[str, Any]]: Значения в порядке символов (без тех, что не удалось получить).
+        """
+        now = time.time()
+        cached = self.load(kind, symbols)
+        ttl = self.ttl.get(kind, 0)
+        values = {
+            symbol: value for symbol, (value, fetched_at) in cached.items() if now - fetched_at <= self.max_stale
+        }
+        stale = [symbol for symbol in values if now - cached[symbol][1] > ttl]
+
+        missing = [symbol for symbol in symbols if symbol not in values]
+        if missing:
+            values.update(self._fetch(kind, missing, fetch, key))
+        if stale:
+            self._refresh(kind, stale, fetch, key)
+        return [values[symbol] for symbol in symbols if symbol in values]
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Ждет завершения фоновых обновлений.
+
+        Args:
+            timeout (Optional[float]): Наибольшее общее время ожидания в секундах (по умолчанию - без ограничения).
+        """
+        with self._lock:
+            threads = list(self._threads)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+
+_quote_cache: Optional[QuoteCache] = None
+
+
+def get_quote_cache() -> QuoteCache:
+    """Возвращает общий кэш котировок приложения (путь к базе задается переменной окружения QUOTE_CACHE)."""
+    global _quote_cache
+    if _quote_cache is None:
+        _quote_cache = QuoteCache(os.getenv("QUOTE_CACHE", DEFAULT_QUOTE_CACHE_PATH))
+    return _quote_cache
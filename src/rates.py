@@ -0,0 +1,84 @@
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Валюта, относительно которой запрашивается таблица курсов
+DEFAULT_BASE_CURRENCY = "RUB"
+
+
+class CrossRates:
+    """
+    Кросс-курсы валют, полученные из одной таблицы курсов относительно базовой валюты.
+
+    Если за одну единицу базовой валюты дают rates[a] единиц валюты a и rates[b] единиц
+    валюты b, то одна единица a стоит rates[b] / rates[a] единиц b. Поэтому для N валют
+    достаточно одного запроса к API, а вся матрица N x N считается локально.
+    """
+
+    def __init__(self, base: str, rates: Dict[str, float], date: Optional[str] = None) -> None:
+        """
+        Args:
+            base (str): Базовая валюта таблицы.
+            rates (Dict[str, float]): Количество единиц каждой валюты за одну единицу базовой.
+            date (Optional[str]): Дата, на которую действуют курсы ('YYYY-MM-DD').
+        """
+        self.base = base
+        self.date = date
+        self.rates = {currency: float(rate) for currency, rate in rates.items() if rate}
+        self.rates[base] = 1.0
+
+    def __contains__(self, currency: object) -> bool:
+        return currency in self.rates
+
+    @property
+    def currencies(self) -> List[str]:
+        """Валюты, для которых известен курс."""
+        return list(self.rates)
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """
+        Возвращает количество единиц to_currency за одну единицу from_currency.
+
+        Args:
+            from_currency (str): Исходная валюта.
+            to_currency (str): Целевая валюта.
+
+        Returns:
+            float: Кросс-курс.
+
+        Raises:
+            ValueError: Если курс одной из валют неизвестен.
+        """
+        for currency in (from_currency, to_currency):
+            if currency not in self.rates:
+                raise ValueError(f"Неизвестна валюта: {currency}")
+        return self.rates[to_currency] / self.rates[from_currency]
+
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        """
+        Переводит сумму из одной валюты в другую.
+
+        Args:
+            amount (float): Сумма в исходной валюте.
+            from_currency (str): Исходная валюта.
+            to_currency (str): Целевая валюта.
+
+        Returns:
+            float: Сумма в целевой валюте.
+
+        Raises:
+            ValueError: Если курс одной из валют неизвестен.
+        """
+        return amount * self.rate(from_currency, to_currency)
+
+    def matrix(self) -> pd.DataFrame:
+        """
+        Строит матрицу кросс-курсов.
+
+        Returns:
+            pd.DataFrame: Строки - исходные валюты, столбцы - целевые; значение - количество
+                единиц целевой валюты за одну единицу исходной.
+        """
+        values = pd.Series(self.rates)
+        matrix = pd.DataFrame([values / rate for rate in values], index=values.index)
+        return matrix.rename_axis(index="Из", columns="В")
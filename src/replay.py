@@ -0,0 +1,232 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Literal, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+DEFAULT_FIXTURES_PATH = "data/market_fixtures.json"
+
+# Реальные API, к которым обращается режим записи: префикс пути -> адрес
+DEFAULT_UPSTREAMS: Dict[str, str] = {
+    "/fixer": "https://api.apilayer.com/fixer",
+    "/query": "https://www.alphavantage.co/query",
+}
+
+# Параметры запроса, которые не попадают в ключ и файл записей
+SECRET_PARAMS = {"apikey"}
+
+
+def get_fixture_key(path: str) -> str:
+    """
+    Формирует ключ записи по пути и параметрам запроса.
+
+    Параметры сортируются, а ключи API отбрасываются, поэтому записи не зависят от порядка
+    параметров и не содержат секретов.
+
+    Args:
+        path (str): Путь запроса с параметрами, например "/fixer/latest?base=RUB".
+
+    Returns:
+        str: Ключ записи.
+    """
+    parts = urlsplit(path)
+    params = sorted((name, value) for name, value in parse_qsl(parts.query) if name.lower() not in SECRET_PARAMS)
+    return f"{parts.path}?{urlencode(params, safe=',')}" if params else parts.path
+
+
+def load_fixtures(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Загружает записанные ответы API.
+
+    Args:
+        path (str): Путь к файлу записей.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Ответы (код и тело) по ключам запросов; пустой словарь, если файла нет.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        fixtures: Dict[str, Dict[str, Any]] = json.load(f)
+    return fixtures
+
+
+def save_fixtures(path: str, fixtures: Dict[str, Dict[str, Any]]) -> None:
+    """Сохраняет записанные ответы API атомарной заменой файла."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(fixtures, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов локального сервера: передает запрос в MarketStandIn."""
+
+    protocol_version = "HTTP/1.1"
+    server: "_StandInServer"
+
+    def do_GET(self) -> None:
+        status, body = self.server.stand_in.respond(self.path, self.headers.get("apikey"))
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.debug(f"Локальный сервер API: {format % args}")
+
+
+class _StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], stand_in: "MarketStandIn") -> None:
+        super().__init__(address, _StandInHandler)
+        self.stand_in = stand_in
+
+
+class MarketStandIn:
+    """
+    Локальный HTTP-сервер вместо Fixer и Alpha Vantage.
+
+    В режиме "replay" отдает записанные ответы из файла, в режиме "record" недостающие ответы
+    запрашивает у настоящих API и дописывает в файл. Задержка и доля ошибок задаются, поэтому
+    дашборд можно замерять вместе с поведением сети на машине без доступа в интернет.
+    Чтобы приложение обращалось к серверу, адреса из base_urls задаются в переменных окружения
+    FIXER_URL и ALPHA_VANTAGE_URL.
+    """
+
+    def __init__(
+        self,
+        fixtures_path: str = DEFAULT_FIXTURES_PATH,
+        mode: Literal["replay", "record"] = "replay",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        upstreams: Optional[Dict[str, str]] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            fixtures_path (str): Путь к файлу записанных ответов.
+            mode (Literal["replay", "record"]): Только воспроизведение или запись недостающих ответов.
+            latency (float): Задержка каждого ответа в секундах.
+            jitter (float): Наибольшая случайная добавка к задержке в секундах.
+            error_rate (float): Доля запросов, на которые сервер отвечает ошибкой 503.
+            upstreams (Optional[Dict[str, str]]): Адреса настоящих API по префиксам пути
+                (по умолчанию DEFAULT_UPSTREAMS).
+            host (str): Адрес сервера.
+            port (int): Порт сервера (0 - любой свободный).
+            seed (Optional[int]): Начальное значение генератора случайных чисел для воспроизводимых ошибок.
+        """
+        self.fixtures_path = fixtures_path
+        self.fixtures = load_fixtures(fixtures_path)
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.upstreams = DEFAULT_UPSTREAMS if upstreams is None else upstreams
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _StandInServer((host, port), self)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Адрес сервера."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def base_urls(self) -> Dict[str, str]:
+        """Базовые адреса API для переменных окружения FIXER_URL и ALPHA_VANTAGE_URL."""
+        return {"FIXER_URL": f"{self.url}/fixer", "ALPHA_VANTAGE_URL": self.url}
+
+    def start(self) -> "MarketStandIn":
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.1}, name="market-stand-in", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        """Обрабатывает запросы в текущем потоке до прерывания."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self) -> "MarketStandIn":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def respond(self, path: str, api_key: Optional[str] = None) -> Tuple[int, Any]:
+        """
+        Формирует ответ на запрос.
+
+        Args:
+            path (str): Путь запроса с параметрами.
+            api_key (Optional[str]): Ключ API из заголовка запроса (передается настоящему API при записи).
+
+        Returns:
+            Tuple[int, Any]: Код ответа и тело в виде JSON-совместимого объекта.
+        """
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            return 503, {"error": "Service temporarily unavailable"}
+
+        key = get_fixture_key(path)
+        fixture = self.fixtures.get(key)
+        if fixture is None and self.mode == "record":
+            fixture = self.record(path, key, api_key)
+        if fixture is None:
+            return 404, {"error": f"No recorded response for {key}"}
+        return fixture["status"], fixture["body"]
+
+    def record(self, path: str, key: str, api_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Запрашивает ответ у настоящего API и дописывает его в файл записей, если запрос успешен."""
+        prefix = max((prefix for prefix in self.upstreams if path.startswith(prefix)), key=len, default=None)
+        if prefix is None:
+            return None
+        url = self.upstreams[prefix] + path[len(prefix) :]
+        headers = {"apikey": api_key} if api_key else {}
+        try:
+            response = requests.get(url, headers=headers, timeout=30)
+            body = response.json()
+        except (requests.RequestException, ValueError) as e:
+            logging.error(f"Не удалось записать ответ {key}: {e}")
+            return None
+
+        fixture = {"status": response.status_code, "body": body}
+        if response.status_code == 200:
+            with self._lock:
+                self.fixtures[key] = fixture
+                save_fixtures(self.fixtures_path, self.fixtures)
+        return fixture
@@ -1,17 +1,48 @@
+import os
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from functools import wraps
+from typing import Any, Dict, Literal, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from src.lookup import NameIndex
+from src.schema import to_rubles
+from src.sink import ReportSink
+from src.store import TransactionStore
 
-def save_to_file(filename: str = "reports.log") -> Any:
-    """Декоратор для сохранения результатов функций-отчетов в файл"""
+# Файл NDJSON, в который по умолчанию пишутся результаты отчетов (переменная окружения REPORTS_PATH)
+DEFAULT_REPORTS_PATH = "reports.ndjson"
+
+_report_sinks: Dict[str, ReportSink] = {}
+
+
+def get_report_sink(path: Optional[str] = None) -> ReportSink:
+    """
+    Возвращает общий фоновый приемник отчетов для файла (по умолчанию - REPORTS_PATH или reports.ndjson).
+
+    Приемник создается при первом обращении и дописывает очередь при завершении приложения.
+    """
+    target = path if path else os.getenv("REPORTS_PATH", DEFAULT_REPORTS_PATH)
+    if target not in _report_sinks:
+        _report_sinks[target] = ReportSink(target)
+    return _report_sinks[target]
+
+
+def save_to_file(filename: Optional[str] = None, sink: Optional[ReportSink] = None) -> Any:
+    """
+    Декоратор для сохранения результатов функций-отчетов в файл.
+
+    Результат ставится в очередь фоновой записи, и функция-отчет не ждет диска. По умолчанию
+    отчеты дописываются в общий файл NDJSON (см. get_report_sink); filename задает другой файл,
+    а sink - собственный приемник (например, с записью в Parquet).
+    """
 
     def decorator(func: Any) -> Any:
+        @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             result = func(*args, **kwargs)
-            with open(filename, "w") as file:
-                file.write(str(result))
+            (sink or get_report_sink(filename)).write(func.__name__, result)
             return result
 
         return wrapper
@@ -19,45 +50,151 @@ def save_to_file(filename: str = "reports.log") -> Any:
     return decorator
 
 
-# Функция для получения трат по заданной категории за последние три месяца
-def spending_by_category(
-    transactions: pd.DataFrame, category: str, date: Optional[Union[datetime, str, pd.Timestamp]] = None
-) -> pd.DataFrame:
+def get_spending_period(date: Optional[Union[datetime, str, pd.Timestamp]] = None) -> Tuple[datetime, datetime]:
+    """
+    Возвращает период отчета о тратах: три месяца (90 дней) до даты включительно.
+
+    Args:
+        date (Optional[Union[datetime, str, pd.Timestamp]]): Дата отчета (по умолчанию - текущая).
+
+    Returns:
+        Tuple[datetime, datetime]: Начальная и конечная даты периода.
+    """
     if date is None:
         date = datetime.now()
     elif isinstance(date, str):
         date = pd.to_datetime(date)
+    return date - timedelta(days=90), date
+
+
+def get_monthly_table(sums: pd.Series, unit: Literal["s", "ms", "us", "ns"]) -> pd.DataFrame:
+    """
+    Разворачивает суммы по (месяц, категория) в таблицу месяцы x категории.
+
+    Месяцы без операций попадают в таблицу с нулевыми суммами, как при группировке по pd.Grouper,
+    а месяцы подписываются последним днем месяца.
+
+    Args:
+        sums (pd.Series): Суммы с индексом (pd.Period, категория).
+        unit (str): Единица времени для дат месяцев.
+
+    Returns:
+        pd.DataFrame: Таблица трат с индексом "Дата операции".
+    """
+    table = sums.unstack("Категория", fill_value=0)
+    periods = pd.period_range(table.index.min(), table.index.max(), freq="M")
+    table = table.reindex(periods, fill_value=0)
+    table.index = (periods.to_timestamp() + pd.offsets.MonthEnd(0)).as_unit(unit).rename("Дата операции")
+    return table
+
+
+def get_spending_table(
+    transactions: Union[pd.DataFrame, TransactionStore],
+    date: Optional[Union[datetime, str, pd.Timestamp]] = None,
+) -> pd.DataFrame:
+    """
+    Считает траты по всем категориям за последние три месяца одной группировкой.
+
+    Args:
+        transactions (Union[pd.DataFrame, TransactionStore]): Транзакции или хранилище.
+        date (Optional[Union[datetime, str, pd.Timestamp]]): Дата отчета (по умолчанию - текущая).
+
+    Returns:
+        pd.DataFrame: Сумма модулей операций: строки - месяцы (последний день месяца),
+            столбцы - категории.
+    """
+    start_date, end_date = get_spending_period(date)
+
+    sums: pd.Series
+    if isinstance(transactions, TransactionStore):
+        # Для хранилища помесячные суммы берутся из куба агрегатов
+        cube = transactions.summarize(start_date, end_date)
+        kopecks = (cube["income"] - cube["expenses"]).groupby(level=["year", "month", "Категория"]).sum()
+        periods = [pd.Period(year=year, month=month, freq="M") for year, month, _ in kopecks.index]
+        categories = kopecks.index.get_level_values("Категория")
+        sums = to_rubles(kopecks).set_axis(pd.MultiIndex.from_arrays([periods, categories]))
+        unit = transactions.dates.unit
+    else:
+        dates = transactions["Дата операции"]
+        window = transactions[(dates >= start_date) & (dates <= end_date)]
+        months = window["Дата операции"].dt.to_period("M")
+        sums = window["Сумма операции"].abs().groupby([months, window["Категория"]], observed=True).sum()
+        unit = dates.dt.unit
 
-    start_date = date - timedelta(days=90)
+    if sums.empty:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="Дата операции"))
+    return get_monthly_table(sums.rename_axis([None, "Категория"]), unit)
 
-    # Фильтруем транзакции по категории и дате
-    filtered_transactions: pd.DataFrame = transactions[
-        (transactions["Категория"] == category)
-        & (transactions["Дата операции"] >= start_date)
-        & (transactions["Дата операции"] <= date)
-    ]
 
-    # Группируем транзакции по месяцам и суммируем траты
-    result: pd.DataFrame = (
-        filtered_transactions.groupby(pd.Grouper(key="Дата операции", freq="ME"))["Сумма операции"]
-        .apply(lambda x: x.abs().sum())
-        .reset_index()
-    )
+@save_to_file()
+def spending_by_categories(
+    transactions: Union[pd.DataFrame, TransactionStore],
+    date: Optional[Union[datetime, str, pd.Timestamp]] = None,
+) -> pd.DataFrame:
+    """Отчет о тратах по всем категориям за последние три месяца (см. get_spending_table)."""
+    return get_spending_table(transactions, date)
+
 
+# Функция для получения трат по заданной категории за последние три месяца
+@save_to_file()
+def spending_by_category(
+    transactions: Union[pd.DataFrame, TransactionStore],
+    category: str,
+    date: Optional[Union[datetime, str, pd.Timestamp]] = None,
+) -> pd.DataFrame:
+    table = get_spending_table(transactions, date)
+    if category not in table.columns:
+        return pd.DataFrame(columns=["Дата операции", "Сумма операции"])
+
+    # Берем месяцы от первой до последней операции в категории
+    spending = table[category]
+    active = np.flatnonzero(spending.to_numpy() != 0)
+    if not len(active):
+        return pd.DataFrame(columns=["Дата операции", "Сумма операции"])
+    result: pd.DataFrame = spending.iloc[active[0] : active[-1] + 1].rename("Сумма операции").reset_index()
     return result
 
 
-def category_spending(df: pd.DataFrame) -> Any:
-    categories_data = df["Категория"].unique()
+@save_to_file()
+def rolling_spending(
+    transactions: Union[pd.DataFrame, TransactionStore],
+    days: int = 90,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> pd.DataFrame:
+    """
+    Считает траты по всем категориям за скользящее окно на каждый день периода.
+
+    Траты за окно берутся из накопленных сумм хранилища двумя двоичными поисками,
+    поэтому весь ряд строится за один проход без пересчета окна для каждой даты.
+
+    Args:
+        transactions (Union[pd.DataFrame, TransactionStore]): Транзакции или хранилище.
+        days (int): Длина окна в днях.
+        start_date (Optional[datetime]): Первый день (по умолчанию - дата первой операции).
+        end_date (Optional[datetime]): Последний день (по умолчанию - дата последней операции).
+
+    Returns:
+        pd.DataFrame: Траты в рублях: строки - дни, столбцы - категории.
+    """
+    store = transactions if isinstance(transactions, TransactionStore) else TransactionStore(transactions)
+    return store.category_sums.rolling(days, start_date, end_date)
+
+
+def category_spending(df: Union[pd.DataFrame, TransactionStore]) -> Any:
+    # Индекс категорий без учета регистра; у хранилища он строится один раз за сессию
+    if isinstance(df, TransactionStore):
+        index = df.name_index("Категория")
+    else:
+        index = NameIndex(df["Категория"].unique())
     print("Доступные категории:")
-    for category in categories_data:
-        if not pd.isnull(category):  # Проверяем, что значение не пустое
-            print(category)
-    user_input = input("Введите название категории: ").lower()
-    categories_lower = [cat.lower() for cat in categories_data if not pd.isnull(cat)]
-    if user_input in categories_lower:
-        # Если категория найдена, ищем ее в исходном списке
-        category_found = next(cat for cat in categories_data if not pd.isnull(cat) and cat.lower() == user_input)
+    for category in index.names.values():
+        print(category)
+    user_input = input("Введите название категории: ")
+    category_found = index.find(user_input)
+    if category_found is not None:
         return category_found
-    else:
-        print("Нет такой категории.")
+    print("Нет такой категории.")
+    suggestions = index.lookup(user_input)
+    if suggestions:
+        print(f"Возможно, вы имели в виду: {', '.join(suggestions)}")
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.schema import normalize_transactions
+
+
+class CategoryPrefixSums:
+    """
+    Накопленные суммы трат по каждой категории в порядке дат операций.
+
+    Трата за любой период - разность двух накопленных сумм, границы которых находятся
+    двоичным поиском, поэтому скользящее окно за любую дату стоит O(log n).
+    Тратой, как и в spending_by_category, считается сумма модулей операций.
+    """
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        """
+        Args:
+            data (pd.DataFrame): Транзакции, отсортированные по дате операции (как в TransactionStore.data).
+        """
+        data = normalize_transactions(data)
+        data = data[data["Дата операции"].notna()]
+        codes, categories = pd.factorize(data["Категория"])
+        dates = data["Дата операции"].to_numpy(dtype="datetime64[ns]")
+        amounts = data["Сумма операции"].abs().fillna(0).to_numpy(dtype="int64")
+
+        # Группируем строки по категориям, сохраняя порядок дат внутри категории
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+        self.dates: Dict[str, np.ndarray] = {}
+        self.sums: Dict[str, np.ndarray] = {}
+        for code, category in enumerate(categories):
+            rows = order[bounds[code] : bounds[code + 1]]
+            self.dates[category] = dates[rows]
+            self.sums[category] = np.concatenate([[0], np.cumsum(amounts[rows])])
+        self.first_date = dates[0] if len(dates) else None
+        self.last_date = dates[-1] if len(dates) else None
+
+    @property
+    def categories(self) -> List[str]:
+        """Категории, по которым есть операции."""
+        return list(self.sums)
+
+    def window(self, category: str, date: datetime, days: int = 90) -> float:
+        """
+        Возвращает траты по категории за days дней до даты включительно.
+
+        Args:
+            category (str): Категория.
+            date (datetime): Конечная дата окна (включительно).
+            days (int): Длина окна в днях.
+
+        Returns:
+            float: Сумма трат в рублях.
+        """
+        if category not in self.sums:
+            return 0.0
+        end = np.datetime64(pd.Timestamp(date).as_unit("ns"))
+        start = end - np.timedelta64(days, "D")
+        dates = self.dates[category]
+        low = np.searchsorted(dates, start, side="left")
+        high = np.searchsorted(dates, end, side="right")
+        return float(self.sums[category][high] - self.sums[category][low]) / 100
+
+    def rolling(
+        self, days: int = 90, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Считает траты за скользящее окно на конец каждого дня по всем категориям.
+
+        Args:
+            days (int): Длина окна в днях.
+            start_date (Optional[datetime]): Первый день (по умолчанию - дата первой операции).
+            end_date (Optional[datetime]): Последний день (по умолчанию - дата последней операции).
+
+        Returns:
+            pd.DataFrame: Траты в рублях: строки - дни, столбцы - категории.
+        """
+        first = start_date if start_date is not None else self.first_date
+        last = end_date if end_date is not None else self.last_date
+        if first is None or last is None:
+            return pd.DataFrame()
+
+        days_index = pd.date_range(pd.Timestamp(first).normalize(), pd.Timestamp(last).normalize(), freq="D")
+        ends = (days_index + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")).to_numpy(dtype="datetime64[ns]")
+        starts = ends - np.timedelta64(days, "D")
+        columns = {}
+        for category, dates in self.dates.items():
+            sums = self.sums[category]
+            high = np.searchsorted(dates, ends, side="right")
+            low = np.searchsorted(dates, starts, side="left")
+            columns[category] = (sums[high] - sums[low]) / 100
+        return pd.DataFrame(columns, index=days_index.rename("Дата операции"))
@@ -0,0 +1,206 @@
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Признак того, что DataFrame уже приведен к компактной схеме
+COMPACT_FLAG = "compact_schema"
+
+# Столбцы с повторяющимися строками, которые хранятся как категории
+CATEGORY_COLUMNS = ["Категория", "Описание", "Номер карты", "Валюта операции", "Валюта платежа", "Статус"]
+
+# Денежные столбцы, которые хранятся в копейках
+AMOUNT_COLUMNS = ["Сумма операции", "Сумма платежа", "Кэшбэк", "Сумма операции с округлением"]
+
+# Форматы дат в выписке
+OPERATION_DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+PAYMENT_DATE_FORMAT = "%d.%m.%Y"
+
+# Столбцы с датами и их форматы в выписке
+DATE_COLUMNS = {"Дата операции": OPERATION_DATE_FORMAT, "Дата платежа": PAYMENT_DATE_FORMAT}
+
+
+def parse_dates(values: pd.Series, date_format: str = OPERATION_DATE_FORMAT) -> pd.Series:
+    """
+    Разбирает столбец дат одним векторным вызовом.
+
+    Каждое уникальное значение разбирается один раз, повторяющиеся отметки времени
+    берутся из уже разобранных. Уже разобранный столбец возвращается как есть.
+
+    Args:
+        values (pd.Series): Даты в виде строк (или уже datetime64).
+        date_format (str): Формат дат.
+
+    Returns:
+        pd.Series: Даты datetime64, нераспознанные значения - NaT.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format=date_format, errors="coerce").to_numpy()
+    # Код -1 (пропуск) указывает на последний элемент - NaT
+    lookup = np.append(parsed, np.datetime64("NaT")).astype(parsed.dtype)
+    return pd.Series(lookup[codes], index=values.index, name=values.name)
+
+
+def get_year_month(dates: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Возвращает год и месяц для каждой даты в виде целых чисел.
+
+    Args:
+        dates (pd.Series): Даты datetime64.
+
+    Returns:
+        Tuple[pd.Series, pd.Series]: Годы и месяцы (0 для пропущенных дат).
+    """
+    year = dates.dt.year.fillna(0).astype("int32")
+    month = dates.dt.month.fillna(0).astype("int32")
+    return year, month
+
+
+def memory_footprint(df: pd.DataFrame) -> int:
+    """
+    Возвращает объем памяти, занимаемый DataFrame, включая содержимое строк.
+
+    Args:
+        df (pd.DataFrame): DataFrame для оценки.
+
+    Returns:
+        int: Объем памяти в байтах.
+    """
+    return int(df.memory_usage(deep=True).sum())
+
+
+def get_footprint_report(before: pd.DataFrame, after: pd.DataFrame) -> Dict[str, float]:
+    """
+    Сравнивает объем памяти DataFrame до и после нормализации.
+
+    Args:
+        before (pd.DataFrame): Исходный DataFrame.
+        after (pd.DataFrame): Нормализованный DataFrame.
+
+    Returns:
+        Dict[str, float]: Объем памяти до и после (в байтах) и процент экономии.
+    """
+    before_bytes = memory_footprint(before)
+    after_bytes = memory_footprint(after)
+    saved_percent = round((1 - after_bytes / before_bytes) * 100, 2) if before_bytes else 0.0
+    return {"before_bytes": before_bytes, "after_bytes": after_bytes, "saved_percent": saved_percent}
+
+
+def to_kopecks(amounts: pd.Series) -> pd.Series:
+    """
+    Переводит суммы в рублях в целые копейки.
+
+    Args:
+        amounts (pd.Series): Суммы в рублях.
+
+    Returns:
+        pd.Series: Суммы в копейках (int64, либо Int64, если есть пропуски).
+    """
+    kopecks = (pd.to_numeric(amounts, errors="coerce") * 100).round()
+    if kopecks.isna().any():
+        return kopecks.astype("Int64")
+    return kopecks.astype("int64")
+
+
+def to_rubles(kopecks: pd.Series) -> pd.Series:
+    """
+    Переводит суммы в копейках обратно в рубли.
+
+    Args:
+        kopecks (pd.Series): Суммы в копейках.
+
+    Returns:
+        pd.Series: Суммы в рублях (float64).
+    """
+    return kopecks.astype("float64") / 100
+
+
+def is_compact(df: pd.DataFrame) -> bool:
+    """Проверяет, приведен ли DataFrame к компактной схеме."""
+    return bool(df.attrs.get(COMPACT_FLAG, False))
+
+
+def normalize_transactions(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Приводит DataFrame с транзакциями к компактной типизированной схеме.
+
+    Даты разбираются один раз в datetime64, повторяющиеся строки хранятся как категории,
+    а денежные суммы - как целые копейки. Повторный вызов для уже нормализованного
+    DataFrame ничего не делает.
+
+    Args:
+        df (pd.DataFrame): DataFrame с транзакциями в исходном виде.
+
+    Returns:
+        pd.DataFrame: Нормализованный DataFrame.
+    """
+    if is_compact(df):
+        return df
+
+    result = df.copy()
+    for column, date_format in DATE_COLUMNS.items():
+        if column in result.columns and not pd.api.types.is_datetime64_any_dtype(result[column]):
+            result[column] = parse_dates(result[column], date_format)
+    for column in CATEGORY_COLUMNS:
+        if column in result.columns:
+            result[column] = result[column].astype("category")
+    for column in AMOUNT_COLUMNS:
+        if column in result.columns:
+            result[column] = to_kopecks(result[column])
+    result.attrs[COMPACT_FLAG] = True
+
+    report = get_footprint_report(df, result)
+    logging.info(
+        f"Нормализация транзакций: {report['before_bytes']} -> {report['after_bytes']} байт "
+        f"(экономия {report['saved_percent']}%)"
+    )
+    return result
+
+
+def expand_transactions(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Возвращает представление компактного DataFrame с суммами в рублях.
+
+    Категориальные столбцы и даты остаются без изменений, переводятся только суммы,
+    поэтому стоимость пропорциональна числу строк в представлении.
+
+    Args:
+        df (pd.DataFrame): Нормализованный DataFrame (или его срез).
+
+    Returns:
+        pd.DataFrame: DataFrame с суммами в рублях.
+    """
+    if not is_compact(df):
+        return df
+
+    result = df.copy(deep=False)
+    for column in AMOUNT_COLUMNS:
+        if column in result.columns:
+            result[column] = to_rubles(result[column])
+    result.attrs = {}
+    return result
+
+
+def concat_transactions(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Объединяет несколько DataFrame в компактной схеме.
+
+    Наборы категорий у разных частей обычно не совпадают, поэтому после объединения
+    категориальные столбцы собираются заново.
+
+    Args:
+        frames (List[pd.DataFrame]): Части транзакций в компактной схеме.
+
+    Returns:
+        pd.DataFrame: Объединенные транзакции в компактной схеме.
+    """
+    merged = pd.concat(frames, ignore_index=True)
+    for column in CATEGORY_COLUMNS:
+        if column in merged.columns and not isinstance(merged[column].dtype, pd.CategoricalDtype):
+            merged[column] = merged[column].astype("category")
+    merged.attrs[COMPACT_FLAG] = True
+    return merged
@@ -0,0 +1,219 @@
+import bisect
+import hashlib
+import logging
+import os
+import pickle
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.cache import get_cache_path
+from src.lookup import fold_name
+
+SEARCH_SUFFIX = ".search.pkl"
+SEARCH_VERSION = 1
+
+# Слово описания: буквы и цифры подряд
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Разбивает описание операции на слова без учета регистра.
+
+    Args:
+        text (str): Описание операции.
+
+    Returns:
+        List[str]: Слова в порядке появления (с "е" вместо "ё").
+    """
+    return TOKEN_PATTERN.findall(fold_name(text))
+
+
+def get_row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Возвращает хэши даты и описания каждой строки (по ним проверяется, что строки не менялись)."""
+    columns = [column for column in ("Дата операции", "Описание") if column in df.columns]
+    hashes: np.ndarray = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+    return hashes
+
+
+def get_digest(hashes: np.ndarray) -> str:
+    """Сворачивает хэши строк в один отпечаток."""
+    return hashlib.sha256(hashes.tobytes()).hexdigest()
+
+
+class DescriptionIndex:
+    """
+    Обратный индекс слов описаний операций.
+
+    Для каждого слова хранится отсортированный список позиций строк (posting list), поэтому
+    поиск по нескольким словам - пересечение списков, начиная с самого короткого, а период
+    задается диапазоном позиций из индекса дат хранилища. Слова выделяются один раз на каждое
+    различное описание, а не на каждую строку.
+
+    Индекс дополняется: строки, добавленные в конец, индексируются отдельно, а их позиции
+    дописываются в конец списков. Если уже проиндексированные строки изменились,
+    индекс строится заново.
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, np.ndarray] = {}
+        self.row_count = 0
+        self.digest = get_digest(np.empty(0, dtype="uint64"))
+        self._terms: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    @property
+    def terms(self) -> List[str]:
+        """Слова индекса в алфавитном порядке (для поиска по началу слова)."""
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        return self._terms
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Индексирует строки, которых еще нет в индексе.
+
+        Args:
+            df (pd.DataFrame): Транзакции в порядке позиций хранилища (см. TransactionStore.data).
+
+        Returns:
+            int: Количество проиндексированных строк (при перестроении - все строки).
+        """
+        hashes = get_row_hashes(df)
+        if len(df) < self.row_count or get_digest(hashes[: self.row_count]) != self.digest:
+            logging.info("Проиндексированные строки изменились, индекс описаний строится заново")
+            self.postings = {}
+            self.row_count = 0
+
+        start = self.row_count
+        if start < len(df) and "Описание" in df.columns:
+            self._add_rows(df["Описание"].iloc[start:], start)
+        self.row_count = len(df)
+        self.digest = get_digest(hashes)
+        return len(df) - start
+
+    def _add_rows(self, descriptions: pd.Series, offset: int) -> None:
+        """Добавляет в списки позиции новых строк (они больше всех уже проиндексированных)."""
+        codes, uniques = pd.factorize(descriptions)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        parts: Dict[str, List[np.ndarray]] = {}
+        for code, text in enumerate(uniques):
+            rows = order[bounds[code] : bounds[code + 1]] + offset
+            for token in set(tokenize(str(text))):
+                parts.setdefault(token, []).append(rows)
+
+        for token, token_parts in parts.items():
+            rows = np.sort(np.concatenate(token_parts)).astype("int64")
+            existing = self.postings.get(token)
+            self.postings[token] = rows if existing is None else np.concatenate([existing, rows])
+        self._terms = None
+
+    def _postings_for(self, token: str, prefix: bool) -> np.ndarray:
+        """Возвращает позиции строк со словом (или со словами, начинающимися с него)."""
+        if not prefix:
+            return self.postings.get(token, np.empty(0, dtype="int64"))
+        terms = self.terms
+        matches = []
+        for term in terms[bisect.bisect_left(terms, token) :]:
+            if not term.startswith(token):
+                break
+            matches.append(self.postings[term])
+        if not matches:
+            return np.empty(0, dtype="int64")
+        return matches[0] if len(matches) == 1 else np.unique(np.concatenate(matches))
+
+    def search(self, query: str, bounds: Optional[Tuple[int, int]] = None, prefix: bool = False) -> np.ndarray:
+        """
+        Ищет строки, в описании которых есть все слова запроса.
+
+        Args:
+            query (str): Слова запроса.
+            bounds (Optional[Tuple[int, int]]): Диапазон позиций строк [начало, конец), например период по датам.
+            prefix (bool): Считать последнее слово запроса началом слова ("Янд" найдет "Яндекс").
+
+        Returns:
+            np.ndarray: Отсортированные позиции найденных строк.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return np.empty(0, dtype="int64")
+        lists = [self._postings_for(token, prefix and i == len(tokens) - 1) for i, token in enumerate(tokens)]
+        lists.sort(key=len)
+
+        result = lists[0]
+        if bounds is not None:
+            low, high = np.searchsorted(result, bounds, side="left")
+            result = result[low:high]
+        for other in lists[1:]:
+            if not len(result):
+                break
+            result = result[np.isin(result, other, assume_unique=True)]
+        return result
+
+    def save(self, path: str) -> None:
+        """Сохраняет индекс атомарной заменой файла."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        state = {
+            "version": SEARCH_VERSION,
+            "row_count": self.row_count,
+            "digest": self.digest,
+            "postings": self.postings,
+        }
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"Не удалось сохранить индекс описаний {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path: str) -> "DescriptionIndex":
+        """Загружает индекс из файла; при отсутствии или повреждении файла возвращает пустой индекс."""
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            logging.warning(f"Не удалось прочитать индекс описаний {path}: {e}")
+            return index
+        if state.get("version") == SEARCH_VERSION:
+            index.postings = state["postings"]
+            index.row_count = state["row_count"]
+            index.digest = state["digest"]
+        return index
+
+
+def load_search_index(df: pd.DataFrame, source: Optional[str] = None) -> DescriptionIndex:
+    """
+    Возвращает индекс описаний, сохраненный рядом с файлом выписки, дополнив его новыми строками.
+
+    Для каталогов и glob-шаблонов индекс строится в памяти.
+
+    Args:
+        df (pd.DataFrame): Транзакции в порядке позиций хранилища.
+        source (Optional[str]): Путь к файлу выписки.
+
+    Returns:
+        DescriptionIndex: Индекс описаний всех строк.
+    """
+    if source is None or not os.path.isfile(source):
+        index = DescriptionIndex()
+        index.update(df)
+        return index
+
+    path = get_cache_path(source, SEARCH_SUFFIX)
+    index = DescriptionIndex.load(path)
+    if index.update(df) or not os.path.exists(path):
+        index.save(path)
+    return index
@@ -1,14 +1,18 @@
-import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, Hashable, List
+from typing import Any, Dict, Hashable, List, Sequence, Union
 
 import pandas as pd
 
+from src.cube import INVESTMENT_LIMITS, get_round_up_savings
+from src.schema import expand_transactions, get_year_month, parse_dates
+from src.store import DEFAULT_STATEMENT_PATH, TransactionStore, as_store
+from src.summary import format_cashback_analysis
 
-def get_info_from_excel() -> list[dict[Hashable, Any]]:
-    # Читаем данные из Excel-таблицы
-    df = pd.read_excel("data/operations.xls")
+
+def get_info_from_excel(source: Union[str, TransactionStore] = DEFAULT_STATEMENT_PATH) -> list[dict[Hashable, Any]]:
+    # Берем данные из хранилища или читаем их из Excel-таблицы, даты уже разобраны
+    df = as_store(source).df
     # Преобразуем данные в словарь
     data = df.to_dict("records")
     return data
@@ -26,34 +30,42 @@ def analyze_cashback(data: List[Dict[Hashable, Any]], year: int, month: int) ->
     Returns:
         str: JSON с анализом, сколько на каждой категории можно заработать кешбэка.
     """
+    return analyze_cashback_frame(pd.DataFrame(data), year, month)
+
 
-    # Инициализируем словарь для хранения результатов анализа
-    analysis: Dict[str, float] = {}
+def analyze_cashback_frame(df: Union[pd.DataFrame, TransactionStore], year: int, month: int) -> str:
+    """
+    Анализирует категории повышенного кешбэка по DataFrame без перебора строк.
 
-    # Итерируем по транзакциям
-    for transaction in data:
-        # Преобразуем строку даты в объект datetime
-        transaction_date = datetime.strptime(transaction.get("Дата операции", ""), "%d.%m.%Y %H:%M:%S")
+    Для хранилища суммы берутся из куба агрегатов.
 
-        # Проверяем, соответствует ли транзакция указанному году и месяцу
-        if transaction_date.year == year and transaction_date.month == month:
-            # Получаем категорию транзакции
-            category: str = transaction.get("Категория", "")
+    Args:
+        df (Union[pd.DataFrame, TransactionStore]): DataFrame с транзакциями или хранилище.
+        year (int): Год, за который проводится анализ.
+        month (int): Месяц, за который проводится анализ.
 
-            # Проверяем, есть ли кэшбэк для этой транзакции
-            if float(transaction.get("Бонусы (включая кэшбэк)", "0")) > 0:
-                # Если категория не существует в анализе, добавляем ее
-                if category not in analysis:
-                    analysis[category] = 0.0
+    Returns:
+        str: JSON с анализом, сколько на каждой категории можно заработать кешбэка.
+    """
+    if isinstance(df, TransactionStore):
+        cube = df.cube
+        cells = cube[(cube.index.get_level_values("year") == year) & (cube.index.get_level_values("month") == month)]
+        bonus = cells["bonus"].groupby(level="Категория", dropna=False).sum()
+        bonus = bonus[bonus > 0]
+        return format_cashback_analysis({str(category): float(value) for category, value in bonus.items()})
 
-                # Добавляем сумму кэшбэка к категории
-                analysis[category] += float(transaction.get("Бонусы (включая кэшбэк)", "0"))
+    if df.empty or "Дата операции" not in df.columns:
+        return format_cashback_analysis({})
 
-    # Сортируем словарь по значениям в порядке убывания
-    sorted_analysis: Dict[str, float] = dict(sorted(analysis.items(), key=lambda item: item[1], reverse=True))
+    # Отбираем транзакции указанного года и месяца с положительным кешбэком
+    years, months = get_year_month(parse_dates(df["Дата операции"]))
+    bonuses = pd.to_numeric(df.get("Бонусы (включая кэшбэк)", pd.Series(0, index=df.index)), errors="coerce")
+    mask = (years == year) & (months == month) & (bonuses > 0)
 
-    # Возвращаем результаты анализа в формате JSON
-    return json.dumps(sorted_analysis, indent=4, ensure_ascii=False)
+    # Суммируем кешбэк по категориям
+    categories = df.get("Категория", pd.Series("", index=df.index)).astype(object)
+    sums = bonuses[mask].astype("float64").groupby(categories[mask], dropna=False).sum()
+    return format_cashback_analysis({str(category): float(value) for category, value in sums.items()})
 
 
 def round_up_amount(amount: float, limit: int) -> float:
@@ -71,6 +83,64 @@ def round_up_amount(amount: float, limit: int) -> float:
     return -(-amount // limit) * limit - amount
 
 
+def get_investment_grid(
+    df: Union[pd.DataFrame, TransactionStore], limits: Sequence[int] = INVESTMENT_LIMITS
+) -> pd.DataFrame:
+    """
+    Рассчитывает суммы «Инвесткопилки» сразу для всех месяцев и пределов округления за один проход.
+
+    Для хранилища суммы по стандартным пределам берутся из куба агрегатов.
+
+    Args:
+        df: DataFrame с транзакциями или хранилище.
+        limits: Пределы округления сумм операций.
+
+    Returns:
+        Таблица отложенных сумм: строки - месяцы ('YYYY-MM'), столбцы - пределы округления.
+    """
+    if isinstance(df, TransactionStore):
+        if not set(limits) <= set(INVESTMENT_LIMITS):
+            return get_investment_grid(df.data, limits)
+        cube_grid = df.cube[[f"savings_{limit}" for limit in limits]].groupby(level=["year", "month"]).sum()
+        cube_grid.index = pd.Index([f"{year:04d}-{month:02d}" for year, month in cube_grid.index], name="Месяц")
+        cube_grid.columns = pd.Index(list(limits), name="Предел")
+        return cube_grid
+
+    grid = pd.DataFrame(columns=list(limits), dtype="float64")
+    if df.empty or "Дата операции" not in df.columns or "Сумма операции" not in df.columns:
+        return grid
+    df = expand_transactions(df)
+
+    # Разбираем все даты одним вызовом
+    raw_dates = df["Дата операции"]
+    dates = parse_dates(raw_dates)
+    for transaction in df[raw_dates.isna()].to_dict("records"):
+        logging.warning(f"Пропущена транзакция без даты: {transaction}")
+    for transaction in df[dates.isna() & raw_dates.notna()].to_dict("records"):
+        logging.error(f"Ошибка при парсинге даты транзакции: transaction: {transaction}")
+
+    # Учитываем только числовые суммы
+    amounts = df["Сумма операции"]
+    if not pd.api.types.is_numeric_dtype(amounts):
+        amounts = amounts.where(amounts.map(lambda amount: isinstance(amount, (int, float))))
+    for transaction in df[dates.notna() & amounts.isna()].to_dict("records"):
+        logging.warning(f"Пропущена транзакция с некорректной суммой: {transaction}")
+
+    valid = (dates.notna() & amounts.notna()).to_numpy()
+    if not valid.any():
+        return grid
+
+    # Округляем каждую сумму сразу до всех пределов: матрица операции x пределы
+    savings = get_round_up_savings(amounts[valid].to_numpy(dtype="float64"), limits)
+
+    years, months = get_year_month(dates[valid])
+    keys = (years * 100 + months).to_numpy()
+    grid = pd.DataFrame(savings, columns=list(limits)).groupby(keys).sum()
+    grid.index = pd.Index([f"{key // 100:04d}-{key % 100:02d}" for key in grid.index], name="Месяц")
+    grid.columns.name = "Предел"
+    return grid
+
+
 def investment_bank(month: str, transactions: List[Dict[Hashable, Any]], limit: int) -> float:
     """
     Рассчитывает сумму, которую удалось бы отложить в «Инвесткопилку» за заданный месяц.
@@ -83,27 +153,12 @@ def investment_bank(month: str, transactions: List[Dict[Hashable, Any]], limit:
     Returns:
         Сумма, которую удалось бы отложить в «Инвесткопилку».
     """
-
-    total_savings = 0.0
-    for transaction in transactions:
-        # Предполагаем, что в Excel-файле столбец с датой называется "Дата операции"
-        transaction_date_str = transaction.get("Дата операции")
-        if transaction_date_str:
-            try:
-                # Преобразование строки в datetime объект
-                transaction_date = pd.to_datetime(transaction_date_str, format="%d.%m.%Y %H:%M:%S").date()
-            except ValueError as e:
-                logging.error(f"Ошибка при парсинге даты транзакции: {e}, transaction: {transaction}")
-                continue
-
-            if transaction_date.strftime("%Y-%m") == month:
-                transaction_amount = transaction.get("Сумма операции")
-                if isinstance(transaction_amount, (int, float)):
-                    savings = round_up_amount(transaction_amount, limit)
-                    total_savings += savings
-                else:
-                    logging.warning(f"Пропущена транзакция с некорректной суммой: {transaction}")
-        else:
-            logging.warning(f"Пропущена транзакция без даты: {transaction}")
-
-    return total_savings
+    try:
+        target = datetime.strptime(month, "%Y-%m").strftime("%Y-%m")
+    except ValueError as e:
+        logging.error(f"Некорректный месяц: {e}")
+        return 0.0
+
+    grid = get_investment_grid(pd.DataFrame(transactions), [limit])
+    savings: float = grid[limit].get(target, 0.0)
+    return float(savings)
@@ -0,0 +1,176 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Literal
+
+import pandas as pd
+
+from src.arrow import require_pyarrow
+
+# Признак остановки фонового потока записи
+_STOP = object()
+
+
+def to_record(name: str, result: Any, created_at: datetime) -> Dict[str, Any]:
+    """
+    Приводит результат отчета к словарю, который можно записать в JSON.
+
+    Args:
+        name (str): Название отчета.
+        result (Any): Результат функции-отчета.
+        created_at (datetime): Время формирования отчета.
+
+    Returns:
+        Dict[str, Any]: Запись отчета с названием, временем и данными.
+    """
+    data: Any
+    if isinstance(result, pd.DataFrame):
+        data = json.loads(result.to_json(orient="records", date_format="iso", force_ascii=False))
+    elif isinstance(result, pd.Series):
+        data = json.loads(result.to_json(date_format="iso", force_ascii=False))
+    else:
+        data = result
+    return {"report": name, "created_at": created_at.isoformat(), "data": data}
+
+
+class ReportSink:
+    """
+    Фоновая запись результатов отчетов.
+
+    Функция-отчет только кладет результат в очередь и сразу возвращает управление;
+    поток записи собирает результаты пачками и дописывает их в файл NDJSON (одна строка
+    JSON на отчет) или сохраняет таблицы в Parquet. Файл NDJSON ротируется по размеру.
+    Очередь дописывается при закрытии приложения, поэтому результаты не теряются.
+    """
+
+    def __init__(
+        self,
+        path: str = "reports.ndjson",
+        file_format: Literal["ndjson", "parquet"] = "ndjson",
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 3,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            path (str): Файл NDJSON или каталог для файлов Parquet.
+            file_format (Literal["ndjson", "parquet"]): Формат записи.
+            max_bytes (int): Размер файла NDJSON, после которого он ротируется.
+            backup_count (int): Количество хранимых старых файлов NDJSON.
+            batch_size (int): Наибольшее количество отчетов в одной записи на диск.
+            flush_interval (float): Наибольшее время ожидания пачки в секундах.
+        """
+        if file_format == "parquet":
+            require_pyarrow()
+            os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.file_format = file_format
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._counter = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="report-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, name: str, result: Any) -> None:
+        """
+        Ставит результат отчета в очередь на запись.
+
+        Args:
+            name (str): Название отчета.
+            result (Any): Результат функции-отчета.
+        """
+        if self._closed:
+            raise RuntimeError("Запись отчетов уже остановлена")
+        if isinstance(result, (pd.DataFrame, pd.Series)):
+            # Поверхностная копия не копирует данные, но отвязывает запись от последующих изменений
+            # состава столбцов и индекса; в JSON таблица переводится уже в потоке записи
+            result = result.copy(deep=False)
+        self._queue.put((name, result, datetime.now()))
+
+    def flush(self) -> None:
+        """Ждет, пока все поставленные в очередь отчеты будут записаны."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Дописывает очередь и останавливает поток записи."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "ReportSink":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Собирает отчеты из очереди пачками и записывает их."""
+        stopping = False
+        while not stopping:
+            batch: List[Any] = [self._queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is _STOP
+            items = [item for item in batch if item is not _STOP]
+            try:
+                if items:
+                    self._write_batch(items)
+            except Exception as e:
+                logging.error(f"Не удалось записать отчеты в {self.path}: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, items: List[Any]) -> None:
+        """Записывает пачку отчетов на диск."""
+        if self.file_format == "parquet":
+            for name, result, created_at in items:
+                self._write_parquet(name, result, created_at)
+            return
+
+        lines = "".join(
+            json.dumps(to_record(name, result, created_at), ensure_ascii=False, default=str) + "\n"
+            for name, result, created_at in items
+        )
+        self._rotate_if_needed()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def _write_parquet(self, name: str, result: Any, created_at: datetime) -> None:
+        """Сохраняет таблицу отчета в отдельный файл Parquet."""
+        if isinstance(result, pd.Series):
+            result = result.reset_index()
+        elif not isinstance(result, pd.DataFrame):
+            result = pd.DataFrame({"result": [json.dumps(result, ensure_ascii=False, default=str)]})
+        self._counter += 1
+        filename = f"{name}-{created_at:%Y%m%d%H%M%S}-{self._counter:06d}.parquet"
+        result.to_parquet(os.path.join(self.path, filename), index=False)
+
+    def _rotate_if_needed(self) -> None:
+        """Переименовывает заполненный файл NDJSON: reports.ndjson -> reports.ndjson.1 -> ..."""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < self.max_bytes:
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
@@ -0,0 +1,300 @@
+import os
+from datetime import datetime
+from typing import Dict, List, Literal, Optional, Tuple, Union
+
+import pandas as pd
+
+from src.cube import CUBE_KEYS, build_cube, load_cube
+from src.incremental import IncrementalStatement
+from src.ingest import load_statements
+from src.lookup import NameIndex
+from src.rolling import CategoryPrefixSums
+from src.schema import expand_transactions, memory_footprint, normalize_transactions, to_rubles
+from src.search import DescriptionIndex, load_search_index
+
+DEFAULT_STATEMENT_PATH = "data/operations.xls"
+
+
+class TransactionStore:
+    """
+    Выписка, загруженная и подготовленная один раз за сессию.
+
+    Все функции, которым нужны транзакции, получают отфильтрованные представления
+    из хранилища вместо повторного чтения Excel-файла. Внутри транзакции хранятся
+    в компактной схеме (категории и копейки), представления возвращаются с суммами в рублях.
+
+    Транзакции отсортированы по дате операции, поэтому выборка за период находится
+    двоичным поиском и стоит O(log n + k) вместо полного просмотра. Помесячные суммы
+    берутся из куба агрегатов (см. src.cube), по строкам считаются только неполные месяцы.
+    """
+
+    def __init__(self, df: pd.DataFrame, source: Optional[str] = None, cube: Optional[pd.DataFrame] = None) -> None:
+        """
+        Args:
+            df (pd.DataFrame): DataFrame с транзакциями в исходной или компактной схеме.
+            source (Optional[str]): Путь к выписке, рядом с которой сохраняется куб агрегатов.
+            cube (Optional[pd.DataFrame]): Готовый куб агрегатов этих транзакций (см. src.cube).
+        """
+        data = normalize_transactions(df)
+        # Строки без даты попадают в конец и в выборки по периоду не входят
+        dated = int(data["Дата операции"].notna().sum())
+        head = data["Дата операции"].iloc[:dated]
+        if head.hasnans or not head.is_monotonic_increasing:
+            data = data.sort_values("Дата операции", kind="stable", na_position="last")
+        if not data.index.equals(pd.RangeIndex(len(data))):
+            # Без Copy-on-Write reset_index копирует все столбцы, поэтому индекс заменяется
+            # в поверхностной копии, а столбцы (в том числе отображенные из Arrow) остаются общими
+            data = data.copy(deep=False)
+            data.index = pd.RangeIndex(len(data))
+        self.data = data
+        self.dates = pd.DatetimeIndex(self.data["Дата операции"].dropna())
+        self.source = source
+        self._cube = cube
+        self._category_sums: Optional[CategoryPrefixSums] = None
+        self._name_indexes: Dict[str, NameIndex] = {}
+        self._search_index: Optional[DescriptionIndex] = None
+
+    def _position(self, date: datetime, side: Literal["left", "right"]) -> int:
+        """Находит позицию даты в отсортированном индексе двоичным поиском."""
+        value = pd.Timestamp(date)
+        if len(self.dates) == 0 or value < self.dates[0]:
+            return 0
+        if value > self.dates[-1]:
+            return len(self.dates)
+        return int(self.dates.searchsorted(value, side=side))
+
+    def date_slice(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> slice:
+        """
+        Возвращает диапазон позиций строк, попадающих в период.
+
+        Args:
+            start_date (Optional[datetime]): Начальная дата (включительно).
+            end_date (Optional[datetime]): Конечная дата (включительно).
+
+        Returns:
+            slice: Диапазон позиций в отсортированных транзакциях.
+        """
+        start = self._position(start_date, "left") if start_date else 0
+        stop = self._position(end_date, "right") if end_date else len(self.dates)
+        return slice(start, max(start, stop))
+
+    @classmethod
+    def from_file(
+        cls, filepath: str = DEFAULT_STATEMENT_PATH, max_workers: Optional[int] = None, incremental: bool = False
+    ) -> "TransactionStore":
+        """
+        Загружает выписку из файла или несколько выписок из каталога или по glob-шаблону.
+
+        Args:
+            filepath (str): Путь к файлу выписки, каталогу или glob-шаблон.
+            max_workers (Optional[int]): Количество процессов для параллельного разбора нескольких файлов.
+            incremental (bool): Разбирать только строки, добавленные в выписку с прошлого запуска.
+                Для одного файла куб агрегатов тоже берется из инкрементального снимка.
+
+        Returns:
+            TransactionStore: Хранилище с транзакциями из выписок.
+        """
+        if incremental and os.path.isfile(filepath):
+            statement = IncrementalStatement(filepath)
+            statement.refresh()
+            return cls(statement.frame, source=filepath, cube=statement.cube)
+        return cls(load_statements(filepath, max_workers, incremental), source=filepath)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Все транзакции с суммами в рублях."""
+        return expand_transactions(self.data)
+
+    def memory_usage(self) -> int:
+        """Возвращает объем памяти, занимаемый транзакциями в хранилище, в байтах."""
+        return memory_footprint(self.data)
+
+    @property
+    def cube(self) -> pd.DataFrame:
+        """Помесячный куб агрегатов по картам и категориям (строится или загружается при первом обращении)."""
+        if self._cube is None:
+            self._cube = load_cube(self.data, self.source)
+        return self._cube
+
+    @property
+    def category_sums(self) -> CategoryPrefixSums:
+        """Накопленные суммы трат по категориям (строятся при первом обращении)."""
+        if self._category_sums is None:
+            self._category_sums = CategoryPrefixSums(self.data)
+        return self._category_sums
+
+    def name_index(self, column: str) -> NameIndex:
+        """
+        Возвращает индекс для поиска значений столбца без учета регистра и с опечатками.
+
+        Args:
+            column (str): Столбец, например "Категория" или "Описание" (места покупок).
+
+        Returns:
+            NameIndex: Индекс значений столбца (строится при первом обращении).
+        """
+        if column not in self._name_indexes:
+            values = self.data[column]
+            names = values.cat.categories if isinstance(values.dtype, pd.CategoricalDtype) else values.unique()
+            self._name_indexes[column] = NameIndex(names)
+        return self._name_indexes[column]
+
+    @property
+    def search_index(self) -> DescriptionIndex:
+        """Обратный индекс слов описаний (загружается и дополняется новыми строками при первом обращении)."""
+        if self._search_index is None:
+            self._search_index = load_search_index(self.data, self.source)
+        return self._search_index
+
+    def search(
+        self,
+        query: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        prefix: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Ищет транзакции, в описании которых есть все слова запроса, за период.
+
+        Args:
+            query (str): Слова запроса, например "Яндекс".
+            start_date (Optional[datetime]): Начальная дата (включительно).
+            end_date (Optional[datetime]): Конечная дата (включительно).
+            prefix (bool): Считать последнее слово запроса началом слова.
+
+        Returns:
+            pd.DataFrame: Найденные транзакции.
+        """
+        bounds = None
+        if start_date or end_date:
+            period = self.date_slice(start_date, end_date)
+            bounds = (period.start, period.stop)
+        positions = self.search_index.search(query, bounds, prefix)
+        return expand_transactions(self.data.iloc[positions])
+
+    def _month_bounds(self, position: int) -> Tuple[int, int]:
+        """Возвращает позиции первой строки месяца, в который попадает строка, и первой строки следующего."""
+        month_start = self.dates[position].normalize().replace(day=1)
+        next_month_start = month_start + pd.offsets.MonthBegin(1)
+        return int(self.dates.searchsorted(month_start)), int(self.dates.searchsorted(next_month_start))
+
+    def summarize(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Возвращает помесячные агрегаты по картам и категориям за период.
+
+        Месяцы, целиком попадающие в период, берутся из куба, а по строкам считаются только
+        неполные первый и последний месяцы, поэтому стоимость не зависит от длины истории.
+
+        Args:
+            start_date (Optional[datetime]): Начальная дата (включительно).
+            end_date (Optional[datetime]): Конечная дата (включительно).
+
+        Returns:
+            pd.DataFrame: Часть куба за период (см. src.cube.build_cube).
+        """
+        period = self.date_slice(start_date, end_date)
+        start, stop = period.start, period.stop
+        if start >= stop:
+            return self.cube.iloc[0:0]
+
+        # Неполные месяцы на краях периода считаются по строкам
+        partial: List[Tuple[int, int]] = []
+        full_start, full_stop = start, stop
+        first_month_start, first_month_stop = self._month_bounds(start)
+        if first_month_start < start:
+            full_start = min(first_month_stop, stop)
+            partial.append((start, full_start))
+        last_month_start, last_month_stop = self._month_bounds(stop - 1)
+        if last_month_stop > stop and last_month_start >= full_start:
+            full_stop = last_month_start
+            partial.append((last_month_start, stop))
+
+        parts = [build_cube(self.data.iloc[a:b]) for a, b in partial]
+        if full_start < full_stop:
+            first, last = self.dates[full_start], self.dates[full_stop - 1]
+            keys = self.cube.index.get_level_values(0) * 100 + self.cube.index.get_level_values(1)
+            mask = (keys >= first.year * 100 + first.month) & (keys <= last.year * 100 + last.month)
+            parts.append(self.cube[mask])
+        return pd.concat(parts).sort_index() if len(parts) > 1 else parts[0]
+
+    def summary_frame(
+        self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Возвращает суммы расходов и поступлений за период по картам и категориям.
+
+        Каждая строка - итог расходов или поступлений одной пары (карта, категория) с суммой
+        в рублях, поэтому результат можно передать в get_card_from_main, get_expenses и
+        get_income вместо всех транзакций периода.
+
+        Args:
+            start_date (Optional[datetime]): Начальная дата (включительно).
+            end_date (Optional[datetime]): Конечная дата (включительно).
+
+        Returns:
+            pd.DataFrame: DataFrame со столбцами "Номер карты", "Категория" и "Сумма операции".
+        """
+        totals = self.summarize(start_date, end_date).groupby(level=CUBE_KEYS[2:], dropna=False).sum()
+        frame: pd.DataFrame = pd.concat([totals["expenses"], totals["income"]]).rename("Сумма операции").reset_index()
+        frame = frame[frame["Сумма операции"] != 0].reset_index(drop=True)
+        frame["Сумма операции"] = to_rubles(frame["Сумма операции"])
+        return frame
+
+    def filter(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        card: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Возвращает транзакции, отфильтрованные по дате, карте и категории.
+
+        Args:
+            start_date (Optional[datetime]): Начальная дата (включительно).
+            end_date (Optional[datetime]): Конечная дата (включительно).
+            card (Optional[str]): Номер карты.
+            category (Optional[str]): Категория.
+
+        Returns:
+            pd.DataFrame: Отфильтрованные транзакции.
+        """
+        df = self.data
+        if start_date or end_date:
+            df = df.iloc[self.date_slice(start_date, end_date)]
+        mask = pd.Series(True, index=df.index)
+        if card is not None:
+            mask &= df["Номер карты"] == card
+        if category is not None:
+            mask &= df["Категория"] == category
+        return expand_transactions(df[mask])
+
+    def between(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> pd.DataFrame:
+        """Возвращает транзакции за период."""
+        return self.filter(start_date=start_date, end_date=end_date)
+
+    def by_card(self, card: str) -> pd.DataFrame:
+        """Возвращает транзакции по карте."""
+        return self.filter(card=card)
+
+    def by_category(self, category: str) -> pd.DataFrame:
+        """Возвращает транзакции по категории."""
+        return self.filter(category=category)
+
+
+def as_store(source: Union[str, TransactionStore]) -> TransactionStore:
+    """
+    Приводит путь к файлу или готовое хранилище к TransactionStore.
+
+    Args:
+        source (Union[str, TransactionStore]): Путь к Excel-файлу или хранилище.
+
+    Returns:
+        TransactionStore: Хранилище с транзакциями.
+    """
+    if isinstance(source, TransactionStore):
+        return source
+    return TransactionStore.from_file(source)
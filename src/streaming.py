@@ -0,0 +1,248 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from src.cache import CSV_OPTIONS
+from src.schema import normalize_transactions, to_rubles
+from src.summary import format_cashback_analysis, get_card_from_main, get_expenses, get_income
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Форматы, которые читаются частями без загрузки всего файла
+STREAMING_EXTENSIONS = (".csv", ".xlsx")
+
+
+def iter_csv_chunks(filepath: str, chunksize: int = DEFAULT_CHUNK_SIZE, **kwargs: Any) -> Iterator[pd.DataFrame]:
+    """
+    Читает CSV-выписку частями фиксированного размера.
+
+    Args:
+        filepath (str): Путь к CSV-файлу.
+        chunksize (int): Количество строк в одной части.
+        **kwargs: Дополнительные параметры для pd.read_csv (по умолчанию разделитель ";" и десятичная запятая,
+            как в выгрузках банка).
+
+    Yields:
+        pd.DataFrame: Очередная часть выписки.
+    """
+    options = {**CSV_OPTIONS, **kwargs}
+    with pd.read_csv(filepath, chunksize=chunksize, **options) as reader:
+        yield from reader
+
+
+def iter_xlsx_chunks(filepath: str, chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Читает XLSX-выписку пачками строк через книгу в режиме только для чтения.
+
+    Args:
+        filepath (str): Путь к XLSX-файлу.
+        chunksize (int): Количество строк в одной пачке.
+
+    Yields:
+        pd.DataFrame: Очередная пачка строк выписки.
+    """
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) for name in header]
+        batch: List[Any] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunksize:
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_statement_chunks(filepath: str, chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Читает выписку частями и приводит каждую часть к типизированному виду.
+
+    Потоково читаются только CSV и XLSX. Формат XLS не поддерживает потоковое чтение:
+    такой файл нужно сохранить как CSV или XLSX либо загрузить целиком через TransactionStore.
+
+    Args:
+        filepath (str): Путь к файлу выписки (.csv или .xlsx).
+        chunksize (int): Количество строк в одной части.
+
+    Yields:
+        pd.DataFrame: Часть выписки в компактной схеме (даты разобраны, суммы в копейках).
+
+    Raises:
+        ValueError: Если формат файла не поддерживает потоковое чтение.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    chunks: Iterable[pd.DataFrame]
+    if extension == ".csv":
+        chunks = iter_csv_chunks(filepath, chunksize)
+    elif extension == ".xlsx":
+        chunks = iter_xlsx_chunks(filepath, chunksize)
+    else:
+        raise ValueError(f"Потоковое чтение поддерживается только для {', '.join(STREAMING_EXTENSIONS)}: {filepath}")
+
+    for chunk in chunks:
+        yield normalize_transactions(chunk)
+
+
+class ChunkAggregator(ABC):
+    """
+    Базовый класс агрегатора, который накапливает результат по частям выписки.
+
+    Суммы накапливаются в целых копейках, поэтому результат не зависит от размера частей.
+    """
+
+    def __init__(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> None:
+        """
+        Args:
+            start_date (Optional[datetime]): Начальная дата (включительно).
+            end_date (Optional[datetime]): Конечная дата (включительно).
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def select(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Оставляет в части выписки только строки из заданного периода."""
+        if self.start_date:
+            chunk = chunk[chunk["Дата операции"] >= self.start_date]
+        if self.end_date:
+            chunk = chunk[chunk["Дата операции"] <= self.end_date]
+        return chunk
+
+    @abstractmethod
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Учитывает очередную часть выписки."""
+
+    @abstractmethod
+    def result(self) -> Any:
+        """Возвращает накопленный результат."""
+
+
+def add_sums(total: Optional[pd.Series], chunk_sums: pd.Series) -> pd.Series:
+    """Складывает накопленные суммы по группам с суммами очередной части."""
+    if total is None:
+        return chunk_sums
+    return total.add(chunk_sums, fill_value=0)
+
+
+class CardSummaryAggregator(ChunkAggregator):
+    """Накапливает суммы операций по картам, результат совпадает с get_card_from_main."""
+
+    def __init__(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> None:
+        super().__init__(start_date, end_date)
+        self.sums: Optional[pd.Series] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        chunk = self.select(chunk)
+        chunk_sums = chunk.groupby(chunk["Номер карты"].astype(object))["Сумма операции"].sum()
+        self.sums = add_sums(self.sums, chunk_sums)
+
+    def result(self) -> List[Dict[str, Any]]:
+        if self.sums is None:
+            return []
+        return get_card_from_main(to_rubles(self.sums).rename_axis("Номер карты").reset_index())
+
+
+class ExpenseIncomeAggregator(ChunkAggregator):
+    """
+    Накапливает расходы и поступления по категориям.
+
+    Хранятся только суммы отрицательных и положительных операций по каждой категории,
+    результат строится теми же функциями get_expenses и get_income.
+    """
+
+    def __init__(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> None:
+        super().__init__(start_date, end_date)
+        self.expenses: Optional[pd.Series] = None
+        self.income: Optional[pd.Series] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        chunk = self.select(chunk)
+        amounts = chunk["Сумма операции"]
+        categories = chunk["Категория"].astype(object)
+        self.expenses = add_sums(self.expenses, amounts[amounts < 0].groupby(categories, dropna=False).sum())
+        self.income = add_sums(self.income, amounts[amounts > 0].groupby(categories, dropna=False).sum())
+
+    def result(self) -> Dict[str, Any]:
+        empty = pd.Series(dtype="int64")
+        expenses = to_rubles(self.expenses if self.expenses is not None else empty)
+        income = to_rubles(self.income if self.income is not None else empty)
+        return {
+            "expenses": get_expenses(expenses.rename_axis("Категория").reset_index(name="Сумма операции")),
+            "income": get_income(income.rename_axis("Категория").reset_index(name="Сумма операции")),
+        }
+
+
+class CashbackAggregator(ChunkAggregator):
+    """Накапливает кешбэк по категориям за месяц, результат совпадает с analyze_cashback."""
+
+    def __init__(self, year: int, month: int) -> None:
+        super().__init__()
+        self.year = year
+        self.month = month
+        self.sums: Optional[pd.Series] = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        dates = chunk["Дата операции"]
+        # Как и в analyze_cashback_frame, выписка без столбца бонусов дает нулевой кешбэк
+        bonuses = pd.to_numeric(chunk.get("Бонусы (включая кэшбэк)", pd.Series(0, index=chunk.index)), errors="coerce")
+        mask = (dates.dt.year == self.year) & (dates.dt.month == self.month) & (bonuses > 0)
+        chunk_sums = bonuses[mask].astype("float64").groupby(chunk["Категория"].astype(object)[mask]).sum()
+        self.sums = add_sums(self.sums, chunk_sums)
+
+    def result(self) -> str:
+        analysis: Dict[str, float] = {}
+        if self.sums is not None:
+            analysis = {str(category): float(value) for category, value in self.sums.items()}
+        return format_cashback_analysis(analysis)
+
+
+def aggregate_statement(
+    filepath: str, aggregators: Iterable[ChunkAggregator], chunksize: int = DEFAULT_CHUNK_SIZE
+) -> None:
+    """
+    Прогоняет выписку через агрегаторы за один проход, не загружая ее целиком в память.
+
+    Args:
+        filepath (str): Путь к файлу выписки.
+        aggregators (Iterable[ChunkAggregator]): Агрегаторы, которые нужно обновить.
+        chunksize (int): Количество строк в одной части.
+    """
+    aggregators = list(aggregators)
+    for chunk in iter_statement_chunks(filepath, chunksize):
+        for aggregator in aggregators:
+            aggregator.update(chunk)
+
+
+def summarize_statement(filepath: str, year: int, month: int, chunksize: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Считает сводку за месяц по картам, расходам, доходам и кешбэку за один потоковый проход по выписке.
+
+    В памяти одновременно находится только одна часть выписки и накопленные суммы.
+
+    Args:
+        filepath (str): Путь к файлу выписки (.csv или .xlsx).
+        year (int): Год сводки.
+        month (int): Месяц сводки.
+        chunksize (int): Количество строк в одной части.
+
+    Returns:
+        Dict[str, Any]: Сводка с ключами cards, expenses, income и cashback.
+    """
+    start_date = datetime(year, month, 1)
+    end_date = (pd.Timestamp(start_date) + pd.offsets.MonthEnd(0)).replace(hour=23, minute=59, second=59)
+    cards = CardSummaryAggregator(start_date, end_date)
+    events = ExpenseIncomeAggregator(start_date, end_date)
+    cashback = CashbackAggregator(year, month)
+    aggregate_statement(filepath, [cards, events, cashback], chunksize)
+    return {"cards": cards.result(), **events.result(), "cashback": json.loads(cashback.result())}
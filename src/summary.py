@@ -0,0 +1,185 @@
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Доля кешбэка по картам на главной странице
+CARD_CASHBACK_RATE = 0.01
+
+
+def get_card_summary(df: pd.DataFrame, cashback_rate: float = CARD_CASHBACK_RATE) -> pd.DataFrame:
+    """
+    Считает сводку по картам: сумму операций, кешбэк, количество, среднюю, наибольшую сумму и 95-й перцентиль.
+
+    Все показатели считаются за один проход без цикла по картам: операции один раз сортируются
+    по карте и сумме, после чего суммы и количества получаются через np.bincount, а наибольшая
+    сумма и перцентиль - обращением к нужным позициям внутри участка каждой карты.
+
+    Количество, средняя, наибольшая сумма и перцентиль имеют смысл только для отдельных операций.
+    Для уже сгруппированных строк (например, TransactionStore.summary_frame) верны лишь total_spent
+    и cashback.
+
+    Args:
+        df (pd.DataFrame): DataFrame со столбцами "Номер карты" и "Сумма операции" - по строке на операцию.
+        cashback_rate (float): Доля кешбэка от суммы операций.
+
+    Returns:
+        pd.DataFrame: По строке на карту со столбцами last_digits, total_spent, cashback, count, mean, max и p95.
+    """
+    codes, cards = pd.factorize(df["Номер карты"], sort=True)
+    amounts = pd.to_numeric(df["Сумма операции"], errors="coerce").to_numpy(dtype="float64")
+    valid = (codes >= 0) & ~np.isnan(amounts)
+    order = np.lexsort((amounts[valid], codes[valid]))
+    codes, amounts = codes[valid][order], amounts[valid][order]
+
+    count = np.bincount(codes, minlength=len(cards))
+    # Суммы складываются в целых копейках, как в компактной схеме: так в итог не попадает погрешность дробей
+    total = np.bincount(codes, weights=np.round(amounts * 100), minlength=len(cards)) / 100
+    starts = np.cumsum(count) - count
+    has_rows = count > 0
+
+    # Наибольшая сумма - последняя в участке карты, перцентиль - линейная интерполяция, как в pandas
+    position = starts + (np.maximum(count, 1) - 1) * 0.95
+    low = np.floor(position).astype("int64")
+    high = np.ceil(position).astype("int64")
+    values = np.append(amounts, np.nan)
+    low[~has_rows] = high[~has_rows] = len(amounts)
+    p95 = values[low] + (values[high] - values[low]) * (position - low)
+    maximum = values[np.where(has_rows, starts + count - 1, len(amounts))]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(has_rows, total / np.maximum(count, 1), np.nan)
+    return pd.DataFrame(
+        {
+            "last_digits": pd.Index(cards).astype(str).str[-4:],
+            "total_spent": total,
+            "cashback": np.round(total * cashback_rate, 2),
+            "count": count,
+            "mean": mean,
+            "max": maximum,
+            "p95": p95,
+        }
+    )
+
+
+def get_card_from_main(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Получает информацию о картах из основного DataFrame.
+
+    Используются только суммы по картам, поэтому можно передать и сгруппированные строки
+    (TransactionStore.summary_frame).
+
+    Args:
+        df (pd.DataFrame): Основной DataFrame с данными о транзакциях.
+
+    Returns:
+        List[Dict[str, Any]]: Список словарей, содержащих информацию о картах.
+    """
+    summary = get_card_summary(df)
+    return [
+        {"last_digits": last_digits, "total_spent": total_spent, "cashback": cashback}
+        for last_digits, total_spent, cashback in zip(
+            summary["last_digits"], summary["total_spent"].tolist(), summary["cashback"].tolist()
+        )
+    ]
+
+
+def get_card_stats(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Получает статистику операций по картам: количество, среднюю, наибольшую сумму и 95-й перцентиль.
+
+    Args:
+        df (pd.DataFrame): DataFrame с транзакциями - по строке на операцию (не сгруппированные суммы).
+
+    Returns:
+        List[Dict[str, Any]]: Список словарей со статистикой по каждой карте.
+    """
+    summary = get_card_summary(df)
+    stats = summary[["mean", "max", "p95"]].round(2)
+    # У карты без сумм показателей нет: в JSON они попадают как null
+    summary[stats.columns] = stats.astype(object).where(stats.notna(), None)
+    return [
+        {"last_digits": last_digits, "count": count, "mean": mean, "max": maximum, "p95": p95}
+        for last_digits, count, mean, maximum, p95 in zip(
+            summary["last_digits"],
+            summary["count"].tolist(),
+            summary["mean"].tolist(),
+            summary["max"].tolist(),
+            summary["p95"].tolist(),
+        )
+    ]
+
+
+def get_expenses(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Получает информацию о расходах из DataFrame.
+
+    Args:
+        df (pd.DataFrame): DataFrame с данными о транзакциях.
+
+    Returns:
+        Dict[str, Any]: Словарь с информацией о расходах.
+    """
+
+    expenses = df[df["Сумма операции"] < 0]
+    total_amount = round(abs(expenses["Сумма операции"].sum()))
+    main_categories = (
+        expenses.groupby("Категория", observed=True)["Сумма операции"].sum().abs().nlargest(7).reset_index()
+    )
+    other_amount = abs(expenses[~expenses["Категория"].isin(main_categories["Категория"])]["Сумма операции"].sum())
+    main_expenses = main_categories.to_dict("records")
+    if other_amount > 0:
+        main_expenses.append({"Категория": "Остальное", "Сумма операции": round(other_amount)})
+    transfers_and_cash = (
+        expenses[expenses["Категория"].isin(["Наличные", "Переводы"])]
+        .groupby("Категория", observed=True)["Сумма операции"]
+        .sum()
+        .abs()
+        .reset_index()
+        .to_dict("records")
+    )
+    return {
+        "total_amount": total_amount,
+        "main": [{"category": row["Категория"], "amount": round(row["Сумма операции"])} for row in main_expenses],
+        "transfers_and_cash": [
+            {"category": row["Категория"], "amount": round(row["Сумма операции"])} for row in transfers_and_cash
+        ],
+    }
+
+
+def get_income(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Получает информацию о доходах из DataFrame.
+
+    Args:
+        df (pd.DataFrame): DataFrame с данными о транзакциях.
+
+    Returns:
+        Dict[str, Any]: Словарь с информацией о доходах.
+    """
+    income = df[df["Сумма операции"] > 0]
+    total_amount = round(income["Сумма операции"].sum())
+    main_categories = income.groupby("Категория", observed=True)["Сумма операции"].sum().nlargest(7).reset_index()
+    main_income = main_categories.to_dict("records")
+    return {
+        "total_amount": total_amount,
+        "main": [{"category": row["Категория"], "amount": round(row["Сумма операции"])} for row in main_income],
+    }
+
+
+def format_cashback_analysis(analysis: Dict[str, float]) -> str:
+    """
+    Формирует JSON с кешбэком по категориям, отсортированным по убыванию.
+
+    Args:
+        analysis (Dict[str, float]): Сумма кешбэка по каждой категории.
+
+    Returns:
+        str: JSON с анализом кешбэка.
+    """
+    # Сортируем словарь по значениям в порядке убывания
+    sorted_analysis: Dict[str, float] = dict(sorted(analysis.items(), key=lambda item: item[1], reverse=True))
+
+    # Возвращаем результаты анализа в формате JSON
+    return json.dumps(sorted_analysis, indent=4, ensure_ascii=False)
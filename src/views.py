@@ -1,19 +1,31 @@
 import json
 import logging
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 import requests
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+from src.market import MAX_CONCURRENT_REQUESTS, REQUEST_TIMEOUT, Timeout, fetch_concurrently, get_session
+from src.quotes import QuoteCache, get_quote_cache
+from src.rates import DEFAULT_BASE_CURRENCY, CrossRates
+from src.store import DEFAULT_STATEMENT_PATH, TransactionStore, as_store
+from src.summary import get_card_from_main, get_card_stats, get_expenses, get_income
+
 load_dotenv()
 
 API_KEY = os.getenv("API")
 Alpha_KEY = os.getenv("AlPHA_API")
 
+# Базовые адреса API; для записи и воспроизведения ответов их можно направить на локальный сервер (см. src.replay)
+FIXER_URL = os.getenv("FIXER_URL", "https://api.apilayer.com/fixer")
+ALPHA_VANTAGE_URL = os.getenv("ALPHA_VANTAGE_URL", "https://www.alphavantage.co")
+
 
 # Загрузка пользовательских настроек
 def load_user_settings(filepath: str) -> Any:
@@ -68,7 +80,14 @@ def get_user_settings_data(progress_bar: tqdm) -> Tuple[List[str], List[str]]:
     return currencies, stocks
 
 
-def get_rates_and_prices(currencies: List[str], stocks: List[str], progress_bar: tqdm) -> Tuple[List[Any], List[Any]]:
+def get_rates_and_prices(
+    currencies: List[str],
+    stocks: List[str],
+    progress_bar: tqdm,
+    cache: Optional[QuoteCache] = None,
+    max_workers: int = MAX_CONCURRENT_REQUESTS,
+    timeout: Timeout = REQUEST_TIMEOUT,
+) -> Tuple[List[Any], List[Any]]:
     """
     Получает текущие курсы для указанных валют и цены на указанные акции.
 
@@ -76,30 +95,71 @@ def get_rates_and_prices(currencies: List[str], stocks: List[str], progress_bar:
         currencies (List[str]): Список кодов валют.
         stocks (List[str]): Список тикеров акций.
         progress_bar (tqdm): Прогресс-бар для обновления хода выполнения операции.
+        cache (Optional[QuoteCache]): Кэш курсов и котировок; если не передан, значения запрашиваются у API.
+        max_workers (int): Наибольшее количество одновременных запросов котировок.
+        timeout (Timeout): Таймауты каждого запроса: установка соединения и ожидание ответа в секундах.
 
     Returns:
         Tuple[List[Any], List[Any]]: Кортеж, содержащий два списка - курсы валют и цены акций.
     """
-    currency_rates = get_currency_rates(currencies)
-    progress_bar.update(10)
-    stock_prices = get_stock_prices(stocks)
-    progress_bar.update(10)
+    # Курсы и котировки запрашиваются у разных API одновременно
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        if cache is None:
+            rates_future = executor.submit(get_currency_rates, currencies, timeout=timeout)
+            prices_future = executor.submit(get_stock_prices, stocks, max_workers=max_workers, timeout=timeout)
+        else:
+            # Кэш сохраняет значения по торговому дню, поэтому запрашивает их вместе с датой
+            fetch_rates = partial(get_currency_rates, timeout=timeout, with_date=True)
+            fetch_prices = partial(get_stock_prices, max_workers=max_workers, timeout=timeout, with_date=True)
+            rates_future = executor.submit(cache.get_many, "currency", currencies, fetch_rates, "currency")
+            prices_future = executor.submit(cache.get_many, "stock", stocks, fetch_prices, "stock")
+        currency_rates = rates_future.result()
+        progress_bar.update(10)
+        stock_prices = prices_future.result()
+        progress_bar.update(10)
     return currency_rates, stock_prices
 
 
-def get_common_data(start_date: datetime, end_date: datetime, progress_bar: tqdm) -> Any:
+def load_market_data(
+    progress_bar: tqdm, max_workers: int = MAX_CONCURRENT_REQUESTS, timeout: Timeout = REQUEST_TIMEOUT
+) -> Tuple[List[Any], List[Any]]:
+    """
+    Загружает настройки пользователя и получает курсы его валют и цены его акций.
+
+    Значения по умолчанию для ограничений задаются переменными окружения (см. src.market).
+
+    Args:
+        progress_bar (tqdm): Прогресс-бар для обновления хода выполнения операции.
+        max_workers (int): Наибольшее количество одновременных запросов котировок.
+        timeout (Timeout): Таймауты каждого запроса: установка соединения и ожидание ответа в секундах.
+
+    Returns:
+        Tuple[List[Any], List[Any]]: Кортеж, содержащий два списка - курсы валют и цены акций.
+    """
+    currencies, stocks = get_user_settings_data(progress_bar)
+    progress_bar.set_description("Получение курсов валют и цен на акции")
+    return get_rates_and_prices(currencies, stocks, progress_bar, get_quote_cache(), max_workers, timeout)
+
+
+def get_common_data(
+    start_date: datetime,
+    end_date: datetime,
+    progress_bar: tqdm,
+    source: Union[str, TransactionStore] = DEFAULT_STATEMENT_PATH,
+) -> Any:
     """
-    Загружает данные о картах из Excel-файла в указанный диапазон дат.
+    Загружает данные о картах в указанный диапазон дат.
 
     Args:
         start_date (datetime): Начальная дата для фильтрации данных.
         end_date (datetime): Конечная дата для фильтрации данных.
         progress_bar (tqdm): Прогресс-бар для обновления хода выполнения операции.
+        source (Union[str, TransactionStore]): Путь к Excel-файлу или загруженное хранилище транзакций.
 
     Returns:
         Any: DataFrame, содержащий отфильтрованные данные о картах.
     """
-    df = get_card_data_from_excel("data/operations.xls", start_date=start_date, end_date=end_date)
+    df = get_card_data_from_excel(source, start_date=start_date, end_date=end_date)
     progress_bar.update(20)
     return df
 
@@ -134,128 +194,52 @@ def parse_date_range(date_str: str, date_range: Optional[str] = None) -> Tuple[d
 
 # Получение данных по картам из Excel
 def get_card_data_from_excel(
-    filepath: str, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    source: Union[str, TransactionStore],
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
 ) -> pd.DataFrame:
     """
-    Загружает данные о транзакциях с карт из Excel-файла и фильтрует их по дате.
+    Получает данные о транзакциях с карт и фильтрует их по дате.
 
     Args:
-        filepath (str): Путь к Excel-файлу.
+        source (Union[str, TransactionStore]): Путь к Excel-файлу или загруженное хранилище транзакций.
         start_date (Optional[datetime]): Начальная дата фильтрации.
         end_date (Optional[datetime]): Конечная дата фильтрации.
 
     Returns:
         pd.DataFrame: DataFrame с данными о транзакциях, отфильтрованными по дате.
     """
-    df = pd.read_excel(filepath)
-    df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S", errors="coerce")
-    if start_date:
-        df = df[df["Дата операции"] >= start_date]
-    if end_date:
-        df = df[df["Дата операции"] <= end_date]
-
-    return df
-
-
-def get_card_from_main(df: pd.DataFrame) -> List[Dict[str, Any]]:
-    """
-    Получает информацию о картах из основного DataFrame.
-
-    Args:
-        df (pd.DataFrame): Основной DataFrame с данными о транзакциях.
-
-    Returns:
-        List[Dict[str, Any]]: Список словарей, содержащих информацию о картах.
-    """
-    card_summary = df.groupby("Номер карты")["Сумма операции"].sum().reset_index()
-    card_info = []
-    for index, row in card_summary.iterrows():
-        last_digits = str(row["Номер карты"])[-4:]
-        total_spent = row["Сумма операции"]
-        cashback = round(total_spent * 0.01, 2)
-        card_info.append({"last_digits": last_digits, "total_spent": total_spent, "cashback": cashback})
-
-    return card_info
-
-
-def get_expenses(df: pd.DataFrame) -> Dict[str, Any]:
-    """
-    Получает информацию о расходах из DataFrame.
-
-    Args:
-        df (pd.DataFrame): DataFrame с данными о транзакциях.
-
-    Returns:
-        Dict[str, Any]: Словарь с информацией о расходах.
-    """
-
-    expenses = df[df["Сумма операции"] < 0]
-    total_amount = round(abs(expenses["Сумма операции"].sum()))
-    main_categories = expenses.groupby("Категория")["Сумма операции"].sum().abs().nlargest(7).reset_index()
-    other_amount = abs(expenses[~expenses["Категория"].isin(main_categories["Категория"])]["Сумма операции"].sum())
-    main_expenses = main_categories.to_dict("records")
-    if other_amount > 0:
-        main_expenses.append({"Категория": "Остальное", "Сумма операции": round(other_amount)})
-    transfers_and_cash = (
-        expenses[expenses["Категория"].isin(["Наличные", "Переводы"])]
-        .groupby("Категория")["Сумма операции"]
-        .sum()
-        .abs()
-        .reset_index()
-        .to_dict("records")
-    )
-    return {
-        "total_amount": total_amount,
-        "main": [{"category": row["Категория"], "amount": round(row["Сумма операции"])} for row in main_expenses],
-        "transfers_and_cash": [
-            {"category": row["Категория"], "amount": round(row["Сумма операции"])} for row in transfers_and_cash
-        ],
-    }
-
-
-def get_income(df: pd.DataFrame) -> Dict[str, Any]:
-    """
-    Получает информацию о доходах из DataFrame.
-
-    Args:
-        df (pd.DataFrame): DataFrame с данными о транзакциях.
-
-    Returns:
-        Dict[str, Any]: Словарь с информацией о доходах.
-    """
-    income = df[df["Сумма операции"] > 0]
-    total_amount = round(income["Сумма операции"].sum())
-    main_categories = income.groupby("Категория")["Сумма операции"].sum().nlargest(7).reset_index()
-    main_income = main_categories.to_dict("records")
-    return {
-        "total_amount": total_amount,
-        "main": [{"category": row["Категория"], "amount": round(row["Сумма операции"])} for row in main_income],
-    }
+    return as_store(source).between(start_date, end_date)
 
 
 # Получение топ-5 транзакций из Excel
 def get_top_transactions(
-    filepath: str = "data/operations.xls", start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+    filepath: Union[str, TransactionStore] = DEFAULT_STATEMENT_PATH,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
 ) -> List[Dict[str, Any]]:
     """
     Получает топ-5 транзакций за указанный период.
 
     Args:
-        filepath (str): Путь к Excel-файлу с данными.
+        filepath (Union[str, TransactionStore]): Путь к Excel-файлу или загруженное хранилище транзакций.
         start_date (Optional[datetime]): Начальная дата фильтрации.
         end_date (Optional[datetime]): Конечная дата фильтрации.
 
     Returns:
         List[Dict[str, Any]]: Список словарей с информацией о топ-5 транзакциях (дата, сумма, категория, описание).
     """
-    df = pd.read_excel(filepath)
-    df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S", errors="coerce")
+    store = as_store(filepath)
     if start_date and end_date:
-        mask = (df["Дата операции"] >= start_date) & (df["Дата операции"] <= end_date)
-        df = df.loc[mask]
+        df = store.between(start_date, end_date)
+    else:
+        df = store.df
 
     df = df.dropna(subset=["Дата операции"])
-    top_transactions = df.nlargest(5, "Сумма операции").to_dict("records")
+    # При равных суммах выше более поздняя операция, как в выгрузке банка (новые операции сверху)
+    top_transactions = (
+        df.sort_values(["Сумма операции", "Дата операции"], ascending=False, kind="stable").head(5).to_dict("records")
+    )
 
     formatted_transactions = []
     for transaction in top_transactions:
@@ -271,55 +255,115 @@ def get_top_transactions(
     return formatted_transactions
 
 
+# Получение таблицы курсов
+def get_cross_rates(
+    currencies: List[str], base: str = DEFAULT_BASE_CURRENCY, timeout: Timeout = REQUEST_TIMEOUT
+) -> Optional[CrossRates]:
+    """
+    Получает курсы всех указанных валют одним запросом и строит по ним кросс-курсы.
+
+    Args:
+        currencies (List[str]): Список валют.
+        base (str): Валюта, относительно которой запрашивается таблица курсов.
+        timeout (Timeout): Таймауты запроса: установка соединения и ожидание ответа в секундах.
+
+    Returns:
+        Optional[CrossRates]: Кросс-курсы или None, если таблицу курсов получить не удалось.
+    """
+    url = f"{FIXER_URL}/latest"
+    symbols = list(dict.fromkeys([*currencies, base]))
+    params = {"base": base, "symbols": ",".join(symbols)}
+    headers = {"apikey": API_KEY}
+    try:
+        response = get_session().get(url, headers=headers, params=params, timeout=timeout)
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        return CrossRates(data.get("base", base), data["rates"], data.get("date"))
+    except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+        logging.error(f"Не удалось получить курсы {symbols}: {e}")
+        return None
+
+
 # Получение курсов валют
-def get_currency_rates(currencies: List[str]) -> List[Dict[str, Any]]:
+def get_currency_rates(
+    currencies: List[str], timeout: Timeout = REQUEST_TIMEOUT, with_date: bool = False
+) -> List[Dict[str, Any]]:
     """
     Получает курсы валют для указанных валют.
 
+    Курсы всех валют получаются одним запросом (см. get_cross_rates).
+
     Args:
         currencies (List[str]): Список валют.
+        timeout (Timeout): Таймауты запроса: установка соединения и ожидание ответа в секундах.
+        with_date (bool): Добавить в каждую запись дату курсов из ответа API (поле "date").
 
     Returns:
         List[Dict[str, Any]]: Список словарей с информацией о курсах валют.
     """
-    currency_rates = []
-    for currency in currencies:
-        url = "https://api.apilayer.com/fixer/latest"
-        params = {"base": currency}
-        headers = {"apikey": API_KEY}
-
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            currency_rates.append({"currency": currency, "rate": data["rates"].get("RUB", "N/A")})
-    return currency_rates
+    if not currencies:
+        return []
+    cross_rates = get_cross_rates(currencies, timeout=timeout)
+    if cross_rates is None:
+        return []
+    rates = [
+        {"currency": currency, "rate": cross_rates.rate(currency, "RUB") if currency in cross_rates else "N/A"}
+        for currency in currencies
+    ]
+    if with_date and cross_rates.date:
+        return [{**rate, "date": cross_rates.date} for rate in rates]
+    return rates
 
 
 # Получение стоимости акций
-def get_stock_prices(stocks: List[str]) -> List[Dict[str, Any]]:
+def get_stock_prices(
+    stocks: List[str],
+    max_workers: int = MAX_CONCURRENT_REQUESTS,
+    timeout: Timeout = REQUEST_TIMEOUT,
+    with_date: bool = False,
+) -> List[Dict[str, Any]]:
     """
     Получает стоимость акций для указанных акций.
 
+    Запросы по всем акциям выполняются параллельно через общую HTTP-сессию.
+
     Args:
         stocks (List[str]): Список акций.
+        max_workers (int): Наибольшее количество одновременных запросов.
+        timeout (Timeout): Таймауты каждого запроса: установка соединения и ожидание ответа в секундах.
+        with_date (bool): Добавить в каждую запись торговый день котировки из ответа API (поле "date").
 
     Returns:
         List[Dict[str, Any]]: Список словарей с информацией о стоимости акций.
     """
-    stock_prices = []
-    for stock in stocks:
-        api_url = f"https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={stock}&apikey={Alpha_KEY}"
-        response = requests.get(api_url)
-        if response.status_code == 200:
+    session = get_session()
+
+    def fetch(stock: str) -> Optional[Dict[str, Any]]:
+        api_url = f"{ALPHA_VANTAGE_URL}/query?function=TIME_SERIES_DAILY&symbol={stock}&apikey={Alpha_KEY}"
+        try:
+            response = session.get(api_url, timeout=timeout)
+            if response.status_code != 200:
+                return None
             data = response.json()
             last_refreshed = data["Meta Data"]["3. Last Refreshed"]
             stock_price = data["Time Series (Daily)"][last_refreshed]["4. close"]
-            stock_prices.append({"stock": stock, "price": float(stock_price)})
-    return stock_prices
+            price = {"stock": stock, "price": float(stock_price)}
+            return {**price, "date": str(last_refreshed)[:10]} if with_date else price
+        except (requests.RequestException, ValueError, KeyError) as e:
+            logging.error(f"Не удалось получить стоимость акции {stock}: {e}")
+            return None
+
+    return [price for price in fetch_concurrently(fetch, stocks, max_workers) if price is not None]
 
 
 def main_func(
-    data_type: str, date_str: str, df: Optional[pd.DataFrame] = None, date_range: Optional[str] = None
+    data_type: str,
+    date_str: str,
+    df: Optional[pd.DataFrame] = None,
+    date_range: Optional[str] = None,
+    store: Optional[TransactionStore] = None,
+    market: Optional["Future[Tuple[List[Any], List[Any]]]"] = None,
 ) -> dict[Any, Any] | str:
     """
     Основная функция для обработки и возврата финансовых данных на основе указанного типа данных и даты.
@@ -329,6 +373,10 @@ def main_func(
         date_str (str): Дата для обработки данных.
         date_range (Optional[str]): Необязательный диапазон дат для фильтрации данных.
         df (Optional[pd.DataFrame]): Необязательный DataFrame с данными.
+        store (Optional[TransactionStore]): Загруженное хранилище транзакций; если не передано,
+            данные читаются из файла по умолчанию.
+        market (Optional[Future]): Уже запущенный запрос курсов и котировок (см. load_market_data);
+            если не передан, запрос запускается в фоне параллельно с обработкой выписки.
 
     Returns:
         str: Строка в формате JSON, содержащая обработанные данные или сообщение об ошибке.
@@ -336,34 +384,55 @@ def main_func(
     try:
         current_time = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
         greeting = get_greeting(current_time)
-
+        source: Union[str, TransactionStore] = store if store is not None else DEFAULT_STATEMENT_PATH
 
         if df is None:
             return json.dumps({"error": "No data available."}, ensure_ascii=False, indent=4)
 
-        dic_lst: Dict[str, Any] = {}
+        if data_type not in ("home", "events"):
+            raise ValueError("Invalid data type. Must be 'home' or 'events'.")
 
-        with tqdm(total=100, desc="Processing") as pbar:
-            if data_type == "home":
-                start_date = current_time.replace(day=1)
-                end_date = current_time
-
-                # Обработка данных для "home"
-                dic_lst["greeting"] = greeting
-                dic_lst.update(process_home_data(pbar, df, start_date, end_date))
-
-            elif data_type == "events":
-                start_date, end_date = parse_date_range(date_str, date_range)
-                df = get_common_data(start_date, end_date, pbar)
-                if df is None:
-                    return json.dumps({"error": "No data available."}, ensure_ascii=False, indent=4)
-
-                # Обработка данных для "events"
-                dic_lst["greeting"] = greeting
-                dic_lst.update(process_events_data(pbar, df))
+        dic_lst: Dict[str, Any] = {}
 
-            else:
-                raise ValueError("Invalid data type. Must be 'home' or 'events'.")
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            with tqdm(total=100, desc="Processing") as pbar:
+                # Курсы и котировки запрашиваются в фоне, пока читается и агрегируется выписка
+                if market is None:
+                    market = executor.submit(load_market_data, pbar)
+
+                if data_type == "home":
+                    start_date = current_time.replace(day=1)
+                    end_date = current_time
+
+                    # Суммы по картам за полные месяцы берутся из куба агрегатов хранилища,
+                    # а статистика операций считается по самим операциям периода
+                    transactions = df
+                    if store is not None:
+                        transactions = store.between(start_date, end_date)
+                        df = store.summary_frame(start_date, end_date)
+
+                    # Обработка данных для "home"
+                    dic_lst["greeting"] = greeting
+                    dic_lst.update(process_home_data(pbar, df, start_date, end_date, source, market, transactions))
+
+                elif data_type == "events":
+                    start_date, end_date = parse_date_range(date_str, date_range)
+                    if store is not None:
+                        # Полные месяцы периода берутся из куба агрегатов, по строкам считаются только неполные
+                        df = store.summary_frame(start_date, end_date)
+                        pbar.update(20)
+                    else:
+                        df = get_common_data(start_date, end_date, pbar, source)
+                    if df is None:
+                        return json.dumps({"error": "No data available."}, ensure_ascii=False, indent=4)
+
+                    # Обработка данных для "events"
+                    dic_lst["greeting"] = greeting
+                    dic_lst.update(process_events_data(pbar, df, market))
+        finally:
+            # При ошибке или раннем выходе ответ API не ждем: еще не начатый запрос отменяется
+            executor.shutdown(wait=False, cancel_futures=True)
 
         return json.dumps(dic_lst, ensure_ascii=False, indent=4)
 
@@ -372,32 +441,46 @@ def main_func(
         return json.dumps({"error": "An error occurred while processing the request."}, ensure_ascii=False, indent=4)
 
 
-def process_home_data(pbar: tqdm, df: pd.DataFrame, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
-    """Обрабатывает данные для типа 'home'."""
+def process_home_data(
+    pbar: tqdm,
+    df: pd.DataFrame,
+    start_date: datetime,
+    end_date: datetime,
+    source: Union[str, TransactionStore] = DEFAULT_STATEMENT_PATH,
+    market: Optional["Future[Tuple[List[Any], List[Any]]]"] = None,
+    transactions: Optional[pd.DataFrame] = None,
+) -> Dict[str, Any]:
+    """
+    Обрабатывает данные для типа 'home'; курсы и котировки берутся из market, если запрос уже запущен.
+
+    Суммы по картам считаются по df (подходят и сгруппированные строки), статистика операций по картам -
+    по transactions, где каждая строка - одна операция (по умолчанию df).
+    """
     pbar.set_description("Получение информации о картах")
     card_data = get_card_from_main(df)
+    card_stats = get_card_stats(df if transactions is None else transactions)
     pbar.update(30)
 
     pbar.set_description("Получение топовых транзакций")
-    top_transactions = get_top_transactions(start_date=start_date, end_date=end_date)
+    top_transactions = get_top_transactions(source, start_date=start_date, end_date=end_date)
     pbar.update(20)
 
-    currencies, stocks = get_user_settings_data(pbar)
-
-    pbar.set_description("Получение курсов валют и цен на акции")
-    currency_rates, stock_prices = get_rates_and_prices(currencies, stocks, pbar)
+    currency_rates, stock_prices = market.result() if market is not None else load_market_data(pbar)
     pbar.update(20)
 
     return {
         "cards": card_data,
+        "card_stats": card_stats,
         "top_transactions": top_transactions,
         "currency_rates": currency_rates,
         "stock_prices": stock_prices,
     }
 
 
-def process_events_data(pbar: tqdm, df: pd.DataFrame) -> Dict[str, Any]:
-    """Обрабатывает данные для типа 'events'."""
+def process_events_data(
+    pbar: tqdm, df: pd.DataFrame, market: Optional["Future[Tuple[List[Any], List[Any]]]"] = None
+) -> Dict[str, Any]:
+    """Обрабатывает данные для типа 'events'; курсы и котировки берутся из market, если запрос уже запущен."""
     pbar.set_description("Получение расходов")
     expenses = get_expenses(df)
     pbar.update(10)
@@ -406,10 +489,7 @@ def process_events_data(pbar: tqdm, df: pd.DataFrame) -> Dict[str, Any]:
     income = get_income(df)
     pbar.update(10)
 
-    currencies, stocks = get_user_settings_data(pbar)
-
-    pbar.set_description("Получение курсов валют и цен на акции")
-    currency_rates, stock_prices = get_rates_and_prices(currencies, stocks, pbar)
+    currency_rates, stock_prices = market.result() if market is not None else load_market_data(pbar)
     pbar.update(10)
 
     return {
@@ -4,6 +4,21 @@ from typing import Any, Dict, Generator, List, Tuple, Union
 import pandas as pd
 import pytest
 
+from src.cache import get_cache_path
+
+
+@pytest.fixture(autouse=True, scope="session")
+def reports_path(tmp_path_factory: pytest.TempPathFactory) -> Generator[str, None, None]:
+    # Отчеты, которые функции пишут в общий приемник, не должны попадать в каталог проекта
+    path = str(tmp_path_factory.mktemp("reports") / "reports.ndjson")
+    previous = os.environ.get("REPORTS_PATH")
+    os.environ["REPORTS_PATH"] = path
+    yield path
+    if previous is None:
+        del os.environ["REPORTS_PATH"]
+    else:
+        os.environ["REPORTS_PATH"] = previous
+
 
 @pytest.fixture(scope="module")
 def temp_excel_file() -> Generator[str, None, None]:
@@ -34,8 +49,9 @@ def temp_excel_file() -> Generator[str, None, None]:
 
     yield temp_file
 
-    if os.path.exists(temp_file):
-        os.remove(temp_file)
+    for path in (temp_file, get_cache_path(temp_file)):
+        if os.path.exists(path):
+            os.remove(path)
 
 
 @pytest.fixture(
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cache import read_operations
+from src.ingest import convert_to_arrow
+from src.store import TransactionStore
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def statement_file(tmp_path: Path) -> str:
+    path = str(tmp_path / "operations.xlsx")
+    pd.DataFrame(
+        {
+            "Дата операции": ["02.08.2023 14:00:00", None, "01.08.2023 12:00:00"],
+            "Категория": ["Транспорт", "Связь", "Продукты"],
+            "Сумма операции": [-200.0, -50.0, -100.5],
+            "Кэшбэк": [2.0, None, None],
+        }
+    ).to_excel(path, index=False)
+    return path
+
+
+def test_convert_to_arrow(statement_file: str, tmp_path: Path) -> None:
+    target = convert_to_arrow(statement_file)
+    assert target == str(tmp_path / "operations.arrow")
+
+    df = read_operations(target)
+    pd.testing.assert_frame_equal(df, TransactionStore(read_operations(statement_file)).data)
+    assert isinstance(df["Категория"].dtype, pd.CategoricalDtype)
+
+
+def test_store_from_arrow(statement_file: str) -> None:
+    target = convert_to_arrow(statement_file)
+    store = TransactionStore.from_file(target)
+    assert store.df["Сумма операции"].tolist() == [-100.5, -200.0, -50.0]
+
+    # Файл уже отсортирован по дате, поэтому хранилище не копирует столбцы
+    df = read_operations(target)
+    assert np.shares_memory(TransactionStore(df).data["Сумма операции"].to_numpy(), df["Сумма операции"].to_numpy())
+
+
+def test_convert_to_arrow_directory_requires_target(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        convert_to_arrow(str(tmp_path))
@@ -0,0 +1,77 @@
+from typing import Dict, List
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest import evaluate_rule, get_operations, get_rule_name, run_backtest
+from src.services import get_investment_grid, investment_bank
+
+
+@pytest.fixture
+def transactions() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Дата операции": [
+                "01.01.2023 12:00:00",
+                "15.01.2023 12:00:00",
+                "01.03.2023 12:00:00",
+                "02.03.2023 12:00:00",
+            ],
+            "Сумма операции": [-1712.0, -49.5, -100.0, 5000.0],
+        }
+    )
+
+
+def test_get_operations(transactions: pd.DataFrame) -> None:
+    amounts, months, periods = get_operations(transactions)
+    assert amounts.tolist() == [-1712.0, -49.5, -100.0, 5000.0]
+    assert months.tolist() == [0, 0, 2, 2]
+    assert periods.strftime("%Y-%m").tolist() == ["2023-01", "2023-02", "2023-03"]
+
+
+@pytest.mark.parametrize(
+    "rule, expected",
+    [
+        ({"limit": 50}, [61.5, 61.5, 61.5]),
+        ({"percent": 10}, [176.15, 176.15, 186.15]),
+        ({"limit": 50, "percent": 10, "cap": 100}, [100.0, 100.0, 110.0]),
+    ],
+)
+def test_evaluate_rule(rule: Dict[str, float], expected: List[float]) -> None:
+    result = evaluate_rule(rule, np.array([-1712.0, -49.5, -100.0, 5000.0]), np.array([0, 0, 2, 2]), 3)
+    assert result.tolist() == pytest.approx(expected)
+
+
+def test_round_up_matches_investment_bank(transactions: pd.DataFrame) -> None:
+    result = run_backtest(transactions, [{"limit": 50}, {"limit": 10}], max_workers=1)
+    monthly = result.diff().fillna(result.iloc[:1])
+    records = transactions.to_dict("records")
+    assert monthly.iloc[:, 0].tolist() == pytest.approx(
+        [investment_bank(month, records, 50) for month in ["2023-01", "2023-02", "2023-03"]]
+    )
+    assert result.iloc[-1].tolist() == pytest.approx(get_investment_grid(transactions, [50, 10]).sum().tolist())
+
+
+def test_evaluate_rule_without_savings() -> None:
+    with pytest.raises(ValueError):
+        evaluate_rule({"cap": 100}, np.array([1.0]), np.array([0]), 1)
+
+
+def test_get_rule_name() -> None:
+    assert get_rule_name({"limit": 50, "percent": 1, "cap": 3000}) == "округление до 50 + 1% (не более 3000 в месяц)"
+
+
+def test_run_backtest_parallel(transactions: pd.DataFrame) -> None:
+    rules = [{"limit": 10}, {"percent": 5}, {"limit": 100, "cap": 50}]
+    sequential = run_backtest(transactions, rules, max_workers=1)
+    assert sequential.index.tolist() == ["2023-01", "2023-02", "2023-03"]
+    assert sequential.columns.tolist() == [get_rule_name(rule) for rule in rules]
+    pd.testing.assert_frame_equal(run_backtest(transactions, rules, max_workers=2), sequential)
+
+
+def test_run_backtest_small_input_without_pool(transactions: pd.DataFrame) -> None:
+    with patch("src.backtest.ProcessPoolExecutor") as mock_pool:
+        run_backtest(transactions)
+    mock_pool.assert_not_called()
@@ -0,0 +1,52 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.cache import get_cache_path, read_operations
+
+
+@pytest.fixture
+def statement_file(tmp_path: Path) -> str:
+    path = str(tmp_path / "operations.xlsx")
+    pd.DataFrame({"Дата операции": ["01.08.2023 12:00:00"], "Сумма операции": [-100.5]}).to_excel(path, index=False)
+    return path
+
+
+def test_read_operations_creates_cache(statement_file: str) -> None:
+    df = read_operations(statement_file)
+    assert os.path.exists(get_cache_path(statement_file))
+    assert df["Сумма операции"].tolist() == [-10050]
+
+
+def test_read_operations_uses_cache(statement_file: str) -> None:
+    read_operations(statement_file)
+    with patch("src.cache.pd.read_excel") as mock_read_excel:
+        df = read_operations(statement_file)
+        mock_read_excel.assert_not_called()
+    assert df["Сумма операции"].tolist() == [-10050]
+
+
+def test_read_operations_same_content_after_touch(statement_file: str) -> None:
+    read_operations(statement_file)
+    stat = os.stat(statement_file)
+    os.utime(statement_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with patch("src.cache.pd.read_excel") as mock_read_excel:
+        read_operations(statement_file)
+        mock_read_excel.assert_not_called()
+
+
+def test_read_operations_invalidates_on_change(statement_file: str) -> None:
+    read_operations(statement_file)
+    pd.DataFrame({"Дата операции": ["02.08.2023 12:00:00"], "Сумма операции": [-200.0]}).to_excel(
+        statement_file, index=False
+    )
+    df = read_operations(statement_file)
+    assert df["Сумма операции"].tolist() == [-20000]
+
+
+def test_read_operations_not_found() -> None:
+    with pytest.raises(FileNotFoundError):
+        read_operations("not_found.xlsx")
@@ -0,0 +1,44 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.cube import CUBE_COLUMNS, CUBE_SUFFIX, build_cube, load_cube
+
+
+@pytest.fixture
+def transactions() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Дата операции": ["01.01.2023 12:00:00", "15.01.2023 12:00:00", "01.02.2023 12:00:00", None],
+            "Номер карты": ["*7197", "*7197", "*5091", "*7197"],
+            "Категория": ["Продукты", "Продукты", "Зарплата", "Продукты"],
+            "Сумма операции": [-160.89, -49.5, 5000.0, -10.0],
+            "Бонусы (включая кэшбэк)": [1, 0, 0, 5],
+        }
+    )
+
+
+def test_build_cube(transactions: pd.DataFrame) -> None:
+    cube = build_cube(transactions)
+    assert list(cube.columns) == CUBE_COLUMNS
+    january = cube.xs((2023, 1, "*7197", "Продукты"))
+    assert january["amount"] == -21039
+    assert january["count"] == 2
+    assert january["expenses"] == -21039
+    assert january["income"] == 0
+    assert january["bonus"] == 1
+    assert january["savings_50"] == pytest.approx(10.89 + 49.5)
+    assert cube["count"].sum() == 3
+
+
+def test_load_cube_persists(transactions: pd.DataFrame, tmp_path: Path) -> None:
+    path = str(tmp_path / "operations.xlsx")
+    transactions.to_excel(path, index=False)
+    cube = load_cube(transactions, path)
+    assert os.path.exists(path + CUBE_SUFFIX)
+    with patch("src.cube.build_cube") as mock_build:
+        pd.testing.assert_frame_equal(load_cube(transactions, path), cube)
+        mock_build.assert_not_called()
@@ -0,0 +1,127 @@
+import os
+from pathlib import Path
+from typing import Callable, Iterable
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.cache import get_cache_path
+from src.cube import CUBE_SUFFIX, build_cube
+from src.incremental import IncrementalStatement
+from src.store import TransactionStore
+
+
+def make_statement(days: Iterable[int]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Дата операции": [f"{day:02d}.0{1 + day % 2}.2023 12:00:00" for day in days],
+            "Номер карты": ["*7197" if day % 3 else "*5091" for day in days],
+            "Категория": ["Продукты" if day % 4 else "Зарплата" for day in days],
+            "Описание": [f"Покупка {day}" for day in days],
+            "Сумма операции": [5000.0 if day % 4 == 0 else -10.5 * day for day in days],
+            "Бонусы (включая кэшбэк)": [day % 5 for day in days],
+        }
+    )
+
+
+@pytest.fixture(params=["csv", "xlsx"])
+def write_statement(request: pytest.FixtureRequest, tmp_path: Path) -> Callable[[Iterable[int]], str]:
+    path = str(tmp_path / f"operations.{request.param}")
+
+    def write(days: Iterable[int]) -> str:
+        df = make_statement(days)
+        if request.param == "csv":
+            df.to_csv(path, sep=";", decimal=",", index=False)
+        else:
+            df.to_excel(path, index=False)
+        return path
+
+    return write
+
+
+def test_refresh_reads_only_new_rows(write_statement: Callable[[Iterable[int]], str]) -> None:
+    path = write_statement(range(1, 6))
+    assert IncrementalStatement(path).refresh() == 5
+
+    write_statement(range(1, 9))
+    statement = IncrementalStatement(path)
+    with patch("src.incremental.parse_statement") as mock_parse:
+        assert statement.refresh() == 3
+        mock_parse.assert_not_called()
+    assert len(statement.frame) == 8
+    assert IncrementalStatement(path).refresh() == 0
+
+
+def test_refresh_rebuilds_when_history_changes(write_statement: Callable[[Iterable[int]], str]) -> None:
+    path = write_statement(range(1, 6))
+    IncrementalStatement(path).refresh()
+    write_statement(range(2, 9))
+    assert IncrementalStatement(path).refresh() == 7
+
+
+def test_refresh_reads_only_prepended_rows(write_statement: Callable[[Iterable[int]], str]) -> None:
+    path = write_statement(range(9, 4, -1))
+    IncrementalStatement(path).refresh()
+
+    write_statement(range(12, 4, -1))
+    statement = IncrementalStatement(path)
+    with patch("src.incremental.parse_statement") as mock_parse:
+        assert statement.refresh() == 3
+        mock_parse.assert_not_called()
+    assert statement.frame["Описание"].tolist() == [f"Покупка {day}" for day in range(12, 4, -1)]
+
+    write_statement(range(13, 4, -1))
+    statement = IncrementalStatement(path)
+    assert statement.refresh() == 1
+    assert statement.frame["Описание"].tolist() == [f"Покупка {day}" for day in range(13, 4, -1)]
+
+
+def test_refresh_parses_workbook_once(tmp_path: Path) -> None:
+    path = str(tmp_path / "operations.xlsx")
+    make_statement(range(9, 4, -1)).to_excel(path, index=False)
+    IncrementalStatement(path).refresh()
+
+    # Книгу Excel нельзя прочитать по частям, поэтому новые строки сверху берутся из одного разбора
+    make_statement(range(12, 4, -1)).to_excel(path, index=False)
+    statement = IncrementalStatement(path)
+    with patch("src.incremental.pd.read_excel", wraps=pd.read_excel) as mock_read:
+        assert statement.refresh() == 3
+    mock_read.assert_called_once_with(path, skiprows=range(1, 1), nrows=None)
+    assert statement.frame["Описание"].tolist() == [f"Покупка {day}" for day in range(12, 4, -1)]
+
+    make_statement([14, 13, 11, 10, 9, 8, 7, 6, 5]).to_excel(path, index=False)
+    with patch("src.incremental.pd.read_excel", wraps=pd.read_excel) as mock_read:
+        assert IncrementalStatement(path).refresh() == 9
+    mock_read.assert_called_once()
+
+
+def test_refresh_rebuilds_when_first_row_changes(write_statement: Callable[[Iterable[int]], str]) -> None:
+    path = write_statement(range(9, 4, -1))
+    IncrementalStatement(path).refresh()
+    write_statement([12, 11, 10, 8, 7, 6, 5])
+    assert IncrementalStatement(path).refresh() == 7
+
+
+def test_cube_is_updated_with_new_rows_only(write_statement: Callable[[Iterable[int]], str]) -> None:
+    path = write_statement(range(9, 4, -1))
+    IncrementalStatement(path).refresh()
+
+    write_statement(range(12, 4, -1))
+    statement = IncrementalStatement(path)
+    with patch("src.incremental.build_cube", wraps=build_cube) as mock_build:
+        statement.refresh()
+    assert len(mock_build.call_args.args[0]) == 3
+    pd.testing.assert_frame_equal(statement.cube, build_cube(make_statement(range(12, 4, -1))))
+
+
+def test_store_incremental(write_statement: Callable[[Iterable[int]], str]) -> None:
+    path = write_statement(range(1, 6))
+    assert len(TransactionStore.from_file(path, incremental=True)) == 5
+    path = write_statement(range(1, 8))
+    store = TransactionStore.from_file(path, incremental=True)
+    assert len(store) == 7
+
+    # Куб берется из снимка, отдельный файл куба не создается
+    pd.testing.assert_frame_equal(store.cube, build_cube(make_statement(range(1, 8))))
+    assert not os.path.exists(get_cache_path(path, CUBE_SUFFIX))
@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+import pytest
+
+from src.ingest import load_statements, merge_statements, resolve_statement_paths
+from src.schema import normalize_transactions
+
+
+def make_statement(days: List[int], amounts: List[float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Дата операции": [f"{day:02d}.08.2023 12:00:00" for day in days],
+            "Номер карты": ["*7197"] * len(days),
+            "Сумма операции": amounts,
+            "Описание": ["Колхоз"] * len(days),
+        }
+    )
+
+
+@pytest.fixture
+def statements_dir(tmp_path: Path) -> str:
+    make_statement([1, 2, 3], [-100.0, -200.0, -300.0]).to_excel(tmp_path / "july.xlsx", index=False)
+    make_statement([3, 4, 4], [-300.0, -400.0, -400.0]).to_excel(tmp_path / "august.xlsx", index=False)
+    (tmp_path / "notes.txt").write_text("не выписка")
+    return str(tmp_path)
+
+
+def test_resolve_statement_paths(statements_dir: str) -> None:
+    expected = [os.path.join(statements_dir, "august.xlsx"), os.path.join(statements_dir, "july.xlsx")]
+    assert resolve_statement_paths(statements_dir) == expected
+    assert resolve_statement_paths(os.path.join(statements_dir, "*.xlsx")) == expected
+    assert resolve_statement_paths("data/operations.xls") == ["data/operations.xls"]
+
+
+def test_resolve_statement_paths_not_found(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        resolve_statement_paths(str(tmp_path / "*.xls"))
+
+
+def test_load_statements_deduplicates_overlap(statements_dir: str) -> None:
+    df = load_statements(statements_dir, max_workers=2)
+    # Операция 03.08 есть в обеих выгрузках, а две одинаковые операции 04.08 - разные покупки
+    assert sorted(df["Сумма операции"].tolist()) == [-40000, -40000, -30000, -20000, -10000]
+    assert isinstance(df["Описание"].dtype, pd.CategoricalDtype)
+
+
+def test_merge_statements_with_different_categories() -> None:
+    first = normalize_transactions(make_statement([1], [-100.0]))
+    second = normalize_transactions(make_statement([1, 2], [-100.0, -50.0]).assign(Описание=["Колхоз", "Магнит"]))
+    merged = merge_statements([first, second])
+    assert merged["Описание"].tolist() == ["Колхоз", "Магнит"]
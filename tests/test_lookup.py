@@ -0,0 +1,75 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.lookup import NameIndex, fold_name, get_edit_distances
+from src.store import TransactionStore
+
+
+@pytest.fixture
+def index() -> NameIndex:
+    names = ["Супермаркеты", "Фастфуд", "Транспорт", "Такси", "Ёлочные игрушки", "Пятёрочка", None, " "]
+    return NameIndex(names)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [("Еда", "еда"), ("  Пятёрочка   Магазин ", "пятерочка магазин"), ("ЁЛКА", "елка")],
+)
+def test_fold_name(name: str, expected: Optional[str]) -> None:
+    assert fold_name(name) == expected
+
+
+def test_get_edit_distances() -> None:
+    codes = np.array([[ord(char) for char in word] for word in ["такси", "тикси", "ткаси", "аксит"]])
+    assert get_edit_distances("такси", codes).tolist() == [0, 1, 2, 2]
+
+
+def test_name_index_skips_empty(index: NameIndex) -> None:
+    assert len(index) == 6
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [("фастфуд", "Фастфуд"), (" ТАКСИ ", "Такси"), ("елочные игрушки", "Ёлочные игрушки"), ("такс", None)],
+)
+def test_name_index_find(index: NameIndex, query: str, expected: Optional[str]) -> None:
+    assert index.find(query) == expected
+
+
+def test_name_index_prefix(index: NameIndex) -> None:
+    assert index.prefix("т") == ["Такси", "Транспорт"]
+    assert index.prefix("т", limit=1) == ["Такси"]
+    assert index.prefix("пятер") == ["Пятёрочка"]
+    assert index.prefix("") == []
+
+
+def test_name_index_fuzzy(index: NameIndex) -> None:
+    assert index.fuzzy("транстпорт") == ["Транспорт"]
+    assert index.fuzzy("супермаркте") == ["Супермаркеты"]
+    assert index.fuzzy("таски", max_distance=1) == []
+    assert index.fuzzy("таски") == ["Такси"]
+
+
+def test_name_index_lookup(index: NameIndex) -> None:
+    assert index.lookup("такси") == ["Такси"]
+    assert index.lookup("тр") == ["Транспорт"]
+    assert index.lookup("фастфут") == ["Фастфуд"]
+    assert index.lookup("абракадабра") == []
+
+
+def test_store_name_index() -> None:
+    df = pd.DataFrame(
+        {
+            "Дата операции": ["01.01.2023 12:00:00", "02.01.2023 12:00:00", "03.01.2023 12:00:00"],
+            "Категория": ["Еда", "Еда", "Такси"],
+            "Описание": ["Пятёрочка", "Магнит", "Яндекс Такси"],
+            "Сумма операции": [-100.0, -200.0, -300.0],
+        }
+    )
+    store = TransactionStore(df)
+    assert store.name_index("Категория").find("ЕДА") == "Еда"
+    assert store.name_index("Описание").lookup("яндекс") == ["Яндекс Такси"]
+    assert store.name_index("Описание") is store.name_index("Описание")
@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pytest
+
+from src.market import close_session, fetch_concurrently, get_env_number, get_session
+
+
+def test_get_session_is_shared() -> None:
+    close_session()
+    session = get_session()
+    assert get_session() is session
+    close_session()
+    assert get_session() is not session
+    close_session()
+
+
+def test_fetch_concurrently_keeps_order() -> None:
+    assert fetch_concurrently(lambda item: item * 2, [3, 1, 2]) == [6, 2, 4]
+    assert fetch_concurrently(lambda item: item, []) == []
+
+
+def test_fetch_concurrently_respects_limit() -> None:
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fetch(item: int) -> int:
+        with lock:
+            active.append(item)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(item)
+        return item
+
+    assert fetch_concurrently(fetch, list(range(8)), max_workers=3) == list(range(8))
+    assert max(peak) == 3
+
+
+def test_get_env_number(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("MARKET_READ_TIMEOUT", "2.5")
+    assert get_env_number("MARKET_READ_TIMEOUT", 10.0) == 2.5
+    monkeypatch.setenv("MARKET_READ_TIMEOUT", "abc")
+    assert get_env_number("MARKET_READ_TIMEOUT", 10.0) == 10.0
+    monkeypatch.setenv("MARKET_READ_TIMEOUT", "-1")
+    assert get_env_number("MARKET_READ_TIMEOUT", 10.0) == 10.0
+    monkeypatch.delenv("MARKET_READ_TIMEOUT")
+    assert get_env_number("MARKET_READ_TIMEOUT", 10.0) == 10.0
@@ -0,0 +1,56 @@
+import itertools
+import json
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.optimizer import get_best_cashback_categories, get_category_spend_matrix, optimize_cashback_categories
+
+
+@pytest.fixture
+def transactions() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Дата операции": [
+                "01.01.2023 12:00:00",
+                "02.01.2023 12:00:00",
+                "03.01.2023 12:00:00",
+                "01.02.2023 12:00:00",
+            ],
+            "Категория": ["Супермаркеты", "Переводы", "Зарплата", "Кафе"],
+            "Сумма операции": [-1000.0, -5000.0, 50000.0, -300.0],
+        }
+    )
+
+
+def test_get_category_spend_matrix(transactions: pd.DataFrame) -> None:
+    matrix = get_category_spend_matrix(transactions)
+    assert matrix.index.tolist() == ["2023-01", "2023-02"]
+    assert sorted(matrix.columns) == ["Кафе", "Супермаркеты"]
+    assert matrix.loc["2023-01", "Супермаркеты"] == 1000.0
+    assert matrix.loc["2023-01", "Кафе"] == 0.0
+
+
+@pytest.mark.parametrize("size, monthly_limit", [(1, None), (2, 150.0), (3, 300.0), (4, None)])
+def test_optimize_matches_exhaustive_search(size: int, monthly_limit: Optional[float]) -> None:
+    rng = np.random.default_rng(1)
+    matrix = pd.DataFrame(rng.gamma(1.0, 1000, size=(12, 10)), columns=[f"Категория {i}" for i in range(10)])
+    gains = matrix.to_numpy() * 0.05
+    expected = []
+    for category_set in itertools.combinations(range(10), size):
+        monthly = gains[:, list(category_set)].sum(axis=1)
+        if monthly_limit is not None:
+            monthly = np.minimum(monthly, monthly_limit)
+        expected.append(round(monthly.mean(), 2))
+
+    result = optimize_cashback_categories(matrix, size, 0.05, monthly_limit, top=3)
+    assert [item["monthly_gain"] for item in result] == sorted(expected, reverse=True)[:3]
+    assert all(len(item["categories"]) == size for item in result)
+
+
+def test_get_best_cashback_categories(transactions: pd.DataFrame) -> None:
+    result = json.loads(get_best_cashback_categories(transactions, size=1, rate=0.1))
+    assert result[0] == {"categories": ["Супермаркеты"], "monthly_gain": 50.0}
+    assert result[1] == {"categories": ["Кафе"], "monthly_gain": 15.0}
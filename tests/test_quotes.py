@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.quotes import EXIT_WAIT_TIMEOUT, QuoteCache
+from src.views import get_rates_and_prices
+
+
+def make_fetch(rate: float) -> MagicMock:
+    return MagicMock(side_effect=lambda symbols, **kwargs: [{"currency": symbol, "rate": rate} for symbol in symbols])
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> QuoteCache:
+    return QuoteCache(str(tmp_path / "quotes.sqlite"), ttl={"currency": 60}, max_stale=3600)
+
+
+def test_get_many_fetches_missing_and_caches(cache: QuoteCache) -> None:
+    fetch = make_fetch(90.0)
+    assert cache.get_many("currency", ["USD", "EUR"], fetch, "currency") == [
+        {"currency": "USD", "rate": 90.0},
+        {"currency": "EUR", "rate": 90.0},
+    ]
+    fetch.assert_called_once_with(["USD", "EUR"])
+
+    fetch = make_fetch(91.0)
+    result = cache.get_many("currency", ["EUR", "CNY", "USD"], fetch, "currency")
+    fetch.assert_called_once_with(["CNY"])
+    assert [record["rate"] for record in result] == [90.0, 91.0, 90.0]
+
+
+def test_get_many_persists_between_instances(cache: QuoteCache) -> None:
+    cache.get_many("currency", ["USD"], make_fetch(90.0), "currency")
+    fetch = make_fetch(91.0)
+    assert QuoteCache(cache.path).get_many("currency", ["USD"], fetch, "currency")[0]["rate"] == 90.0
+    fetch.assert_not_called()
+
+
+def test_get_many_serves_stale_and_refreshes(cache: QuoteCache) -> None:
+    cache.save("currency", {"USD": {"currency": "USD", "rate": 80.0}}, fetched_at=time.time() - 120)
+    fetch = make_fetch(90.0)
+    assert cache.get_many("currency", ["USD"], fetch, "currency") == [{"currency": "USD", "rate": 80.0}]
+    cache.wait()
+    fetch.assert_called_once_with(["USD"])
+    assert cache.load("currency", ["USD"])["USD"][0]["rate"] == 90.0
+
+
+def test_get_many_blocks_on_too_old_values(cache: QuoteCache) -> None:
+    cache.save("currency", {"USD": {"currency": "USD", "rate": 80.0}}, fetched_at=time.time() - 7200)
+    assert cache.get_many("currency", ["USD"], make_fetch(90.0), "currency") == [{"currency": "USD", "rate": 90.0}]
+
+
+def test_get_many_skips_failed_symbols(cache: QuoteCache) -> None:
+    fetch = MagicMock(return_value=[{"currency": "USD", "rate": 90.0}])
+    assert cache.get_many("currency", ["USD", "XXX"], fetch, "currency") == [{"currency": "USD", "rate": 90.0}]
+    fetch.reset_mock()
+    cache.get_many("currency", ["USD", "XXX"], fetch, "currency")
+    fetch.assert_called_once_with(["XXX"])
+
+
+def test_refresh_failure_keeps_stale_value(cache: QuoteCache) -> None:
+    cache.save("currency", {"USD": {"currency": "USD", "rate": 80.0}}, fetched_at=time.time() - 120)
+    fetch = MagicMock(side_effect=RuntimeError("API unavailable"))
+    assert cache.get_many("currency", ["USD"], fetch, "currency")[0]["rate"] == 80.0
+    cache.wait()
+    assert cache.load("currency", ["USD"])["USD"][0]["rate"] == 80.0
+
+
+def test_values_are_stored_by_trading_day(cache: QuoteCache) -> None:
+    fetch = MagicMock(return_value=[{"stock": "AAPL", "price": 150.0, "date": "2024-08-08"}])
+    assert cache.get_many("stock", ["AAPL"], fetch, "stock") == [{"stock": "AAPL", "price": 150.0}]
+    with closing(sqlite3.connect(cache.path)) as connection:
+        assert connection.execute("SELECT day FROM quotes").fetchall() == [("2024-08-08",)]
+    assert cache.load("stock", ["AAPL"])["AAPL"][0] == {"stock": "AAPL", "price": 150.0}
+
+
+def test_refresh_is_joined_at_exit(cache: QuoteCache) -> None:
+    cache.save("currency", {"USD": {"currency": "USD", "rate": 80.0}}, fetched_at=time.time() - 120)
+    with patch("src.quotes.atexit.register") as mock_register:
+        cache.get_many("currency", ["USD"], make_fetch(90.0), "currency")
+        cache.wait()
+        cache.save("currency", {"USD": {"currency": "USD", "rate": 80.0}}, fetched_at=time.time() - 120)
+        cache.get_many("currency", ["USD"], make_fetch(90.0), "currency")
+        cache.wait()
+    mock_register.assert_called_once_with(cache.wait, EXIT_WAIT_TIMEOUT)
+
+
+def test_wait_gives_up_after_timeout(cache: QuoteCache) -> None:
+    cache.save("currency", {"USD": {"currency": "USD", "rate": 80.0}}, fetched_at=time.time() - 120)
+    release = threading.Event()
+
+    def blocked_fetch(symbols: List[str]) -> List[Dict[str, Any]]:
+        release.wait(5)
+        return [{"currency": "USD", "rate": 90.0}]
+
+    cache.get_many("currency", ["USD"], blocked_fetch, "currency")
+    cache.wait(0.01)
+    assert cache.load("currency", ["USD"])["USD"][0]["rate"] == 80.0
+    release.set()
+    cache.wait()
+    assert cache.load("currency", ["USD"])["USD"][0]["rate"] == 90.0
+
+
+def test_corrupted_cache_falls_back_to_api(tmp_path: Path) -> None:
+    path = tmp_path / "quotes.sqlite"
+    path.write_bytes(b"not a database" * 100)
+    cache = QuoteCache(str(path))
+    assert cache.get_many("currency", ["USD"], make_fetch(90.0), "currency") == [{"currency": "USD", "rate": 90.0}]
+
+
+def test_get_rates_and_prices_uses_cache(cache: QuoteCache) -> None:
+    with patch("src.views.get_currency_rates", side_effect=make_fetch(90.0)) as mock_rates, patch(
+        "src.views.get_stock_prices", return_value=[{"stock": "AAPL", "price": 150.0}]
+    ) as mock_prices:
+        first = get_rates_and_prices(["USD"], ["AAPL"], MagicMock(), cache, max_workers=2, timeout=(1.0, 2.0))
+        second = get_rates_and_prices(["USD"], ["AAPL"], MagicMock(), cache, max_workers=2, timeout=(1.0, 2.0))
+
+    assert first == second == ([{"currency": "USD", "rate": 90.0}], [{"stock": "AAPL", "price": 150.0}])
+    mock_rates.assert_called_once_with(["USD"], timeout=(1.0, 2.0), with_date=True)
+    mock_prices.assert_called_once_with(["AAPL"], max_workers=2, timeout=(1.0, 2.0), with_date=True)
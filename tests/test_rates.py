@@ -0,0 +1,43 @@
+import pytest
+
+from src.rates import CrossRates
+
+
+@pytest.fixture
+def cross_rates() -> CrossRates:
+    # Курсы за один рубль
+    return CrossRates("RUB", {"USD": 0.0125, "EUR": 0.01, "CNY": 0.08, "XXX": None})  # type: ignore[dict-item]
+
+
+def test_cross_rates_currencies(cross_rates: CrossRates) -> None:
+    assert cross_rates.currencies == ["USD", "EUR", "CNY", "RUB"]
+    assert "XXX" not in cross_rates
+
+
+@pytest.mark.parametrize(
+    "from_currency, to_currency, expected",
+    [("USD", "RUB", 80.0), ("RUB", "EUR", 0.01), ("EUR", "USD", 1.25), ("CNY", "CNY", 1.0), ("USD", "CNY", 6.4)],
+)
+def test_cross_rates_rate(cross_rates: CrossRates, from_currency: str, to_currency: str, expected: float) -> None:
+    assert cross_rates.rate(from_currency, to_currency) == pytest.approx(expected)
+
+
+def test_cross_rates_convert(cross_rates: CrossRates) -> None:
+    assert cross_rates.convert(100, "EUR", "USD") == pytest.approx(125.0)
+    assert cross_rates.convert(1000, "RUB", "CNY") == pytest.approx(80.0)
+
+
+def test_cross_rates_unknown_currency(cross_rates: CrossRates) -> None:
+    with pytest.raises(ValueError):
+        cross_rates.convert(100, "USD", "GBP")
+
+
+def test_cross_rates_matrix(cross_rates: CrossRates) -> None:
+    matrix = cross_rates.matrix()
+    assert list(matrix.index) == list(matrix.columns) == ["USD", "EUR", "CNY", "RUB"]
+    assert matrix.loc["USD", "RUB"] == pytest.approx(80.0)
+    assert matrix.loc["EUR", "USD"] == pytest.approx(1.25)
+    for currency in matrix.index:
+        assert matrix.loc[currency, currency] == pytest.approx(1.0)
+        for other in matrix.columns:
+            assert matrix.loc[currency, other] * matrix.loc[other, currency] == pytest.approx(1.0)
@@ -0,0 +1,87 @@
+import json
+import time
+from pathlib import Path
+from typing import Any, Generator
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from src.market import close_session
+from src.replay import DEFAULT_FIXTURES_PATH, MarketStandIn, get_fixture_key, load_fixtures
+from src.views import get_currency_rates, get_stock_prices
+
+
+@pytest.fixture(autouse=True)
+def fresh_session() -> Generator[None, None, None]:
+    # Соединения общей сессии не должны переживать остановленный сервер
+    close_session()
+    yield
+    close_session()
+
+
+def use_stand_in(stand_in: MarketStandIn) -> Any:
+    return patch.multiple(
+        "src.views",
+        FIXER_URL=stand_in.base_urls["FIXER_URL"],
+        ALPHA_VANTAGE_URL=stand_in.base_urls["ALPHA_VANTAGE_URL"],
+        API_KEY="secret",
+        Alpha_KEY="secret",
+    )
+
+
+def test_get_fixture_key() -> None:
+    assert get_fixture_key("/query?symbol=AAPL&apikey=secret&function=TIME_SERIES_DAILY") == (
+        "/query?function=TIME_SERIES_DAILY&symbol=AAPL"
+    )
+    assert get_fixture_key("/fixer/latest?base=RUB&symbols=USD%2CEUR") == "/fixer/latest?base=RUB&symbols=USD,EUR"
+    assert get_fixture_key("/fixer/latest") == "/fixer/latest"
+
+
+def test_replay_bundled_fixtures() -> None:
+    with MarketStandIn(DEFAULT_FIXTURES_PATH) as stand_in, use_stand_in(stand_in):
+        rates = get_currency_rates(["USD", "EUR", "RUB"])
+        prices = get_stock_prices(["AAPL", "TSLA"])
+
+    assert [rate["currency"] for rate in rates] == ["USD", "EUR", "RUB"]
+    assert rates[2]["rate"] == 1.0
+    assert rates[0]["rate"] == pytest.approx(1 / 0.011655)
+    assert prices == [{"stock": "AAPL", "price": 213.31}, {"stock": "TSLA", "price": 191.48}]
+
+
+def test_replay_unknown_request() -> None:
+    with MarketStandIn(DEFAULT_FIXTURES_PATH) as stand_in, use_stand_in(stand_in):
+        assert get_stock_prices(["NVDA"]) == []
+        response = requests.get(f"{stand_in.url}/query?function=TIME_SERIES_DAILY&symbol=NVDA", timeout=5)
+    assert response.status_code == 404
+
+
+def test_stand_in_latency_and_errors() -> None:
+    with MarketStandIn(DEFAULT_FIXTURES_PATH, latency=0.2) as stand_in, use_stand_in(stand_in):
+        start = time.perf_counter()
+        prices = get_stock_prices(["AAPL", "AMZN", "GOOGL", "MSFT", "TSLA"])
+        elapsed = time.perf_counter() - start
+    assert len(prices) == 5
+    # Запросы идут параллельно, поэтому задержки не складываются
+    assert 0.2 <= elapsed < 0.6
+
+    with MarketStandIn(DEFAULT_FIXTURES_PATH, error_rate=1.0) as stand_in, use_stand_in(stand_in):
+        assert get_stock_prices(["AAPL"]) == []
+        assert get_currency_rates(["USD"]) == []
+
+
+def test_record_then_replay(tmp_path: Path) -> None:
+    fixtures_path = str(tmp_path / "recorded.json")
+    # Вместо настоящих API запись идет с другого локального сервера
+    with MarketStandIn(DEFAULT_FIXTURES_PATH) as upstream:
+        upstreams = {"/fixer": f"{upstream.url}/fixer", "/query": f"{upstream.url}/query"}
+        with MarketStandIn(fixtures_path, mode="record", upstreams=upstreams) as recorder, use_stand_in(recorder):
+            recorded = get_stock_prices(["AAPL", "NVDA"])
+
+    assert recorded == [{"stock": "AAPL", "price": 213.31}]
+    fixtures = load_fixtures(fixtures_path)
+    assert list(fixtures) == ["/query?function=TIME_SERIES_DAILY&symbol=AAPL"]
+    assert "secret" not in json.dumps(fixtures)
+
+    with MarketStandIn(fixtures_path) as stand_in, use_stand_in(stand_in):
+        assert get_stock_prices(["AAPL"]) == recorded
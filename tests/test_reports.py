@@ -1,22 +1,69 @@
+import json
+import threading
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Union
+from unittest.mock import patch
 
 import pandas as pd
 import pytest
 
-from src.reports import category_spending, save_to_file, spending_by_category
+from src.reports import category_spending, get_report_sink, save_to_file, spending_by_categories, spending_by_category
+from src.store import TransactionStore
 
 
-def test_save_to_file():
+def read_records(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_save_to_file(tmp_path: Path) -> None:
+    path = str(tmp_path / "reports.ndjson")
+
     # Создаем тестовую функцию-отчет
-    @save_to_file()
-    def test_func():
+    @save_to_file(path)
+    def test_func() -> str:
         return "Test result"
 
     # Вызываем функцию-отчет
-    test_func()
+    assert test_func() == "Test result"
     # Проверяем, что результат был сохранен в файл
-    with open("reports.log", "r") as file:
-        assert file.read() == "Test result"
+    get_report_sink(path).flush()
+    assert [record["data"] for record in read_records(path)] == ["Test result"]
+
+
+def test_save_to_file_does_not_wait_for_disk(reports_path: str) -> None:
+    sink = get_report_sink()
+    assert sink.path == reports_path
+    written = threading.Event()
+    release = threading.Event()
+    write_batch = sink._write_batch
+
+    def slow_write(items: List[Any]) -> None:
+        release.wait(5)
+        write_batch(items)
+        written.set()
+
+    @save_to_file()
+    def report() -> pd.DataFrame:
+        return pd.DataFrame({"Сумма операции": [1.5]})
+
+    with patch.object(sink, "_write_batch", side_effect=slow_write):
+        result = report()
+        result["Категория"] = "Еда"
+        assert not written.is_set()
+        release.set()
+        sink.flush()
+    assert written.is_set()
+    record = read_records(reports_path)[-1]
+    assert record["report"] == "report"
+    assert record["data"] == [{"Сумма операции": 1.5}]
+
+
+def test_reports_written_to_default_sink(reports_path: str, transactions: pd.DataFrame) -> None:
+    spending_by_category(transactions, "Еда", "2022-04-15")
+    get_report_sink().flush()
+    assert read_records(reports_path)[-1]["report"] == "spending_by_category"
 
 
 @pytest.fixture
@@ -58,6 +105,27 @@ def test_spending_by_category_with_no_transactions_in_last_90_days():
     assert len(result) == 0  # Должно быть 0 строк
 
 
+@pytest.mark.parametrize("date", ["2022-02-01", "2022-04-15", "2023-04-01"])
+def test_spending_by_category_store(transactions: pd.DataFrame, date: str) -> None:
+    expected = spending_by_category(transactions, "Еда", date)
+    result = spending_by_category(TransactionStore(transactions), "Еда", date)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("source", [lambda df: df, TransactionStore])
+def test_spending_by_categories(
+    transactions: pd.DataFrame, source: Callable[[pd.DataFrame], Union[pd.DataFrame, TransactionStore]]
+) -> None:
+    result = spending_by_categories(source(transactions), "2022-04-15")
+    assert result.index.strftime("%Y-%m-%d").tolist() == ["2022-01-31", "2022-02-28", "2022-03-31", "2022-04-30"]
+    assert result["Еда"].tolist() == [200, 0, 0, 250]
+    assert result["Транспорт"].tolist() == [0, 50, 150, 0]
+
+
+def test_spending_by_categories_empty(transactions: pd.DataFrame) -> None:
+    assert spending_by_categories(transactions, "2030-01-01").empty
+
+
 @pytest.fixture
 def df():
     data = {"Категория": ["Еда", "Транспорт", "Еда", "Товары", None], "Расходы": [100, 200, 50, 150, 0]}
@@ -86,3 +154,11 @@ def test_category_spending_null_category(df, monkeypatch):
     monkeypatch.setattr("builtins.input", lambda x: "none")
     result = category_spending(df)
     assert result is None
+
+
+def test_category_spending_suggestions(
+    transactions: pd.DataFrame, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr("builtins.input", lambda x: "ед")
+    assert category_spending(TransactionStore(transactions)) is None
+    assert "Возможно, вы имели в виду: Еда" in capsys.readouterr().out
@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.reports import rolling_spending
+from src.rolling import CategoryPrefixSums
+from src.store import TransactionStore
+
+
+@pytest.fixture
+def store() -> TransactionStore:
+    df = pd.DataFrame(
+        {
+            "Дата операции": [
+                "01.01.2023 12:00:00",
+                "15.02.2023 12:00:00",
+                "10.01.2023 09:00:00",
+                "20.04.2023 18:00:00",
+                "01.04.2023 10:00:00",
+            ],
+            "Категория": ["Еда", "Еда", "Транспорт", "Еда", "Транспорт"],
+            "Сумма операции": [-100.5, -200.0, -50.0, 300.0, -25.25],
+        }
+    )
+    return TransactionStore(df)
+
+
+@pytest.mark.parametrize(
+    "category, date, days, expected",
+    [
+        ("Еда", datetime(2023, 2, 15, 12), 90, 300.5),
+        ("Еда", datetime(2023, 2, 15, 11), 90, 100.5),
+        ("Еда", datetime(2023, 4, 20, 18), 90, 500.0),
+        ("Еда", datetime(2023, 4, 20, 18), 200, 600.5),
+        ("Транспорт", datetime(2023, 4, 1, 10), 90, 75.25),
+        ("Транспорт", datetime(2022, 12, 31), 90, 0.0),
+        ("Связь", datetime(2023, 4, 1), 90, 0.0),
+    ],
+)
+def test_window(store: TransactionStore, category: str, date: datetime, days: int, expected: float) -> None:
+    assert store.category_sums.window(category, date, days) == pytest.approx(expected)
+
+
+def test_rolling_spending(store: TransactionStore) -> None:
+    result = rolling_spending(store, days=30)
+    assert result.index[0] == pd.Timestamp("2023-01-01")
+    assert result.index[-1] == pd.Timestamp("2023-04-20")
+    assert sorted(result.columns) == ["Еда", "Транспорт"]
+    assert result.loc["2023-01-10", "Транспорт"] == 50.0
+    assert result.loc["2023-02-10", "Транспорт"] == 0.0
+    assert result.loc["2023-01-30", "Еда"] == 100.5
+    assert result.loc["2023-01-31", "Еда"] == 0.0
+
+
+def test_rolling_matches_rows(store: TransactionStore) -> None:
+    df = store.df
+    result = CategoryPrefixSums(store.data).rolling(days=45)
+    for day in result.index[::7]:
+        end = day + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+        window = df[(df["Дата операции"] >= end - pd.Timedelta(days=45)) & (df["Дата операции"] <= end)]
+        expected = window.groupby("Категория", observed=True)["Сумма операции"].apply(lambda x: x.abs().sum())
+        assert result.loc[day].to_dict() == pytest.approx(expected.reindex(result.columns, fill_value=0).to_dict())
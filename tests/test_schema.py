@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from src.schema import (expand_transactions, get_footprint_report, get_year_month, is_compact, normalize_transactions,
+                        parse_dates, to_kopecks, to_rubles)
+
+
+@pytest.fixture
+def raw_transactions() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Дата операции": ["31.12.2021 16:44:00", "30.12.2021 10:00:00"] * 50,
+            "Дата платежа": ["31.12.2021", None] * 50,
+            "Категория": ["Супермаркеты", "Переводы"] * 50,
+            "Описание": ["Колхоз", "Перевод"] * 50,
+            "Сумма операции": [-160.89, 1000.1] * 50,
+            "Кэшбэк": [None, 10.0] * 50,
+        }
+    )
+
+
+def test_normalize_transactions_types(raw_transactions: pd.DataFrame) -> None:
+    result = normalize_transactions(raw_transactions)
+    assert is_compact(result)
+    assert pd.api.types.is_datetime64_any_dtype(result["Дата операции"])
+    assert pd.api.types.is_datetime64_any_dtype(result["Дата платежа"])
+    assert isinstance(result["Категория"].dtype, pd.CategoricalDtype)
+    assert result["Сумма операции"].dtype == "int64"
+    assert result["Сумма операции"].tolist()[:2] == [-16089, 100010]
+    assert result["Кэшбэк"].dtype == "Int64"
+
+
+def test_normalize_transactions_is_idempotent(raw_transactions: pd.DataFrame) -> None:
+    result = normalize_transactions(raw_transactions)
+    assert normalize_transactions(result) is result
+
+
+def test_expand_transactions_restores_rubles(raw_transactions: pd.DataFrame) -> None:
+    result = expand_transactions(normalize_transactions(raw_transactions))
+    assert not is_compact(result)
+    assert result["Сумма операции"].tolist()[:2] == [-160.89, 1000.1]
+    assert pd.isna(result["Кэшбэк"].iloc[0])
+
+
+def test_to_kopecks_round_trip() -> None:
+    amounts = pd.Series([0.1, 0.2, -118.12])
+    assert to_kopecks(amounts).tolist() == [10, 20, -11812]
+    assert to_rubles(to_kopecks(amounts)).tolist() == [0.1, 0.2, -118.12]
+
+
+def test_get_footprint_report(raw_transactions: pd.DataFrame) -> None:
+    report = get_footprint_report(raw_transactions, normalize_transactions(raw_transactions))
+    assert report["after_bytes"] < report["before_bytes"]
+    assert report["saved_percent"] > 0
+
+
+def test_parse_dates() -> None:
+    values = pd.Series(["31.12.2021 16:44:00", None, "не дата", "31.12.2021 16:44:00"])
+    parsed = parse_dates(values)
+    assert parsed.iloc[0] == pd.Timestamp("2021-12-31 16:44:00")
+    assert parsed.iloc[3] == parsed.iloc[0]
+    assert parsed.iloc[1:3].isna().all()
+    assert parse_dates(parsed) is parsed
+
+
+def test_get_year_month() -> None:
+    years, months = get_year_month(parse_dates(pd.Series(["31.12.2021 16:44:00", None])))
+    assert years.tolist() == [2021, 0]
+    assert months.tolist() == [12, 0]
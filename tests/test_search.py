@@ -0,0 +1,113 @@
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.search import DescriptionIndex, load_search_index, tokenize
+from src.store import TransactionStore
+
+
+def make_transactions(count: int) -> pd.DataFrame:
+    descriptions = ["Яндекс Такси", "Яндекс Еда", "Пятёрочка", "Перевод Ивану", None]
+    return pd.DataFrame(
+        {
+            "Дата операции": [f"{1 + day % 28:02d}.{1 + day // 28:02d}.2023 12:00:00" for day in range(count)],
+            "Описание": [descriptions[day % len(descriptions)] for day in range(count)],
+            "Сумма операции": [-100.0 - day for day in range(count)],
+        }
+    )
+
+
+@pytest.fixture
+def store() -> TransactionStore:
+    return TransactionStore(make_transactions(40))
+
+
+def naive_search(
+    df: pd.DataFrame, words: List[str], start: Optional[datetime] = None, end: Optional[datetime] = None
+) -> pd.DataFrame:
+    descriptions = df["Описание"].astype(object)
+    mask = descriptions.map(lambda text: isinstance(text, str) and set(words) <= set(tokenize(text)))
+    if start:
+        mask &= df["Дата операции"] >= start
+    if end:
+        mask &= df["Дата операции"] <= end
+    return df[mask]
+
+
+def test_tokenize() -> None:
+    assert tokenize("Яндекс.Такси, ЁЛКИ-палки 2023") == ["яндекс", "такси", "елки", "палки", "2023"]
+
+
+@pytest.mark.parametrize("query", ["Яндекс", "яндекс такси", "пятерочка", "Ивану Перевод", "Яндекс Ивану", "кино"])
+def test_search_matches_scan(store: TransactionStore, query: str) -> None:
+    result = store.search(query)
+    expected = naive_search(store.df, tokenize(query))
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_search_with_period(store: TransactionStore) -> None:
+    start, end = datetime(2023, 1, 10), datetime(2023, 2, 5, 23, 59)
+    result = store.search("Яндекс", start, end)
+    assert len(result) > 0
+    pd.testing.assert_frame_equal(result, naive_search(store.df, ["яндекс"], start, end))
+
+
+def test_search_prefix(store: TransactionStore) -> None:
+    assert set(store.search("янд", prefix=True)["Описание"]) == {"Яндекс Такси", "Яндекс Еда"}
+    assert store.search("янд").empty
+    assert set(store.search("яндекс т", prefix=True)["Описание"]) == {"Яндекс Такси"}
+
+
+def test_search_empty_query(store: TransactionStore) -> None:
+    assert store.search("  ").empty
+
+
+def test_update_indexes_only_new_rows() -> None:
+    data = TransactionStore(make_transactions(30)).data
+    index = DescriptionIndex()
+    assert index.update(data.iloc[:20]) == 20
+    with patch("src.search.tokenize", wraps=tokenize) as mock_tokenize:
+        assert index.update(data) == 10
+        # Слова выделяются один раз на каждое различное непустое описание новых строк
+        assert mock_tokenize.call_count == 4
+    assert index.update(data) == 0
+    fresh = DescriptionIndex()
+    fresh.update(data)
+    assert index.postings.keys() == fresh.postings.keys()
+    for token, rows in fresh.postings.items():
+        assert index.postings[token].tolist() == rows.tolist()
+
+
+def test_update_rebuilds_when_rows_change() -> None:
+    data = TransactionStore(make_transactions(30)).data
+    index = DescriptionIndex()
+    index.update(data)
+    changed = data.copy()
+    changed["Описание"] = changed["Описание"].cat.rename_categories({"Пятёрочка": "Магнит"})
+    assert index.update(changed) == 30
+    assert "магнит" in index.postings
+    assert "пятерочка" not in index.postings
+
+
+def test_load_search_index_persists(tmp_path: Path) -> None:
+    source = tmp_path / "operations.csv"
+    source.write_text("")
+    data = TransactionStore(make_transactions(30)).data
+    load_search_index(data.iloc[:20], str(source))
+
+    assert DescriptionIndex.load(str(source) + ".search.pkl").row_count == 20
+    with patch("src.search.tokenize", wraps=tokenize) as mock_tokenize:
+        index = load_search_index(data, str(source))
+        assert mock_tokenize.call_count == 4
+    assert index.row_count == 30
+    assert DescriptionIndex.load(str(source) + ".search.pkl").row_count == 30
+
+
+def test_load_search_index_corrupted(tmp_path: Path) -> None:
+    path = tmp_path / "operations.csv.search.pkl"
+    path.write_bytes(b"not a pickle")
+    assert DescriptionIndex.load(str(path)).row_count == 0
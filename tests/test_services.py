@@ -1,9 +1,12 @@
 import json
+from typing import Any, Dict, Hashable, List
 from unittest.mock import patch
 
 import pandas as pd
 
-from src.services import analyze_cashback, get_info_from_excel
+from src.services import (analyze_cashback, analyze_cashback_frame, get_info_from_excel, get_investment_grid,
+                          investment_bank)
+from src.store import TransactionStore
 
 
 def test_get_info_from_excel():
@@ -11,8 +14,8 @@ def test_get_info_from_excel():
     df = pd.DataFrame(
         {"Дата операции": ["01.01.2022 12:00:00"], "Категория": ["Еда"], "Бонусы (включая кэшбэк)": ["100"]}
     )
-    with patch("pandas.read_excel") as mock_read_excel:
-        mock_read_excel.return_value = df
+    with patch("src.ingest.read_operations") as mock_read_operations:
+        mock_read_operations.return_value = df
         # Проверяем, что функция возвращает словарь
         assert isinstance(get_info_from_excel(), list)
 
@@ -31,3 +34,64 @@ def test_analyze_cashback():
     # Проверяем, что в результате анализа есть категория 'Еда' и 'Транспорт'
     assert "Еда" in json.loads(analyze_cashback(data, year, month))
     assert "Транспорт" in json.loads(analyze_cashback(data, year, month))
+
+
+def test_investment_bank() -> None:
+    transactions: List[Dict[Hashable, Any]] = [
+        {"Дата операции": "01.01.2022 12:00:00", "Сумма операции": 1712},
+        {"Дата операции": pd.Timestamp("2022-01-15 12:00:00"), "Сумма операции": 49.5},
+        {"Дата операции": "01.02.2022 12:00:00", "Сумма операции": 10},
+        {"Дата операции": "не дата", "Сумма операции": 10},
+        {"Дата операции": None, "Сумма операции": 10},
+    ]
+    assert investment_bank("2022-01", transactions, 50) == 38.5
+    assert investment_bank("2022-03", transactions, 50) == 0
+
+
+def test_analyze_cashback_frame() -> None:
+    df = pd.DataFrame(
+        {
+            "Дата операции": [
+                "01.01.2022 12:00:00",
+                "02.01.2022 12:00:00",
+                "03.01.2022 12:00:00",
+                "01.02.2022 12:00:00",
+            ],
+            "Категория": ["Еда", "Еда", "Транспорт", "Еда"],
+            "Бонусы (включая кэшбэк)": [10, 5, 0, 300],
+        }
+    )
+    expected = {"Еда": 15.0}
+    assert json.loads(analyze_cashback_frame(df, 2022, 1)) == expected
+    assert json.loads(analyze_cashback_frame(TransactionStore(df).data, 2022, 1)) == expected
+    assert json.loads(analyze_cashback(df.to_dict("records"), 2022, 1)) == expected
+
+
+def test_get_investment_grid() -> None:
+    df = pd.DataFrame(
+        {
+            "Дата операции": ["01.01.2022 12:00:00", "15.01.2022 12:00:00", "01.02.2022 12:00:00"],
+            "Сумма операции": [1712.0, 49.5, 10.0],
+        }
+    )
+    grid = get_investment_grid(df)
+    assert grid.index.tolist() == ["2022-01", "2022-02"]
+    assert grid.columns.tolist() == [10, 50, 100]
+    assert list(grid.loc["2022-01"]) == [8.5, 38.5, 138.5]
+    assert list(grid.loc["2022-02"]) == [0.0, 40.0, 90.0]
+    assert get_investment_grid(TransactionStore(df).data).equals(grid)
+
+
+def test_services_from_store() -> None:
+    df = pd.DataFrame(
+        {
+            "Дата операции": ["01.01.2022 12:00:00", "15.01.2022 12:00:00", "01.02.2022 12:00:00"],
+            "Категория": ["Еда", "Транспорт", "Еда"],
+            "Сумма операции": [-1712.0, -49.5, 10.0],
+            "Бонусы (включая кэшбэк)": [17, 0, 300],
+        }
+    )
+    store = TransactionStore(df)
+    assert analyze_cashback_frame(store, 2022, 1) == analyze_cashback_frame(df, 2022, 1)
+    pd.testing.assert_frame_equal(get_investment_grid(store), get_investment_grid(df))
+    pd.testing.assert_frame_equal(get_investment_grid(store, [20]), get_investment_grid(df, [20]))
@@ -0,0 +1,64 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pandas as pd
+import pytest
+
+from src.reports import save_to_file
+from src.sink import ReportSink
+
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_sink_writes_ndjson(tmp_path: Path) -> None:
+    path = str(tmp_path / "reports.ndjson")
+    with ReportSink(path, flush_interval=0.01) as sink:
+        sink.write("text", "Test result")
+        sink.write("table", pd.DataFrame({"Дата операции": [pd.Timestamp("2023-01-31")], "Сумма операции": [1.5]}))
+    records = read_records(path)
+    assert [record["report"] for record in records] == ["text", "table"]
+    assert records[0]["data"] == "Test result"
+    assert records[1]["data"] == [{"Дата операции": "2023-01-31T00:00:00.000", "Сумма операции": 1.5}]
+
+
+def test_sink_rotates_by_size(tmp_path: Path) -> None:
+    path = str(tmp_path / "reports.ndjson")
+    with ReportSink(path, max_bytes=200, backup_count=2, batch_size=1) as sink:
+        for index in range(20):
+            sink.write("report", "x" * 50 + str(index))
+            sink.flush()
+    assert os.path.exists(path + ".1")
+    assert os.path.exists(path + ".2")
+    assert not os.path.exists(path + ".3")
+    assert read_records(path)[-1]["data"].endswith("19")
+
+
+def test_save_to_file_with_sink(tmp_path: Path) -> None:
+    path = str(tmp_path / "reports.ndjson")
+    sink = ReportSink(path, flush_interval=0.01)
+
+    @save_to_file(sink=sink)
+    def report() -> Dict[str, int]:
+        return {"total": 10}
+
+    assert report() == {"total": 10}
+    sink.close()
+    assert read_records(path)[0]["report"] == "report"
+    assert read_records(path)[0]["data"] == {"total": 10}
+    with pytest.raises(RuntimeError):
+        sink.write("report", 1)
+
+
+def test_sink_writes_parquet(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "reports")
+    with ReportSink(path, file_format="parquet") as sink:
+        sink.write("table", pd.DataFrame({"Сумма операции": [1.5, 2.5]}))
+    files = os.listdir(path)
+    assert len(files) == 1
+    assert pd.read_parquet(os.path.join(path, files[0]))["Сумма операции"].tolist() == [1.5, 2.5]
@@ -0,0 +1,129 @@
+from datetime import datetime
+from typing import Optional
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.store import TransactionStore, as_store
+from src.views import get_card_from_main, get_expenses, get_income
+
+
+@pytest.fixture
+def store() -> TransactionStore:
+    df = pd.DataFrame(
+        {
+            "Дата операции": ["01.08.2023 12:00:00", "02.08.2023 14:00:00", "03.08.2023 10:00:00"],
+            "Номер карты": ["*7197", "*5091", "*7197"],
+            "Категория": ["Продукты", "Транспорт", "Продукты"],
+            "Сумма операции": [-100.0, -200.0, -300.0],
+        }
+    )
+    return TransactionStore(df)
+
+
+def test_store_parses_dates(store: TransactionStore) -> None:
+    assert pd.api.types.is_datetime64_any_dtype(store.df["Дата операции"])
+    assert len(store) == 3
+
+
+def test_store_between(store: TransactionStore) -> None:
+    result = store.between(datetime(2023, 8, 2), datetime(2023, 8, 3, 23, 59))
+    assert result["Сумма операции"].tolist() == [-200.0, -300.0]
+
+
+def test_store_filter_by_card_and_category(store: TransactionStore) -> None:
+    assert store.by_card("*7197")["Сумма операции"].tolist() == [-100.0, -300.0]
+    assert store.by_category("Транспорт")["Сумма операции"].tolist() == [-200.0]
+    assert store.filter(end_date=datetime(2023, 8, 1, 23, 59), category="Продукты")["Сумма операции"].tolist() == [
+        -100.0
+    ]
+
+
+def test_as_store_reads_file_once(store: TransactionStore, temp_excel_file: str) -> None:
+    assert as_store(store) is store
+    with patch("src.ingest.read_operations", wraps=lambda path: pd.read_excel(path)) as mock_read:
+        loaded = as_store(temp_excel_file)
+        loaded.between(datetime(2023, 8, 1), datetime(2023, 8, 3))
+        loaded.by_category("Продукты")
+        mock_read.assert_called_once_with(temp_excel_file)
+
+
+def test_store_sorted_by_date() -> None:
+    df = pd.DataFrame(
+        {
+            "Дата операции": ["03.08.2023 10:00:00", None, "01.08.2023 12:00:00", "02.08.2023 14:00:00"],
+            "Сумма операции": [-300.0, -1.0, -100.0, -200.0],
+        }
+    )
+    store = TransactionStore(df)
+    assert store.df["Сумма операции"].tolist() == [-100.0, -200.0, -300.0, -1.0]
+    assert store.between(datetime(2023, 8, 2), None)["Сумма операции"].tolist() == [-200.0, -300.0]
+    assert store.between(None, datetime(2023, 8, 2, 14))["Сумма операции"].tolist() == [-100.0, -200.0]
+
+
+def test_store_keeps_sorted_columns_without_copy(store: TransactionStore) -> None:
+    compact = store.data.set_axis([10, 11, 12])
+    data = TransactionStore(compact).data
+    assert data.index.equals(pd.RangeIndex(3))
+    assert compact.index.tolist() == [10, 11, 12]
+    assert np.shares_memory(data["Сумма операции"].to_numpy(), compact["Сумма операции"].to_numpy())
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date, expected",
+    [
+        (datetime.min, datetime(2023, 8, 3), 2),
+        (datetime(2023, 8, 1, 12), datetime(2023, 8, 1, 12), 1),
+        (datetime(2023, 7, 1), datetime(2023, 7, 31), 0),
+        (datetime(2023, 9, 1), datetime(2023, 9, 30), 0),
+        (datetime(2023, 8, 4), datetime(2023, 8, 1), 0),
+    ],
+)
+def test_store_date_slice_bounds(
+    store: TransactionStore, start_date: Optional[datetime], end_date: Optional[datetime], expected: int
+) -> None:
+    assert len(store.between(start_date, end_date)) == expected
+
+
+def make_quarter() -> pd.DataFrame:
+    days = range(1, 29)
+    return pd.DataFrame(
+        {
+            "Дата операции": [f"{day:02d}.0{month}.2023 12:00:00" for month in (1, 2, 3) for day in days],
+            "Номер карты": ["*7197", "*5091"] * 42,
+            "Категория": ["Продукты", "Зарплата", "Переводы", "Наличные"] * 21,
+            "Сумма операции": [-10.5 * i if i % 5 else 100.0 * i for i in range(84)],
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [
+        (None, None),
+        (datetime(2023, 1, 1), datetime(2023, 3, 31, 23, 59, 59)),
+        (datetime(2023, 1, 10), datetime(2023, 3, 5)),
+        (datetime(2023, 2, 3), datetime(2023, 2, 20)),
+        (datetime(2024, 1, 1), None),
+    ],
+)
+def test_store_summary_frame_matches_rows(start_date: Optional[datetime], end_date: Optional[datetime]) -> None:
+    store = TransactionStore(make_quarter())
+    rows = store.between(start_date, end_date)
+    summary = store.summary_frame(start_date, end_date)
+    assert get_expenses(summary) == get_expenses(rows)
+    assert get_income(summary) == get_income(rows)
+    assert [card["total_spent"] for card in get_card_from_main(summary)] == pytest.approx(
+        [card["total_spent"] for card in get_card_from_main(rows)]
+    )
+
+
+def test_store_summarize_full_months_from_cube() -> None:
+    store = TransactionStore(make_quarter())
+    cube = store.cube
+    with patch("src.store.build_cube") as mock_build:
+        result = store.summarize(datetime(2023, 2, 1), datetime(2023, 3, 31, 23, 59, 59))
+        mock_build.assert_not_called()
+    pd.testing.assert_frame_equal(result, cube[cube.index.get_level_values("month") >= 2])
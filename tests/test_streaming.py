@@ -0,0 +1,95 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.schema import normalize_transactions
+from src.services import analyze_cashback
+from src.streaming import (CardSummaryAggregator, CashbackAggregator, ChunkAggregator, ExpenseIncomeAggregator,
+                           aggregate_statement, iter_statement_chunks, summarize_statement)
+from src.summary import get_card_from_main, get_expenses, get_income
+
+
+@pytest.fixture
+def statement() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Дата операции": [f"{day:02d}.08.2023 12:00:00" for day in range(1, 11)],
+            "Номер карты": ["*7197", "*5091"] * 5,
+            "Категория": ["Продукты", "Переводы", "Зарплата", None, "Продукты"] * 2,
+            "Сумма операции": [-100.5, -200.25, 5000.0, -10.1, -300.0, -1.1, -2.2, 3000.0, -4.4, -5.5],
+            "Бонусы (включая кэшбэк)": [1, 2, 0, 0, 3, 0, 0, 0, 0, 1],
+        }
+    )
+
+
+@pytest.fixture(params=["csv", "xlsx"])
+def statement_file(request: pytest.FixtureRequest, tmp_path: Path, statement: pd.DataFrame) -> str:
+    path = str(tmp_path / f"operations.{request.param}")
+    if request.param == "csv":
+        statement.to_csv(path, sep=";", decimal=",", index=False)
+    else:
+        statement.to_excel(path, index=False)
+    return path
+
+
+def test_iter_statement_chunks(statement_file: str) -> None:
+    chunks = list(iter_statement_chunks(statement_file, chunksize=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+    assert chunks[0]["Сумма операции"].tolist() == [-10050, -20025, 500000]
+
+
+def test_aggregators_match_full_frame(statement_file: str, statement: pd.DataFrame) -> None:
+    start_date, end_date = datetime(2023, 8, 2), datetime(2023, 8, 9)
+    cards = CardSummaryAggregator()
+    events = ExpenseIncomeAggregator(start_date, end_date)
+    cashback = CashbackAggregator(2023, 8)
+
+    aggregate_statement(statement_file, [cards, events, cashback], chunksize=3)
+
+    df = statement.copy()
+    df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+    period = df[(df["Дата операции"] >= start_date) & (df["Дата операции"] <= end_date)]
+    records = statement.to_dict("records")
+    assert cards.result() == get_card_from_main(df)
+    assert events.result() == {"expenses": get_expenses(period), "income": get_income(period)}
+    assert json.loads(cashback.result()) == json.loads(analyze_cashback(records, 2023, 8))
+
+
+def test_aggregators_empty_statement() -> None:
+    assert CardSummaryAggregator().result() == []
+    assert ExpenseIncomeAggregator().result()["expenses"]["total_amount"] == 0
+    assert CashbackAggregator(2023, 8).result() == "{}"
+
+
+def test_chunk_aggregator_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        ChunkAggregator()  # type: ignore[abstract]
+
+
+def test_iter_statement_chunks_rejects_xls(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        next(iter_statement_chunks(str(tmp_path / "operations.xls")))
+
+
+def test_cashback_aggregator_without_bonus_column(statement: pd.DataFrame) -> None:
+    chunk = normalize_transactions(statement.drop(columns="Бонусы (включая кэшбэк)"))
+    cashback = CashbackAggregator(2023, 8)
+    cashback.update(chunk)
+    assert cashback.result() == "{}"
+
+
+def test_summarize_statement(statement_file: str, statement: pd.DataFrame) -> None:
+    result = summarize_statement(statement_file, 2023, 8, chunksize=4)
+
+    df = statement.copy()
+    df["Дата операции"] = pd.to_datetime(df["Дата операции"], format="%d.%m.%Y %H:%M:%S")
+    assert result == {
+        "cards": get_card_from_main(df),
+        "expenses": get_expenses(df),
+        "income": get_income(df),
+        "cashback": json.loads(analyze_cashback(statement.to_dict("records"), 2023, 8)),
+    }
+    assert summarize_statement(statement_file, 2023, 9)["cards"] == []
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from src.summary import get_card_from_main, get_card_stats, get_card_summary
+
+
+def test_get_card_from_main_total_without_float_noise() -> None:
+    df = pd.DataFrame(
+        {
+            "Номер карты": ["*7197"] * 3 + ["*5091"] * 10,
+            "Сумма операции": [-100.1, -200.2, -300.3] + [-0.1] * 10,
+        }
+    )
+    expected = df.groupby("Номер карты")["Сумма операции"].sum()
+    assert expected.tolist() == [-1.0, -600.6]
+    assert get_card_from_main(df) == [
+        {"last_digits": "5091", "total_spent": -1.0, "cashback": -0.01},
+        {"last_digits": "7197", "total_spent": -600.6, "cashback": -6.01},
+    ]
+
+
+def test_get_card_summary_matches_groupby() -> None:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "Номер карты": [f"*{card:04d}" for card in rng.integers(0, 3000, 20000)],
+            "Сумма операции": rng.normal(-500, 300, 20000).round(2),
+        }
+    )
+    df.loc[::97, "Сумма операции"] = np.nan
+    summary = get_card_summary(df).set_index("last_digits")
+
+    grouped = df.groupby("Номер карты")["Сумма операции"]
+    expected = grouped.agg(["sum", "count", "mean", "max"])
+    expected["p95"] = grouped.quantile(0.95)
+    expected.index = expected.index.str[-4:]
+    assert summary.index.tolist() == expected.index.tolist()
+    np.testing.assert_allclose(summary["total_spent"], expected["sum"])
+    np.testing.assert_array_equal(summary["count"], expected["count"])
+    np.testing.assert_allclose(summary["mean"], expected["mean"])
+    np.testing.assert_array_equal(summary["max"], expected["max"])
+    np.testing.assert_allclose(summary["p95"], expected["p95"])
+    np.testing.assert_allclose(summary["cashback"], summary["total_spent"] * 0.01, rtol=0, atol=0.005 + 1e-9)
+
+
+def test_get_card_summary_edge_cases() -> None:
+    df = pd.DataFrame({"Номер карты": ["*1111", "*2222", None], "Сумма операции": [-100.0, np.nan, -5.0]})
+    summary = get_card_summary(df)
+    assert summary["last_digits"].tolist() == ["1111", "2222"]
+    assert summary["count"].tolist() == [1, 0]
+    assert summary["total_spent"].tolist() == [-100.0, 0.0]
+    assert summary.loc[0, "p95"] == summary.loc[0, "max"] == -100.0
+    assert summary.loc[1, ["mean", "max", "p95"]].isna().all()
+    assert get_card_summary(df.iloc[0:0]).empty
+
+
+def test_get_card_stats() -> None:
+    df = pd.DataFrame({"Номер карты": ["*1111", "*1111", "*2222"], "Сумма операции": [-100.0, -50.0, np.nan]})
+    assert get_card_stats(df) == [
+        {"last_digits": "1111", "count": 2, "mean": -75.0, "max": -50.0, "p95": -52.5},
+        {"last_digits": "2222", "count": 0, "mean": None, "max": None, "p95": None},
+    ]
@@ -1,16 +1,21 @@
 import json
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 from typing import Any, Dict, List, Tuple
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
+import requests
 from tqdm import tqdm
 
-from src.views import (get_card_data_from_excel, get_card_from_main, get_common_data, get_currency_rates, get_expenses,
-                       get_greeting, get_income, get_rates_and_prices, get_stock_prices, get_top_transactions,
-                       get_user_settings_data, load_user_settings, main_func, parse_date_range, process_events_data,
-                       process_home_data)
+from src.market import MAX_CONCURRENT_REQUESTS, REQUEST_TIMEOUT
+from src.store import TransactionStore
+from src.views import (get_card_data_from_excel, get_card_from_main, get_common_data, get_cross_rates,
+                       get_currency_rates, get_expenses, get_greeting, get_income, get_rates_and_prices,
+                       get_stock_prices, get_top_transactions, get_user_settings_data, load_market_data,
+                       load_user_settings, main_func, parse_date_range, process_events_data, process_home_data)
 
 
 def test_get_common_data() -> None:
@@ -58,8 +63,10 @@ def test_get_rates_and_prices(rates_and_prices_params: RatesAndPricesParams) ->
 
         currency_rates, stock_prices = get_rates_and_prices(currencies, stocks, mock_progress_bar)
 
-        mock_get_currency_rates.assert_called_once_with(currencies)
-        mock_get_stock_prices.assert_called_once_with(stocks)
+        mock_get_currency_rates.assert_called_once_with(currencies, timeout=REQUEST_TIMEOUT)
+        mock_get_stock_prices.assert_called_once_with(
+            stocks, max_workers=MAX_CONCURRENT_REQUESTS, timeout=REQUEST_TIMEOUT
+        )
         assert currency_rates == expected_currency_rates
         assert stock_prices == expected_stock_prices
 
@@ -68,6 +75,18 @@ def test_get_rates_and_prices(rates_and_prices_params: RatesAndPricesParams) ->
             mock_progress_bar.update.assert_any_call(update)
 
 
+def test_load_market_data_passes_limits() -> None:
+    with patch("src.views.get_user_settings_data", return_value=(["USD"], ["AAPL"])), patch(
+        "src.views.get_quote_cache"
+    ) as mock_cache, patch("src.views.get_rates_and_prices", return_value=([], [])) as mock_rates_and_prices:
+        progress_bar = MagicMock()
+        assert load_market_data(progress_bar, max_workers=2, timeout=(1.0, 2.0)) == ([], [])
+
+    mock_rates_and_prices.assert_called_once_with(
+        ["USD"], ["AAPL"], progress_bar, mock_cache.return_value, 2, (1.0, 2.0)
+    )
+
+
 def test_get_user_settings_data() -> None:
     mock_user_settings = {"user_currencies": ["USD", "EUR", "JPY"], "user_stocks": ["AAPL", "GOOGL", "TSLA"]}
 
@@ -117,6 +136,35 @@ def test_get_card_from_main() -> None:
     assert get_card_from_main(df) == [{"last_digits": "5555", "total_spent": 100, "cashback": 1}]
 
 
+def test_get_card_from_main_keys() -> None:
+    df = pd.DataFrame({"Номер карты": ["*7197", "*5091", "*7197"], "Сумма операции": [-150.0, 20.0, -50.5]})
+    assert get_card_from_main(df) == [
+        {"last_digits": "5091", "total_spent": 20.0, "cashback": 0.2},
+        {"last_digits": "7197", "total_spent": -200.5, "cashback": -2.0},
+    ]
+
+
+def test_main_func_home_card_stats_use_transactions() -> None:
+    store = TransactionStore(
+        pd.DataFrame(
+            {
+                "Дата операции": ["02.01.2023 12:00:00", "03.01.2023 12:00:00", "04.01.2023 12:00:00"],
+                "Номер карты": ["*1111", "*1111", "*1111"],
+                "Категория": ["Еда", "Еда", "Еда"],
+                "Описание": ["Магнит", "Магнит", "Пятерочка"],
+                "Сумма операции": [-100.0, -300.0, -200.0],
+            }
+        )
+    )
+    with patch("src.views.load_market_data", return_value=([], [])):
+        result = main_func("home", "2023-01-10 12:00:00", store.df, store=store)
+        assert isinstance(result, str)
+        result = json.loads(result)
+
+    assert result["cards"] == [{"last_digits": "1111", "total_spent": -600.0, "cashback": -6.0}]
+    assert result["card_stats"] == [{"last_digits": "1111", "count": 3, "mean": -200.0, "max": -100.0, "p95": -110.0}]
+
+
 def test_get_expenses() -> None:
     df = pd.DataFrame({"Сумма операции": [-100, -50, 50, 100], "Категория": ["Food", "Transfers", "Cash", "Other"]})
     assert get_expenses(df) == {
@@ -165,38 +213,73 @@ def test_get_top_transactions_no_transactions_in_range(temp_excel_file: Any) ->
     assert len(result) == 0  # Нет транзакций в указанном диапазоне
 
 
+def test_get_top_transactions_ties_match_statement_order() -> None:
+    # Выписка банка идет от новых операций к старым; хранилище сортирует строки по возрастанию даты
+    statement = pd.DataFrame(
+        {
+            "Дата операции": [f"{day:02d}.08.2023 12:00:00" for day in range(7, 0, -1)],
+            "Сумма операции": [100.0, 500.0, 100.0, 500.0, 100.0, 300.0, 100.0],
+            "Категория": ["Переводы"] * 7,
+            "Описание": [f"Перевод {day}" for day in range(7, 0, -1)],
+        }
+    )
+    baseline = statement.assign(**{"Дата операции": pd.to_datetime(statement["Дата операции"], dayfirst=True)})
+    expected = baseline.nlargest(5, "Сумма операции")["Описание"].tolist()
+    assert expected == ["Перевод 6", "Перевод 4", "Перевод 2", "Перевод 7", "Перевод 5"]
+
+    result = get_top_transactions(TransactionStore(statement))
+    assert [transaction["description"] for transaction in result] == expected
+    assert [transaction["date"] for transaction in result] == [
+        "06.08.2023",
+        "04.08.2023",
+        "02.08.2023",
+        "07.08.2023",
+        "05.08.2023",
+    ]
+
+
 @patch("src.views.API_KEY", "fake_api_key")  # Подмена API_KEY на фиктивный
 def test_get_currency_rates() -> None:
-    # Определяем данные, которые будет возвращать подмененный запрос
-    mock_response_data = {"rates": {"RUB": 74.0}}
+    # Определяем данные, которые будет возвращать подмененный запрос: курсы за один рубль
+    mock_response_data = {"base": "RUB", "rates": {"USD": 0.0125, "EUR": 0.01, "RUB": 1.0}}
 
     # Создаем mock-объект для ответа
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = mock_response_data
 
-    # Используем patch для подмены requests.get
-    with patch("src.views.requests.get", return_value=mock_response) as mock_get:
+    # Используем patch для подмены общей HTTP-сессии
+    with patch("src.views.get_session") as mock_get_session:
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = mock_response
         # Вызов тестируемой функции
-        currencies = ["USD", "EUR"]
+        currencies = ["USD", "EUR", "GBP"]
         result = get_currency_rates(currencies)
 
         # Проверка результатов
-        expected_result = [{"currency": "USD", "rate": 74.0}, {"currency": "EUR", "rate": 74.0}]
+        expected_result = [
+            {"currency": "USD", "rate": 80.0},
+            {"currency": "EUR", "rate": 100.0},
+            {"currency": "GBP", "rate": "N/A"},
+        ]
         assert result == expected_result
 
-        # Проверка, что requests.get был вызван дважды (по одному разу на каждую валюту)
-        assert mock_get.call_count == 2
-
-        # Проверка аргументов вызова requests.get
-        mock_get.assert_any_call(
-            "https://api.apilayer.com/fixer/latest", headers={"apikey": "fake_api_key"}, params={"base": "USD"}
-        )
-        mock_get.assert_any_call(
-            "https://api.apilayer.com/fixer/latest", headers={"apikey": "fake_api_key"}, params={"base": "EUR"}
+        # Проверка, что курсы всех валют получены одним запросом
+        mock_get.assert_called_once_with(
+            "https://api.apilayer.com/fixer/latest",
+            headers={"apikey": "fake_api_key"},
+            params={"base": "RUB", "symbols": "USD,EUR,GBP,RUB"},
+            timeout=REQUEST_TIMEOUT,
         )
 
 
+def test_get_currency_rates_failed_request() -> None:
+    with patch("src.views.get_session") as mock_get_session:
+        mock_get_session.return_value.get.side_effect = requests.ConnectionError("no network")
+        assert get_currency_rates(["USD"]) == []
+        assert get_cross_rates(["USD"]) is None
+
+
 @patch("src.views.Alpha_KEY", "fake_alpha_key")  # Подмена Alpha_KEY на фиктивный
 def test_get_stock_prices() -> None:
     # Определяем фиктивные данные для ответа
@@ -210,8 +293,10 @@ def test_get_stock_prices() -> None:
     mock_response.status_code = 200
     mock_response.json.return_value = mock_response_data
 
-    # Используем patch для подмены requests.get
-    with patch("src.views.requests.get", return_value=mock_response) as mock_get:
+    # Используем patch для подмены общей HTTP-сессии
+    with patch("src.views.get_session") as mock_get_session:
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value = mock_response
         # Вызов тестируемой функции
         stocks = ["AAPL", "GOOGL"]
         result = get_stock_prices(stocks)
@@ -220,18 +305,86 @@ def test_get_stock_prices() -> None:
         expected_result = [{"stock": "AAPL", "price": 150.00}, {"stock": "GOOGL", "price": 150.00}]
         assert result == expected_result
 
-        # Проверка, что requests.get был вызван дважды (по одному разу для каждой акции)
+        # Проверка, что запрос был выполнен дважды (по одному разу для каждой акции)
         assert mock_get.call_count == 2
 
-        # Проверка аргументов вызова requests.get
+        # Проверка аргументов вызова
         mock_get.assert_any_call(
-            "https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol=AAPL&apikey=fake_alpha_key"
+            "https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol=AAPL&apikey=fake_alpha_key",
+            timeout=REQUEST_TIMEOUT,
         )
         mock_get.assert_any_call(
-            "https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol=GOOGL&apikey=fake_alpha_key"
+            "https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol=GOOGL&apikey=fake_alpha_key",
+            timeout=REQUEST_TIMEOUT,
         )
 
 
+def test_market_records_with_trading_day() -> None:
+    fixer_response = MagicMock(status_code=200)
+    fixer_response.json.return_value = {"base": "RUB", "date": "2024-08-09", "rates": {"USD": 0.0125}}
+    alpha_response = MagicMock(status_code=200)
+    alpha_response.json.return_value = {
+        "Meta Data": {"3. Last Refreshed": "2024-08-08"},
+        "Time Series (Daily)": {"2024-08-08": {"4. close": "150.00"}},
+    }
+
+    with patch("src.views.get_session") as mock_get_session:
+        mock_get_session.return_value.get.return_value = fixer_response
+        assert get_currency_rates(["USD"], with_date=True) == [{"currency": "USD", "rate": 80.0, "date": "2024-08-09"}]
+        assert get_currency_rates(["USD"]) == [{"currency": "USD", "rate": 80.0}]
+        mock_get_session.return_value.get.return_value = alpha_response
+        assert get_stock_prices(["AAPL"], with_date=True) == [{"stock": "AAPL", "price": 150.0, "date": "2024-08-08"}]
+
+
+def test_get_stock_prices_skips_failed_requests() -> None:
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "Meta Data": {"3. Last Refreshed": "2024-08-08"},
+        "Time Series (Daily)": {"2024-08-08": {"4. close": "150.00"}},
+    }
+    limited_response = MagicMock()
+    limited_response.status_code = 200
+    limited_response.json.return_value = {"Note": "API call frequency exceeded"}
+
+    def fake_get(url: str, **kwargs: Any) -> MagicMock:
+        if "AAPL" in url:
+            return mock_response
+        if "AMZN" in url:
+            return limited_response
+        raise requests.Timeout("timed out")
+
+    with patch("src.views.get_session") as mock_get_session:
+        mock_get_session.return_value.get.side_effect = fake_get
+        result = get_stock_prices(["AAPL", "AMZN", "TSLA"])
+
+    assert result == [{"stock": "AAPL", "price": 150.00}]
+
+
+def test_get_stock_prices_runs_concurrently() -> None:
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "Meta Data": {"3. Last Refreshed": "2024-08-08"},
+        "Time Series (Daily)": {"2024-08-08": {"4. close": "150.00"}},
+    }
+    stocks = ["AAPL", "AMZN", "GOOGL", "MSFT"]
+    # Каждый запрос ждет остальные: при последовательных запросах барьер не пройти
+    barrier = threading.Barrier(len(stocks), timeout=5)
+
+    def wait_for_all(*args: Any, **kwargs: Any) -> MagicMock:
+        barrier.wait()
+        return mock_response
+
+    with patch("src.views.get_session") as mock_get_session:
+        mock_get_session.return_value.get.side_effect = wait_for_all
+        result = get_stock_prices(stocks, max_workers=len(stocks), timeout=(1.0, 2.0))
+
+    assert [price["stock"] for price in result] == stocks
+    for call in mock_get_session.return_value.get.call_args_list:
+        assert call.kwargs["timeout"] == (1.0, 2.0)
+
+
 @pytest.fixture
 def sample_df():
     return pd.DataFrame(
@@ -244,7 +397,7 @@ def sample_df():
 
 
 def test_main_func_home(sample_df):
-    with patch("src.views.get_greeting", return_value="Hello"), patch(
+    with patch("src.views.get_greeting", return_value="Hello"), patch("src.views.load_market_data"), patch(
         "src.views.process_home_data"
     ) as mock_process_home_data:
         mock_process_home_data.return_value = {
@@ -266,7 +419,7 @@ def test_main_func_home(sample_df):
 
 
 def test_main_func_events(sample_df):
-    with patch("src.views.get_greeting", return_value="Hello"), patch(
+    with patch("src.views.get_greeting", return_value="Hello"), patch("src.views.load_market_data"), patch(
         "src.views.get_common_data", return_value=sample_df
     ), patch("src.views.process_events_data") as mock_process_events_data:
         mock_process_events_data.return_value = {
@@ -287,7 +440,74 @@ def test_main_func_events(sample_df):
         assert "stock_prices" in data
 
 
-def test_main_func_no_data():
+def test_main_func_overlaps_market_data_with_statement(sample_df: pd.DataFrame) -> None:
+    market_data = ([{"currency": "USD", "rate": 90.0}], [{"stock": "AAPL", "price": 150.0}])
+    # Запрос курсов и чтение выписки ждут друг друга: последовательно барьер не пройти
+    barrier = threading.Barrier(2, timeout=5)
+
+    def market_data_in_parallel(pbar: tqdm) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        barrier.wait()
+        return market_data
+
+    def common_data_in_parallel(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        barrier.wait()
+        return pd.DataFrame({"Категория": ["Еда"], "Сумма операции": [-100.0]})
+
+    with patch("src.views.load_market_data", side_effect=market_data_in_parallel), patch(
+        "src.views.get_common_data", side_effect=common_data_in_parallel
+    ):
+        result = main_func("events", "2023-01-15 12:00:00", sample_df)
+        assert isinstance(result, str)
+        result = json.loads(result)
+
+    assert result["currency_rates"] == market_data[0]
+    assert result["stock_prices"] == market_data[1]
+
+
+def test_main_func_error_does_not_wait_for_market_data(sample_df: pd.DataFrame) -> None:
+    release = threading.Event()
+    finished = threading.Event()
+
+    def pending_market_data(pbar: tqdm) -> Tuple[List[Any], List[Any]]:
+        release.wait(5)
+        finished.set()
+        return [], []
+
+    with patch("src.views.load_market_data", side_effect=pending_market_data), patch(
+        "src.views.get_common_data", side_effect=RuntimeError("broken statement")
+    ):
+        result = main_func("events", "2023-01-15 12:00:00", sample_df)
+        assert isinstance(result, str)
+        result = json.loads(result)
+
+    assert "error" in result
+    assert not finished.is_set()
+    release.set()
+
+
+def test_main_func_uses_started_market_request(sample_df: pd.DataFrame) -> None:
+    market: Future = Future()
+    market.set_result(([{"currency": "USD", "rate": 90.0}], []))
+    with patch("src.views.load_market_data") as mock_load_market_data, patch(
+        "src.views.get_common_data", return_value=pd.DataFrame({"Категория": ["Еда"], "Сумма операции": [-100.0]})
+    ):
+        result = main_func("events", "2023-01-15 12:00:00", sample_df, market=market)
+        assert isinstance(result, str)
+        result = json.loads(result)
+    assert result["currency_rates"] == [{"currency": "USD", "rate": 90.0}]
+    mock_load_market_data.assert_not_called()
+
+
+def test_main_func_invalid_type(sample_df: pd.DataFrame) -> None:
+    with patch("src.views.load_market_data") as mock_load_market_data:
+        result = main_func("other", "2023-01-01 00:00:00", sample_df)
+        assert isinstance(result, str)
+        result = json.loads(result)
+    assert "error" in result
+    mock_load_market_data.assert_not_called()
+
+
+def test_main_func_no_data() -> None:
     result = main_func("home", "2023-01-01 00:00:00", None)
     assert isinstance(result, str)
     data = json.loads(result)
@@ -296,6 +516,8 @@ def test_main_func_no_data():
 
 def test_process_home_data(sample_df):
     with patch("src.views.get_card_from_main", return_value=["Card1", "Card2"]), patch(
+        "src.views.get_card_stats", return_value=["Stats1", "Stats2"]
+    ), patch(
         "src.views.get_top_transactions", return_value=["Transaction1", "Transaction2"]
     ), patch("src.views.get_user_settings_data", return_value=(["USD"], ["AAPL"])), patch(
         "src.views.get_rates_and_prices", return_value=({"USD": 1.0}, {"AAPL": 150.0})
@@ -304,6 +526,7 @@ def test_process_home_data(sample_df):
         result = process_home_data(pbar, sample_df, pd.Timestamp("2023-01-01"), pd.Timestamp("2023-01-31"))
 
         assert "cards" in result
+        assert "card_stats" in result
         assert "top_transactions" in result
         assert "currency_rates" in result
         assert "stock_prices" in result
@@ -322,3 +545,9 @@ def test_process_events_data(sample_df):
         assert "income" in result
         assert "currency_rates" in result
         assert "stock_prices" in result
+
+
+def test_get_expenses_categorical() -> None:
+    df = pd.DataFrame({"Сумма операции": [-100, -50, 50], "Категория": ["Food", "Transfers", "Cash"]})
+    df["Категория"] = df["Категория"].astype("category")
+    assert get_expenses(df)["main"] == [{"category": "Food", "amount": 100}, {"category": "Transfers", "amount": 50}]